@@ -0,0 +1,120 @@
+"""
+Headless batch filler: fill every JSON file of directory (or glob) by one source JSON.
+
+Run from "src" directory like app_main.py:
+    python batch_main.py cases/ --source source.json --preset test_preset --output filled/
+"""
+import argparse
+import datetime
+import os
+import sys
+
+from utils.loggs.logger import init_logger
+from src.handlers.batch_handler import find_json_files, fill_files
+from src.handlers.dates_handler import plus_days_for_settings
+from src.handlers.filler_handlers import MATCH_BY_PATH, MATCH_BY_KEY
+from src.handlers.settings_handlers import FillerSettingsHandler
+from src.utils import codec
+from src.utils.exceptions import PresetException
+from src.utils.models import MonoSettingsFromUIModel, MonoPresetModel
+from src.utils.utils import get_root_json_as_dict
+
+FILLER_SETTINGS_PATH = "data/settings/filler_settings.json"
+
+
+def parse_holidays(value: str) -> list[datetime.date]:
+    try:
+        return [datetime.date.fromisoformat(day.strip()) for day in value.split(",") if day.strip()]
+    except ValueError as err:
+        raise argparse.ArgumentTypeError(f"invalid holidays '{value}': {err}")
+
+
+def parse_args(args: list[str] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Fill JSON files by source JSON with mono settings")
+    parser.add_argument("input", help="Directory with *.json files (recursive) or glob pattern")
+    parser.add_argument("--source", default="",
+                        help="JSON from which values are taken, default: data/root_json.json")
+    parser.add_argument("--output", default="filled", help="Directory for results, default: ./filled")
+    parser.add_argument("--preset", default="", help="Mono preset name from filler settings")
+    parser.add_argument("--no-dates", action="store_true", help="Don't set dates calculated from settings")
+    parser.add_argument("--business-days", action="store_true",
+                        help="Count date offsets in business days (Mon-Fri without holidays)")
+    parser.add_argument("--holidays", type=parse_holidays, default=[],
+                        help="Comma separated YYYY-MM-DD days off for --business-days")
+    parser.add_argument("--no-convert-dt", action="store_true", help="Don't convert DateTime values to Date")
+    parser.add_argument("--match-by", choices=(MATCH_BY_PATH, MATCH_BY_KEY), default=MATCH_BY_PATH)
+    parser.add_argument("--workers", type=int, default=None, help="Process count, default: cpu count")
+    parser.add_argument("--indent", type=int, default=None, help="Pretty print results with indent")
+    parser.add_argument("--compact", action="store_true", help="Write results in one line")
+    return parser.parse_args(args)
+
+
+def make_settings(args: argparse.Namespace, settings_handler: FillerSettingsHandler) -> MonoSettingsFromUIModel:
+    """
+    Same settings as mono UI makes: preset values and dates calculated from filler settings.
+    Dates are calculated by dates_handler, offsets can be counted in business days
+    """
+    mono_settings = settings_handler.get_current_settings().mono
+    if args.preset:
+        preset = settings_handler.get_preset_by_name(args.preset)
+    else:
+        preset = MonoPresetModel(name="", contact_id="", account_number="", contract_number="",
+                                 product_type="", communication_type="")
+
+    dates = plus_days_for_settings([mono_settings.dates], business_days=args.business_days,
+                                   holidays=args.holidays)[0]
+    if args.no_dates:
+        dates = dates.copy(update=dict.fromkeys(dates.dict(), ""))
+
+    return MonoSettingsFromUIModel(
+        dates=dates,
+        contact_id=preset.contact_id,
+        account_number=preset.account_number,
+        contract_number=preset.contract_number,
+        product_type=preset.product_type,
+        communication_type=preset.communication_type,
+        is_need_convert_dt=not args.no_convert_dt,
+        fill_match_by=args.match_by
+    )
+
+
+def main(args: list[str] = None) -> int:
+    args = parse_args(args)
+    logger = init_logger("app", is_logger_level_debug=0)
+
+    try:
+        settings = make_settings(args, FillerSettingsHandler(FILLER_SETTINGS_PATH))
+    except PresetException as err:
+        print(err, file=sys.stderr)
+        return 2
+
+    if args.source:
+        with open(args.source, "rb") as file:
+            from_fill = codec.load(file)
+    else:
+        from_fill = get_root_json_as_dict()
+
+    paths = find_json_files(args.input)
+    output_dir = os.path.abspath(args.output)
+    paths = [path for path in paths if not os.path.abspath(path).startswith(output_dir + os.sep)]
+    if not paths:
+        print(f"No JSON files found: {args.input}", file=sys.stderr)
+        return 2
+
+    logger.info(f"Batch fill: {len(paths)} files from '{args.input}' to '{output_dir}'")
+    summary = fill_files(paths, from_fill=from_fill, settings=settings, output_dir=output_dir,
+                         workers=args.workers, indent=args.indent, compact=args.compact)
+
+    for error in summary.errors:
+        print(f"ERROR {error.path}: {error.error}", file=sys.stderr)
+
+    seconds = summary.seconds or 1e-9
+    print(f"Files: {summary.files}, failed: {len(summary.errors)}\n"
+          f"Input: {summary.input_bytes / 1024 / 1024:.2f} MB, output: {summary.output_bytes / 1024 / 1024:.2f} MB\n"
+          f"Time: {summary.seconds:.2f} sec, {summary.files / seconds:.1f} files/sec, "
+          f"{summary.input_bytes / 1024 / 1024 / seconds:.2f} MB/sec")
+    return 1 if summary.errors else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
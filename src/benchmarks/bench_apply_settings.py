@@ -0,0 +1,109 @@
+"""
+Compare apply_settings (compiled rule table, regex pre-check of dates) with old implementation.
+Run from repository root: python -m src.benchmarks.bench_apply_settings
+"""
+from datetime import datetime as dt
+
+from src.benchmarks.bench_utils import measure, print_row
+from src.handlers.filler_handlers import apply_settings
+from src.utils.models import MonoSettingsFromUIModel, DatesModel
+
+SIZES = (1_000, 10_000, 100_000)
+
+SETTINGS = MonoSettingsFromUIModel(
+    dates=DatesModel(date_1="2023-01-02", date_2="2023-01-05", date_3="2023-01-10",
+                     std="2022-12-31", next_std="2023-01-31"),
+    contact_id="123456",
+    account_number="654321",
+    contract_number="",
+    product_type="Common",
+    communication_type="Call",
+    is_need_convert_dt=True
+)
+
+
+def legacy_is_date_time_value(value) -> bool:
+    try:
+        dt.strptime(value, '%Y-%m-%dT%H:%M:%S.%f')
+        return True
+    except (ValueError, TypeError):
+        return False
+
+
+def legacy_is_date_value(value) -> bool:
+    try:
+        dt.strptime(value, '%Y-%m-%d')
+        return True
+    except (ValueError, TypeError):
+        return False
+
+
+def legacy_apply_settings(dict_to_valid: dict, settings: MonoSettingsFromUIModel) -> dict:
+    """Old apply_settings: dicts are rebuilt on every call, every value goes through strptime"""
+    value_from_settings = {
+        "PRODUCT_TYPE": settings.product_type.strip(),
+        "PRIMARY_PRODUCT_TYPE": settings.product_type.strip(),
+        "PRIMARY_ACCOUNT_PRODUCT_TYPE": settings.product_type.strip(),
+        "CONTACT_ID": settings.contact_id.strip(),
+        "ACCOUNT_NUMBER": settings.account_number.strip(),
+        "PRIMARY_ACCOUNT_NUMBER": settings.account_number.strip(),
+        "CONTRACT_NUMBER": settings.contract_number.strip(),
+        "PRIMARY_CONTRACT_NUMBER": settings.contract_number.strip(),
+        "COMMUNICATION_TYPE": settings.communication_type.strip()
+    }
+    dates_value_from_settings = {
+        "DATE1": settings.dates.date_1.strip(),
+        "DATE_1": settings.dates.date_1.strip(),
+        "PRIMARY_ACCOUNT_DATE1": settings.dates.date_1.strip(),
+        "PRIMARY_ACCOUNT_DATE_1": settings.dates.date_1.strip(),
+        "DATE2": settings.dates.date_2.strip(),
+        "DATE_2": settings.dates.date_2.strip(),
+        "PRIMARY_ACCOUNT_DATE2": settings.dates.date_2.strip(),
+        "PRIMARY_ACCOUNT_DATE_2": settings.dates.date_2.strip(),
+        "DATE3": settings.dates.date_3.strip(),
+        "DATE_3": settings.dates.date_3.strip(),
+        "PRIMARY_ACCOUNT_DATE3": settings.dates.date_3.strip(),
+        "PRIMARY_ACCOUNT_DATE_3": settings.dates.date_3.strip(),
+        "STD": settings.dates.std.strip(),
+        "PRIMARY_ACCOUNT_STD": settings.dates.std.strip(),
+        "NEXT_STD": settings.dates.next_std.strip(),
+        "PRIMARY_ACCOUNT_NEXT_STD": settings.dates.next_std.strip()
+    }
+
+    result_dict = {}
+    for key, value in dict_to_valid.items():
+        if (key in value_from_settings) and (value_from_settings[key] != ""):
+            result_dict[key] = value_from_settings.get(key)
+        elif (key in dates_value_from_settings) and legacy_is_date_value(dates_value_from_settings[key]):
+            result_dict[key] = dates_value_from_settings[key]
+        elif settings.is_need_convert_dt and legacy_is_date_time_value(value):
+            result_dict[key] = str(dt.strptime(value, '%Y-%m-%dT%H:%M:%S.%f').date())
+        else:
+            result_dict[key] = value
+    return result_dict
+
+
+def make_dict(size: int) -> dict:
+    """Mostly plain strings, every 10th value is DateTime, plus keys from settings"""
+    data = {
+        f"FIELD_{i}": "2022-11-28T08:25:47.123" if i % 10 == 0 else f"some text value {i}"
+        for i in range(size)
+    }
+    data.update(CONTACT_ID="", ACCOUNT_NUMBER="", DATE_1="", NEXT_STD="")
+    return data
+
+
+def main() -> None:
+    print_row("string fields", "implementation", "time, s", "peak, MB")
+    for size in SIZES:
+        data = make_dict(size)
+        assert apply_settings(data, SETTINGS) == legacy_apply_settings(data, SETTINGS)
+        legacy_time, legacy_peak = measure(legacy_apply_settings, data, SETTINGS)
+        new_time, new_peak = measure(apply_settings, data, SETTINGS)
+        print_row(size, "legacy", f"{legacy_time:.4f}", f"{legacy_peak:.1f}")
+        print_row(size, "rule table", f"{new_time:.4f}", f"{new_peak:.1f}")
+        print_row("", "speedup", f"x{legacy_time / new_time:.1f}")
+
+
+if __name__ == '__main__':
+    main()
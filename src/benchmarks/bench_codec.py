@@ -0,0 +1,52 @@
+"""
+Compare parse and dump of codec (orjson backend when installed) with stdlib json calls used before.
+Run from repository root: python -m src.benchmarks.bench_codec
+"""
+import json
+
+from src.benchmarks.bench_utils import measure, print_row
+from src.benchmarks.generators import format_size, make_json_document
+from src.utils import codec
+
+SIZES = (1024 ** 2, 10 * 1024 ** 2, 50 * 1024 ** 2)
+# Values orjson writes differently, codec must dump them as stdlib json
+NON_FINITE_DOCUMENT = {"nan": float("nan"), "items": [None, {"inf": float("inf"), "-inf": float("-inf")}]}
+
+
+def legacy_dumps_compact(data: object) -> str:
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+
+
+def legacy_dumps_indent(data: object) -> str:
+    return json.dumps(data, ensure_ascii=False, indent=2)
+
+
+def main() -> None:
+    print(f"codec backend: {codec.BACKEND}")
+    assert codec.dumps(NON_FINITE_DOCUMENT, compact=True) == legacy_dumps_compact(NON_FINITE_DOCUMENT)
+    assert codec.dumps(NON_FINITE_DOCUMENT, indent=2) == legacy_dumps_indent(NON_FINITE_DOCUMENT)
+    print_row("size", "operation", "backend", "time, s", "peak, MB")
+    for size in SIZES:
+        document = make_json_document(size)
+        text = legacy_dumps_compact(document)
+        data = text.encode("utf-8")
+        assert codec.loads(text) == codec.loads(data) == json.loads(text)
+        assert codec.dumps(document, compact=True) == text
+
+        operations = (
+            ("loads str", "json", json.loads, text),
+            ("loads str", "codec", codec.loads, text),
+            ("loads bytes", "json", json.loads, data),
+            ("loads bytes", "codec", codec.loads, data),
+            ("dumps compact", "json", legacy_dumps_compact, document),
+            ("dumps compact", "codec", lambda doc: codec.dumps(doc, compact=True), document),
+            ("dumps indent 2", "json", legacy_dumps_indent, document),
+            ("dumps indent 2", "codec", lambda doc: codec.dumps(doc, indent=2), document),
+        )
+        for operation, name, func, arg in operations:
+            seconds, peak = measure(func, arg)
+            print_row(format_size(size), operation, name, f"{seconds:.3f}", f"{peak:.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""
+Compare compiled coercion plan with old fix_dict_values_type on wide records.
+Run from repository root: python -m src.benchmarks.bench_coercion
+"""
+from src.benchmarks.bench_utils import measure, print_row
+from src.utils.coercion import coerce_dict, compile_coercion_plan
+from src.utils.utils import fix_dict_values_type
+
+WIDTHS = (100, 1_000, 10_000)
+RECORDS = 200
+
+
+def legacy_fix_dict_values_type(dictionary: dict, type_example: dict) -> dict:
+    """Old implementation: types of example are checked for every key on every call"""
+    result = {}
+    for k, v in dictionary.items():
+        if k in type_example.keys():
+            if v is None or v == "null":
+                result[k] = None
+                continue
+            if issubclass(type(type_example[k]), bool):
+                result[k] = bool(v)
+            elif issubclass(type(type_example[k]), int | float):
+                try:
+                    result[k] = int(v)
+                except ValueError:
+                    result[k] = float(v)
+            elif issubclass(type(type_example[k]), str):
+                result[k] = str(v)
+            elif issubclass(type(type_example[k]), dict):
+                result[k] = v
+            elif issubclass(type(type_example[k]), list):
+                value_list = v.split(',')
+                result[k] = [i.strip() for i in value_list]
+    return result
+
+
+def make_example(width: int) -> dict:
+    """Strings, ints and floats in equal parts, like Sage record"""
+    example = {}
+    for i in range(width):
+        example[f"FIELD_{i}"] = ("text", 1, 1.5)[i % 3]
+    return example
+
+
+def make_record(width: int) -> dict:
+    return {f"FIELD_{i}": ("some value", "12345", "12.5")[i % 3] for i in range(width)}
+
+
+def legacy_records(records: list[dict], example: dict) -> list[dict]:
+    return [legacy_fix_dict_values_type(record, example) for record in records]
+
+
+def plan_records(records: list[dict], example: dict) -> list[dict]:
+    plan = compile_coercion_plan(example)
+    return [coerce_dict(record, plan) for record in records]
+
+
+def main() -> None:
+    print_row("fields", "implementation", "time, s", "peak, MB")
+    for width in WIDTHS:
+        example = make_example(width)
+        records = [make_record(width) for _ in range(RECORDS)]
+        assert plan_records(records, example) == legacy_records(records, example)
+        assert fix_dict_values_type(records[0], example) == legacy_fix_dict_values_type(records[0], example)
+
+        legacy_time, legacy_peak = measure(legacy_records, records, example)
+        new_time, new_peak = measure(plan_records, records, example)
+        print_row(width, "legacy", f"{legacy_time:.4f}", f"{legacy_peak:.1f}")
+        print_row(width, "compiled plan", f"{new_time:.4f}", f"{new_peak:.1f}")
+        print_row("", "speedup", f"x{legacy_time / new_time:.1f}")
+
+
+if __name__ == '__main__':
+    main()
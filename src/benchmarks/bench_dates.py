@@ -0,0 +1,45 @@
+"""
+Compare vectorized plus_days_batch with plus_days_from_now called for every record.
+Run from repository root: python -m src.benchmarks.bench_dates
+"""
+import random
+
+from src.benchmarks.bench_utils import measure, print_row
+from src.handlers.dates_handler import plus_days_batch, OFFSET_FIELDS
+from src.handlers.filler_handlers import plus_days_from_now
+from src.utils.models import MonoDatesModel
+
+RECORDS = (1_000, 10_000, 100_000)
+# Offsets over several years, every month end and leap day is hit
+MAX_OFFSET = 2_000
+
+
+def make_offsets(records: int, seed: int = 0) -> dict[str, list[int]]:
+    rnd = random.Random(seed)
+    return {field: [rnd.randint(-MAX_OFFSET, MAX_OFFSET) for _ in range(records)] for field in OFFSET_FIELDS}
+
+
+def legacy_plus_days(offsets: dict[str, list[int]]) -> dict[str, list[str]]:
+    """Old path: plus_days_from_now for every record"""
+    result = {field: [] for field in (*OFFSET_FIELDS, "next_std")}
+    for values in zip(*offsets.values()):
+        dates = plus_days_from_now(MonoDatesModel(**dict(zip(offsets, values))))
+        for field, value in dates:
+            result[field].append(value)
+    return result
+
+
+def main() -> None:
+    print_row("records", "engine", "time, s", "peak, MB")
+    for records in RECORDS:
+        offsets = make_offsets(records)
+        assert plus_days_batch(offsets) == legacy_plus_days(offsets)
+
+        for name, func in (("scalar", legacy_plus_days), ("numpy", plus_days_batch),
+                           ("numpy busdays", lambda data: plus_days_batch(data, business_days=True))):
+            seconds, peak = measure(func, offsets, repeat=1 if name == "scalar" else 3)
+            print_row(records, name, f"{seconds:.3f}", f"{peak:.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+"""
+Compare export_dict with old str()+replace export. Main gain is valid JSON for any value,
+time and peak memory of default layout are about the same as of old export.
+Run from repository root: python -m src.benchmarks.bench_export
+"""
+import json
+
+from src.benchmarks.bench_utils import measure, print_row
+from src.utils.json_export import export_dict
+
+SIZES = (1_000, 10_000, 100_000)
+
+
+def legacy_correct_dict_to_export(correcting_dict: dict) -> str:
+    """Old export: str(dict) and five full-string replaces"""
+    correcting_value = str(correcting_dict)
+    correcting_value = correcting_value.replace("'", '"')
+    correcting_value = correcting_value.replace("True", 'true')
+    correcting_value = correcting_value.replace("False", 'false')
+    correcting_value = correcting_value.replace("None", 'null')
+    correcting_value = correcting_value.replace(',', ',\n')
+    return correcting_value
+
+
+def make_dict(size: int) -> dict:
+    return {
+        f"KEY_{i}": {
+            "text": f"value {i}",
+            "number": i,
+            "float": i / 3,
+            "flags": [True, False, None],
+            "nested": {"CONTACT_ID": str(i)}
+        } for i in range(size)
+    }
+
+
+def is_valid_json(string: str) -> bool:
+    try:
+        json.loads(string)
+        return True
+    except json.JSONDecodeError:
+        return False
+
+
+def main() -> None:
+    print_row("keys", "mode", "time, s", "peak, MB")
+    for size in SIZES:
+        data = make_dict(size)
+        for mode, func in (
+                ("legacy", legacy_correct_dict_to_export),
+                ("lines", export_dict),
+                ("compact", lambda d: export_dict(d, compact=True)),
+                ("indent=2", lambda d: export_dict(d, indent=2)),
+        ):
+            seconds, peak = measure(func, data)
+            print_row(size, mode, f"{seconds:.4f}", f"{peak:.1f}")
+
+    broken = {"name": "O'Neil", "text": "None, True or False"}
+    print(f"\nValue with apostrophe and keywords: legacy valid JSON - "
+          f"{is_valid_json(legacy_correct_dict_to_export(broken))}, "
+          f"export_dict valid JSON - {is_valid_json(export_dict(broken))}")
+
+
+if __name__ == '__main__':
+    main()
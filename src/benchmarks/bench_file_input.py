@@ -0,0 +1,36 @@
+"""
+Compare read of JSON input file by mmap (read_text_mmap) with plain read of text file.
+Run from repository root: python -m src.benchmarks.bench_file_input
+"""
+import json
+import os
+import tempfile
+
+from src.benchmarks.bench_utils import measure, print_row
+from src.benchmarks.generators import format_size, make_json_document
+from src.utils.file_input import read_text_mmap
+
+SIZES = (1024 ** 2, 10 * 1024 ** 2, 100 * 1024 ** 2)
+
+
+def legacy_read_text(path: str) -> str:
+    with open(path, "r", encoding="utf-8") as file:
+        return file.read()
+
+
+def main() -> None:
+    print_row("file size", "reader", "time, s", "peak, MB")
+    with tempfile.TemporaryDirectory() as directory:
+        for size in SIZES:
+            path = os.path.join(directory, f"input_{size}.json")
+            with open(path, "w", encoding="utf-8") as file:
+                json.dump(make_json_document(size), file, ensure_ascii=False)
+            assert read_text_mmap(path) == legacy_read_text(path)
+
+            for name, func in (("text read", legacy_read_text), ("mmap", read_text_mmap)):
+                seconds, peak = measure(func, path)
+                print_row(format_size(size), name, f"{seconds:.3f}", f"{peak:.1f}")
+
+
+if __name__ == '__main__':
+    main()
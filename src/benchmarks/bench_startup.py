@@ -0,0 +1,89 @@
+"""
+GUI cold start benchmark: import time of AppWindow and time to first drawn frame.
+Every measure runs in new python process.
+Run from repository root: python -m src.benchmarks.bench_startup [--max-import-ms 600] [--max-frame-ms 1500]
+Exit code is 1 if some limit is exceeded.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+SRC_DIR = os.path.join(REPO_ROOT, "src")
+HEAVY_MODULES = ("pandas", "numpy", "openpyxl", "pyperclip", "dateutil")
+
+IMPORT_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import src.window.AppWindow
+print(json.dumps({"seconds": time.perf_counter() - start,
+                  "heavy": [m for m in %r if m in sys.modules]}))
+""" % (HEAVY_MODULES,)
+
+FIRST_FRAME_SCRIPT = """
+import json, time
+start = time.perf_counter()
+try:
+    from src.window.AppWindow import AppWindow
+    app = AppWindow()
+    app.update()
+    seconds = time.perf_counter() - start
+    app.destroy()
+    print(json.dumps({"seconds": seconds}))
+except Exception as err:  # No display
+    print(json.dumps({"error": repr(err)}))
+"""
+
+
+def run_script(script: str, cwd: str) -> dict:
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([REPO_ROOT, SRC_DIR]))
+    output = subprocess.run([sys.executable, "-c", script], cwd=cwd, env=env,
+                            capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def measure_import(repeat: int) -> tuple[float, list]:
+    results = [run_script(IMPORT_SCRIPT, cwd=REPO_ROOT) for _ in range(repeat)]
+    return min(result["seconds"] for result in results), results[0]["heavy"]
+
+
+def measure_first_frame(repeat: int) -> float | None:
+    """None if window can't be created (no display)"""
+    seconds = []
+    for _ in range(repeat):
+        result = run_script(FIRST_FRAME_SCRIPT, cwd=SRC_DIR)
+        if "error" in result:
+            print(f"Time to first frame is skipped: {result['error']}")
+            return None
+        seconds.append(result["seconds"])
+    return min(seconds)
+
+
+def main(args: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--max-import-ms", type=float, default=None)
+    parser.add_argument("--max-frame-ms", type=float, default=None)
+    args = parser.parse_args(args)
+
+    is_failed = False
+    import_seconds, heavy_modules = measure_import(args.repeat)
+    print(f"Import AppWindow: {import_seconds * 1000:.0f} ms, heavy modules loaded: {heavy_modules or 'none'}")
+    if args.max_import_ms is not None and import_seconds * 1000 > args.max_import_ms:
+        print(f"REGRESSION: import time is more than {args.max_import_ms} ms")
+        is_failed = True
+
+    frame_seconds = measure_first_frame(args.repeat)
+    if frame_seconds is not None:
+        print(f"Time to first frame: {frame_seconds * 1000:.0f} ms")
+        if args.max_frame_ms is not None and frame_seconds * 1000 > args.max_frame_ms:
+            print(f"REGRESSION: time to first frame is more than {args.max_frame_ms} ms")
+            is_failed = True
+
+    return 1 if is_failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
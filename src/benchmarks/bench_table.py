@@ -0,0 +1,41 @@
+"""
+Compare streaming workbook reader of make_json_from_table with old pandas read_excel().to_dict() path.
+Run from repository root: python -m src.benchmarks.bench_table
+"""
+import os
+import tempfile
+
+from src.benchmarks.bench_utils import measure, print_row
+from src.benchmarks.generators import make_xlsx_table
+from src.handlers.tables_handler import read_table_variables
+
+ROWS = (1_000, 10_000, 50_000)
+EXTRA_COLUMNS = 20
+
+
+def legacy_read_table_variables(table_path: str) -> dict:
+    """Old path: whole first sheet to DataFrame, DataFrame to dicts, pairs by index"""
+    from pandas import read_excel
+
+    with open(table_path, "rb") as file:
+        data = read_excel(file).to_dict()
+    variable_names = data['variable_name']
+    variable_values = data['variable_value']
+    return {variable_names[k]: variable_values[k] for k in variable_names}
+
+
+def main() -> None:
+    print_row("rows", "reader", "time, s", "peak, MB")
+    with tempfile.TemporaryDirectory() as directory:
+        for rows in ROWS:
+            path = os.path.join(directory, f"table_{rows}.xlsx")
+            make_xlsx_table(path, rows, extra_columns=EXTRA_COLUMNS)
+            assert read_table_variables(path) == legacy_read_table_variables(path)
+
+            for name, func in (("legacy pandas", legacy_read_table_variables), ("streaming", read_table_variables)):
+                seconds, peak = measure(func, path, repeat=1)
+                print_row(rows, name, f"{seconds:.3f}", f"{peak:.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,28 @@
+import time
+import tracemalloc
+
+
+def measure(func: callable, *args, repeat: int = 3, **kwargs) -> tuple[float, float]:
+    """
+    Run func several times
+
+    :return: best time in seconds and peak of traced memory in MB (from separate run under tracemalloc)
+    """
+    best_time = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args, **kwargs)
+        best_time = min(best_time, time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        func(*args, **kwargs)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return best_time, peak / 1024 / 1024
+
+
+def print_row(*columns, width: int = 18) -> None:
+    print("".join(str(col).ljust(width) for col in columns))
@@ -0,0 +1,134 @@
+"""
+Synthetic inputs for benchmarks: JSON documents, Sage dumps and xlsx tables of given size, depth and width.
+Output is deterministic: same arguments give same data
+"""
+import json
+import re
+
+SIZE_UNITS = {"B": 1, "KB": 1024, "MB": 1024 ** 2, "GB": 1024 ** 3}
+SIZE_PATTERN = re.compile(r"(\d+(?:\.\d+)?)\s*([KMG]?B)", re.IGNORECASE)
+
+# Leaf values of all types that handlers meet in real documents
+LEAF_VALUES = (
+    lambda i: f"some text value {i}",
+    lambda i: i,
+    lambda i: i / 7,
+    lambda i: i % 2 == 0,
+    lambda i: None,
+    lambda i: "2022-11-28T08:25:47.123",
+    lambda i: "2023-01-31",
+)
+
+
+def parse_size(size: str) -> int:
+    """ "1KB", "10MB", "512B" -> bytes"""
+    match = SIZE_PATTERN.fullmatch(size.strip())
+    if match is None:
+        raise ValueError(f"Wrong size: '{size}', expected like 1KB, 10MB")
+    return int(float(match.group(1)) * SIZE_UNITS[match.group(2).upper()])
+
+
+def format_size(size: int) -> str:
+    for unit in ("GB", "MB", "KB"):
+        if size >= SIZE_UNITS[unit] and size % SIZE_UNITS[unit] == 0:
+            return f"{size // SIZE_UNITS[unit]}{unit}"
+    return f"{size}B"
+
+
+def make_member(index: int, depth: int, width: int) -> object:
+    """Object of "width" keys nested "depth" levels, every level has one array of objects"""
+    if depth <= 0:
+        return LEAF_VALUES[index % len(LEAF_VALUES)](index)
+
+    member = {f"FIELD_{i}": LEAF_VALUES[(index + i) % len(LEAF_VALUES)](index + i) for i in range(width)}
+    member["NESTED"] = make_member(index + 1, depth - 1, width)
+    member["ITEMS"] = [make_member(index + i, depth - 1, max(1, width // 2)) for i in range(2)]
+    return member
+
+
+def make_json_document(size: int, depth: int = 2, width: int = 10) -> dict:
+    """
+    Object with top-level members "KEY_<n>" until serialized size is about "size" bytes
+
+    :param depth: nesting of every member
+    :param width: keys on every nesting level
+    """
+    member_size = len(json.dumps(make_member(0, depth, width))) + len('"KEY_000000": , ')
+    count = max(1, size // member_size)
+    return {f"KEY_{i}": make_member(i, depth, width) for i in range(count)}
+
+
+def make_template(document: dict, every: int = 2) -> dict:
+    """Template to fill: every "every"-th member of document with empty values, one array item"""
+    return {key: _empty_copy(value) for i, (key, value) in enumerate(document.items()) if i % every == 0}
+
+
+def make_fill_inputs(size: int, depth: int = 2, width: int = 10) -> tuple[str, str]:
+    """:return: "to_fill" and "from_fill" JSON strings for filler, "from_fill" is about "size" bytes"""
+    document = make_json_document(size, depth=depth, width=width)
+    return json.dumps(make_template(document)), json.dumps(document)
+
+
+def make_sage_dump(size: int, fields: int = 50) -> str:
+    """Records of "key = value" lines separated by header lines, about "size" chars"""
+    lines = []
+    length = 0
+    record = 0
+    while length < size:
+        header = f"[record {record}]"
+        lines.append(header)
+        length += len(header) + 1
+        for i in range(fields):
+            line = f"FIELD_{i} = {_sage_value(i, record)}"
+            lines.append(line)
+            length += len(line) + 1
+        lines.append("")
+        record += 1
+    return "\n".join(lines)
+
+
+def make_type_example(fields: int = 50) -> dict:
+    """Example dict for values of make_sage_dump and make_wide_record"""
+    return {f"FIELD_{i}": ("text", 1, 1.5, True, [""])[i % 5] for i in range(fields)}
+
+
+def make_wide_record(fields: int) -> dict:
+    """Raw string values like from Sage or table, types are given by make_type_example"""
+    return {f"FIELD_{i}": _sage_value(i, i) for i in range(fields)}
+
+
+def make_xlsx_table(path: str, rows: int, extra_columns: int = 20) -> None:
+    """Sheet with "variable_name" and "variable_value" columns between extra columns"""
+    from openpyxl import Workbook  # Only needed for table benchmarks
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    extra_header = [f"comment_{i}" for i in range(extra_columns)]
+    half = extra_columns // 2
+    sheet.append(extra_header[:half] + ["variable_name", "variable_value"] + extra_header[half:])
+    for row in range(rows):
+        extra = [f"text {row} {i}" for i in range(extra_columns)]
+        sheet.append(extra[:half] + [f"KEY_{row}", row if row % 2 else f"value {row}"] + extra[half:])
+    workbook.save(path)
+
+
+def _sage_value(field: int, seed: int) -> str:
+    """Value of type of make_type_example for field"""
+    kind = field % 5
+    if kind == 0:
+        return f"some value {seed} = with delimiter"
+    if kind == 1:
+        return str(seed)
+    if kind == 2:
+        return f"{seed}.5"
+    if kind == 3:
+        return ("true", "false")[seed % 2]
+    return f"a{seed}, b, c"
+
+
+def _empty_copy(value: object) -> object:
+    if isinstance(value, dict):
+        return {key: _empty_copy(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_empty_copy(value[0])] if value else []
+    return "" if isinstance(value, str) else value
@@ -0,0 +1,205 @@
+"""
+Benchmark suite of all handlers on synthetic inputs of several sizes.
+Records best time and peak of traced memory, compares them with saved baseline and
+exits with code 1 if any case is slower (or takes more memory) than baseline by more than threshold.
+
+Run from repository root:
+    python -m src.benchmarks.suite --sizes 1KB,1MB,10MB --save-baseline baseline.json
+    python -m src.benchmarks.suite --sizes 1KB,1MB,10MB --baseline baseline.json --threshold 0.25
+Baseline depends on machine, save it on the same machine where it is compared.
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+from typing import Callable
+
+from src.benchmarks.bench_utils import measure, print_row
+from src.benchmarks.generators import parse_size, format_size, make_fill_inputs, make_json_document, \
+    make_sage_dump, make_type_example, make_wide_record, make_xlsx_table
+from src.handlers.filler_handlers import filler, MATCH_BY_PATH, MATCH_BY_KEY
+from src.handlers.sage_handler import convert_sage_vars_string_to_dict, convert_sage_str_to_dict_with_correcting_types
+from src.utils.json_export import export_dict
+from src.utils.models import MonoSettingsFromUIModel, DoubleSettingsFromUIModel, DoubleAccountSettingsFromUIModel, \
+    DatesModel
+from src.utils.utils import fix_dict_values_type
+
+DEFAULT_SIZES = "1KB,100KB,1MB,10MB"
+# xlsx generation is slow, bigger tables are not generated
+MAX_TABLE_SIZE = 1024 * 1024
+# Approximate size of one table row of name and value
+TABLE_ROW_BYTES = 64
+# Approximate size of one "FIELD_n": value pair of wide record
+RECORD_FIELD_BYTES = 32
+SAGE_FIELDS = 50
+
+SETTINGS = MonoSettingsFromUIModel(
+    dates=DatesModel(date_1="2023-01-02", date_2="2023-01-05", date_3="2023-01-10",
+                     std="2022-12-31", next_std="2023-01-31"),
+    contact_id="123456",
+    account_number="654321",
+    contract_number="",
+    product_type="Common",
+    communication_type="Call",
+    is_need_convert_dt=True
+)
+DOUBLE_SETTINGS = DoubleSettingsFromUIModel(
+    primary=DoubleAccountSettingsFromUIModel(dates=SETTINGS.dates, account_number="654321", contract_number="",
+                                             product_type="Common"),
+    secondary=DoubleAccountSettingsFromUIModel(dates=SETTINGS.dates, account_number="765432", contract_number="1",
+                                               product_type="Kvk"),
+    contact_id="123456",
+    communication_type="Call",
+    is_need_convert_dt=True
+)
+
+# Case: (size, depth, width, temp directory) -> function without arguments to measure
+Case = Callable[[int, int, int, str], Callable[[], object]]
+
+
+def case_filler_path(size: int, depth: int, width: int, directory: str) -> Callable[[], object]:
+    to_fill, from_fill = make_fill_inputs(size, depth=depth, width=width)
+    settings = SETTINGS.copy(update={"fill_match_by": MATCH_BY_PATH})
+    return lambda: filler(to_fill, from_fill, settings, use_cache=False)
+
+
+def case_filler_key(size: int, depth: int, width: int, directory: str) -> Callable[[], object]:
+    to_fill, from_fill = make_fill_inputs(size, depth=depth, width=width)
+    settings = SETTINGS.copy(update={"fill_match_by": MATCH_BY_KEY})
+    return lambda: filler(to_fill, from_fill, settings, use_cache=False)
+
+
+def case_filler_double(size: int, depth: int, width: int, directory: str) -> Callable[[], object]:
+    to_fill, from_fill = make_fill_inputs(size, depth=depth, width=width)
+    return lambda: filler(to_fill, from_fill, DOUBLE_SETTINGS, use_cache=False)
+
+
+def case_export_dict(size: int, depth: int, width: int, directory: str) -> Callable[[], object]:
+    document = make_json_document(size, depth=depth, width=width)
+    return lambda: export_dict(document)
+
+
+def case_fix_dict_values_type(size: int, depth: int, width: int, directory: str) -> Callable[[], object]:
+    fields = max(1, size // RECORD_FIELD_BYTES)
+    record, example = make_wide_record(fields), make_type_example(fields)
+    return lambda: fix_dict_values_type(record, example)
+
+
+def case_sage_parse(size: int, depth: int, width: int, directory: str) -> Callable[[], object]:
+    dump = make_sage_dump(size, fields=SAGE_FIELDS)
+    return lambda: convert_sage_vars_string_to_dict(dump)
+
+
+def case_sage_convert(size: int, depth: int, width: int, directory: str) -> Callable[[], object]:
+    dump = make_sage_dump(size, fields=SAGE_FIELDS)
+    example = json.dumps(make_type_example(SAGE_FIELDS))
+    return lambda: convert_sage_str_to_dict_with_correcting_types(dump, example, use_cache=False)
+
+
+def case_table(size: int, depth: int, width: int, directory: str) -> Callable[[], object] | None:
+    if size > MAX_TABLE_SIZE:
+        return None
+    from src.handlers.tables_handler import make_json_from_table
+
+    path = os.path.join(directory, f"table_{size}.xlsx")
+    make_xlsx_table(path, rows=max(1, size // TABLE_ROW_BYTES), extra_columns=2)
+    return lambda: make_json_from_table(path, "{}", use_cache=False)
+
+
+CASES: dict[str, Case] = {
+    "filler_path": case_filler_path,
+    "filler_key": case_filler_key,
+    "filler_double": case_filler_double,
+    "export_dict": case_export_dict,
+    "fix_dict_values_type": case_fix_dict_values_type,
+    "sage_parse": case_sage_parse,
+    "sage_convert": case_sage_convert,
+    "table": case_table,
+}
+
+
+def run(cases: list[str], sizes: list[int], depth: int, width: int, repeat: int) -> dict:
+    """:return: "case@size" -> {"seconds": best time, "peak_mb": peak of traced memory}"""
+    results = {}
+    print_row("case", "size", "time, s", "peak, MB", width=22)
+    with tempfile.TemporaryDirectory() as directory:
+        for name in cases:
+            for size in sizes:
+                func = CASES[name](size, depth, width, directory)
+                if func is None:
+                    continue
+                seconds, peak = measure(func, repeat=repeat)
+                results[f"{name}@{format_size(size)}"] = {"seconds": seconds, "peak_mb": peak}
+                print_row(name, format_size(size), f"{seconds:.4f}", f"{peak:.1f}", width=22)
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float, memory_threshold: float,
+            min_seconds: float, min_mb: float) -> list[str]:
+    """
+    :param min_seconds: time of cases faster than this in baseline is too noisy to compare
+    :param min_mb: peak of cases smaller than this in baseline is too noisy to compare
+    :return: descriptions of regressions
+    """
+    regressions = []
+    for key, result in results.items():
+        base = baseline.get(key)
+        if base is None:
+            continue
+        if base["seconds"] >= min_seconds and result["seconds"] > base["seconds"] * (1 + threshold):
+            regressions.append(f"{key}: time {result['seconds']:.4f} s, baseline {base['seconds']:.4f} s")
+        if base["peak_mb"] >= min_mb and result["peak_mb"] > base["peak_mb"] * (1 + memory_threshold):
+            regressions.append(f"{key}: peak {result['peak_mb']:.1f} MB, baseline {base['peak_mb']:.1f} MB")
+    return regressions
+
+
+def main(args: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cases", default=",".join(CASES), help=f"comma separated, available: {', '.join(CASES)}")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="comma separated, like 1KB,10MB,100MB")
+    parser.add_argument("--depth", type=int, default=2, help="nesting of generated JSON members")
+    parser.add_argument("--width", type=int, default=10, help="keys on every level of generated JSON members")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--baseline", help="JSON file with saved results to compare with")
+    parser.add_argument("--save-baseline", help="save results to this JSON file")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed relative slowdown, 0.25 - 25%%")
+    parser.add_argument("--memory-threshold", type=float, default=0.25, help="allowed relative growth of peak")
+    parser.add_argument("--min-seconds", type=float, default=0.005)
+    parser.add_argument("--min-mb", type=float, default=1.0)
+    args = parser.parse_args(args)
+
+    cases = [name.strip() for name in args.cases.split(",") if name.strip()]
+    unknown = [name for name in cases if name not in CASES]
+    if unknown:
+        print(f"Unknown cases: {', '.join(unknown)}", file=sys.stderr)
+        return 2
+    try:
+        sizes = [parse_size(size) for size in args.sizes.split(",")]
+    except ValueError as err:
+        print(err, file=sys.stderr)
+        return 2
+
+    results = run(cases, sizes, depth=args.depth, width=args.width, repeat=args.repeat)
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+        print(f"Baseline saved: {args.save_baseline}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as file:
+            baseline = json.load(file)
+        regressions = compare(results, baseline, threshold=args.threshold,
+                              memory_threshold=args.memory_threshold, min_seconds=args.min_seconds,
+                              min_mb=args.min_mb)
+        for regression in regressions:
+            print(f"REGRESSION: {regression}")
+        if regressions:
+            return 1
+        print("No regressions")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
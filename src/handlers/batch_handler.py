@@ -0,0 +1,102 @@
+import glob
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from src.handlers.filler_handlers import prepare_fill_source, fill_with_index
+from src.utils.exceptions import ConvertStrToDictException
+from src.utils.models import MonoSettingsFromUIModel, BatchSummaryModel, BatchFileErrorModel
+
+logger = logging.getLogger("app.batch_handler")
+
+# Set in every worker process once by _init_worker
+_worker_index: dict = {}
+_worker_settings: MonoSettingsFromUIModel | None = None
+_worker_export_options: dict = {}
+
+
+def find_json_files(input_path: str) -> list[str]:
+    """
+    :param input_path: directory (all *.json files recursively) or glob pattern
+    :return: sorted list of file paths
+    """
+    if os.path.isdir(input_path):
+        pattern = os.path.join(input_path, "**", "*.json")
+    else:
+        pattern = input_path
+    return sorted(path for path in glob.glob(pattern, recursive=True) if os.path.isfile(path))
+
+
+def fill_files(paths: list[str],
+               from_fill: dict,
+               settings: MonoSettingsFromUIModel,
+               output_dir: str,
+               workers: int = None,
+               indent: int | None = None,
+               compact: bool = False) -> BatchSummaryModel:
+    """
+    Fill every file from paths by "from_fill" in process pool and write results to output_dir.
+    Structure of directories relative to common path of input files is kept.
+
+    :param from_fill: parsed source JSON, sent to every worker once and indexed there once for all files
+    :param workers: process count, None - cpu count
+    :return: summary with sizes, time and errors
+    """
+    summary = BatchSummaryModel()
+    if not paths:
+        return summary
+
+    base_dir = os.path.commonpath([os.path.dirname(os.path.abspath(path)) for path in paths])
+    tasks = [(path, _output_path(path, base_dir, output_dir)) for path in paths]
+    chunksize = max(1, len(tasks) // ((workers or os.cpu_count() or 1) * 4))
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers,
+                             initializer=_init_worker,
+                             initargs=(from_fill, settings, {"indent": indent, "compact": compact})) as executor:
+        for path, input_bytes, output_bytes, error in executor.map(_fill_file, tasks, chunksize=chunksize):
+            summary.files += 1
+            summary.input_bytes += input_bytes
+            summary.output_bytes += output_bytes
+            if error is not None:
+                summary.errors.append(BatchFileErrorModel(path=path, error=error))
+                logger.error(f"Batch fill error: {path}: {error}")
+    summary.seconds = time.perf_counter() - start
+
+    logger.info(f"Batch fill finished: {summary.files} files, {len(summary.errors)} errors, "
+                f"{summary.seconds:.2f} sec")
+    return summary
+
+
+def _output_path(path: str, base_dir: str, output_dir: str) -> str:
+    return os.path.join(output_dir, os.path.relpath(os.path.abspath(path), base_dir))
+
+
+def _init_worker(from_fill: dict, settings: MonoSettingsFromUIModel, export_options: dict) -> None:
+    global _worker_index, _worker_settings, _worker_export_options
+    _worker_index = prepare_fill_source(from_fill, is_mono=True, match_by=settings.fill_match_by)
+    _worker_settings = settings
+    _worker_export_options = export_options
+
+
+def _fill_file(task: tuple[str, str]) -> tuple[str, int, int, str | None]:
+    """:return: input path, input size, output size, error text or None"""
+    path, output_path = task
+    input_bytes = 0
+    try:
+        input_bytes = os.path.getsize(path)
+        with open(path, "r", encoding="utf-8") as file:
+            to_fill = file.read()
+        result = fill_with_index(to_fill=to_fill, index=_worker_index, settings=_worker_settings,
+                                 **_worker_export_options)
+
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        with open(output_path, "w", encoding="utf-8") as file:
+            file.write(result)
+        return path, input_bytes, os.path.getsize(output_path), None
+    except ConvertStrToDictException as err:
+        return path, input_bytes, 0, str(err)
+    except Exception as err:
+        # Any error of one file (RecursionError on deep nesting, TypeError on odd values) must not stop pool
+        return path, input_bytes, 0, f"{type(err).__name__}: {err}"
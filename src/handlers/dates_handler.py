@@ -0,0 +1,70 @@
+import datetime
+from typing import Iterable, Mapping, Sequence
+
+from src.utils.models import DatesModel, MonoDatesModel
+
+# Offset fields of MonoDatesModel, every one gives date with the same name in DatesModel
+OFFSET_FIELDS = ("date_1", "date_2", "date_3", "std")
+# Mon-Fri, numpy busday weekmask format
+DEFAULT_WEEKMASK = "1111100"
+
+
+def plus_days_batch(offsets: Mapping[str, Sequence[int] | int],
+                    today: datetime.date = None,
+                    business_days: bool = False,
+                    weekmask: str = DEFAULT_WEEKMASK,
+                    holidays: Iterable[datetime.date | str] = ()) -> dict[str, list[str]]:
+    """
+    Vectorized plus_days_from_now for many records: all dates are calculated by numpy datetime64 arithmetic,
+    without python date object per value.
+    NEXT_STD is STD plus one month, day is clamped to the last day of next month (31.01 -> 28.02 or 29.02),
+    same as relativedelta(months=1) in plus_days_from_now.
+
+    :param offsets: OFFSET_FIELDS -> day offsets from today of every record. Scalar is used for all records
+    :param today: date offsets are counted from, default - today
+    :param business_days: offsets are counted in business days of weekmask and holidays calendar,
+        today and NEXT_STD on day off are moved to the next business day
+    :param weekmask: business days of week from Monday, like "1111100"
+    :param holidays: days off besides weekends
+    :return: DatesModel fields -> "YYYY-MM-DD" values, one per record
+    """
+    import numpy as np  # Loaded on first use to speed up start
+
+    start = np.datetime64(today or datetime.date.today(), "D")
+    arrays = np.broadcast_arrays(*(np.atleast_1d(offsets[field]).astype(np.int64) for field in OFFSET_FIELDS))
+    if business_days:
+        calendar = np.busdaycalendar(weekmask=weekmask, holidays=[np.datetime64(day, "D") for day in holidays])
+        dates = {field: np.busday_offset(start, array, roll="forward", busdaycal=calendar)
+                 for field, array in zip(OFFSET_FIELDS, arrays)}
+    else:
+        calendar = None
+        dates = {field: start + array for field, array in zip(OFFSET_FIELDS, arrays)}
+
+    std = dates["std"]
+    month = std.astype("datetime64[M]")
+    next_month = month + 1
+    next_month_days = ((next_month + 1).astype("datetime64[D]") - next_month.astype("datetime64[D]")).astype(np.int64)
+    day_of_month = (std - month.astype("datetime64[D]")).astype(np.int64)
+    next_std = next_month.astype("datetime64[D]") + np.minimum(day_of_month, next_month_days - 1)
+    if calendar is not None:
+        next_std = np.busday_offset(next_std, 0, roll="forward", busdaycal=calendar)
+    dates["next_std"] = next_std
+
+    return {field: np.datetime_as_string(values, unit="D").tolist() for field, values in dates.items()}
+
+
+def plus_days_for_settings(settings: Sequence[MonoDatesModel], **kwargs) -> list[DatesModel]:
+    """
+    plus_days_batch for list of date settings
+
+    :param kwargs: today, business_days, weekmask, holidays of plus_days_batch
+    """
+    if not settings:
+        return []
+    offsets = {field: [getattr(item, field) for item in settings] for field in OFFSET_FIELDS}
+    return to_dates_models(plus_days_batch(offsets, **kwargs))
+
+
+def to_dates_models(dates: Mapping[str, list[str]]) -> list[DatesModel]:
+    """Result of plus_days_batch to DatesModel per record"""
+    return [DatesModel(**dict(zip(dates, values))) for values in zip(*dates.values())]
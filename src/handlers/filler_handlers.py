@@ -1,17 +1,68 @@
 import datetime
-import json
 import logging
+import re
+import threading
 
+from collections import deque
 from datetime import datetime as dt
-from dateutil.relativedelta import relativedelta
-from src.utils.models import DatesModel, MonoDatesModel, MonoSettingsFromUIModel, DoubleSettingsFromUIModel
-from src.utils.exceptions import ConvertStrToDictException
-from src.utils.utils import correct_dict_to_export, get_root_json_as_dict
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Container, Iterator, Mapping
+from src.utils import codec
+from src.utils.models import DatesModel, MonoDatesModel, MonoSettingsFromUIModel, DoubleSettingsFromUIModel, \
+    DoubleAccountSettingsFromUIModel, ConvertReportModel, TimingSpanModel
+from src.utils.exceptions import ConvertStrToDictException, TemplateConvertException, JsonRootTypeException
+from src.utils.utils import get_root_json_as_dict, get_root_json_stamp
+from src.utils.json_export import export_dict
+from src.utils.json_stream import is_streaming_needed, load_selected_keys, iter_object_items
+from src.utils.loggs.logger import PayloadSummary
+from src.utils.schema import DATE_PATTERN, DATE_TIME_PATTERN, validate_by_root_schema
+from src.utils.result_cache import make_cache_key, get_cached_result, put_cached_result
+from src.utils.profiling import timing_span
 
 logger = logging.getLogger("app.filler_handlers")
 
+# Fill match modes
+MATCH_BY_PATH = "path"  # key matches only on the same path from root
+MATCH_BY_KEY = "key"  # key matches on any nesting level, the least nested value in "from_fill" wins
+
+# Cheap checks before strptime (DATE_PATTERN, DATE_TIME_PATTERN from schema), most of values are not dates
+# Zero padded DateTime can be parsed with fromisoformat, it is much faster than strptime.
+# Before python 3.11 fromisoformat accepts only 3 or 6 digits of fraction, other ones go to strptime
+ISO_DATE_TIME_PATTERN = re.compile(r"\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}\.(\d{3}|\d{6})")
+
+# Settings field -> keys in JSON to fill with its value
+MONO_VALUE_RULES = {
+    "product_type": ("PRODUCT_TYPE", "PRIMARY_PRODUCT_TYPE", "PRIMARY_ACCOUNT_PRODUCT_TYPE"),
+    "contact_id": ("CONTACT_ID",),
+    "account_number": ("ACCOUNT_NUMBER", "PRIMARY_ACCOUNT_NUMBER"),
+    "contract_number": ("CONTRACT_NUMBER", "PRIMARY_CONTRACT_NUMBER"),
+    "communication_type": ("COMMUNICATION_TYPE",),
+}
+MONO_DATES_RULES = {
+    "date_1": ("DATE1", "DATE_1", "PRIMARY_ACCOUNT_DATE1", "PRIMARY_ACCOUNT_DATE_1"),
+    "date_2": ("DATE2", "DATE_2", "PRIMARY_ACCOUNT_DATE2", "PRIMARY_ACCOUNT_DATE_2"),
+    "date_3": ("DATE3", "DATE_3", "PRIMARY_ACCOUNT_DATE3", "PRIMARY_ACCOUNT_DATE_3"),
+    "std": ("STD", "PRIMARY_ACCOUNT_STD"),
+    "next_std": ("NEXT_STD", "PRIMARY_ACCOUNT_NEXT_STD"),
+}
+# Double: primary account fills keys of mono rules, secondary account fills their "SECONDARY_" counterparts
+PRIMARY_PREFIX = "PRIMARY_"
+SECONDARY_PREFIX = "SECONDARY_"
+DOUBLE_ACCOUNT_FIELDS = ("product_type", "account_number", "contract_number")
+SECONDARY_VALUE_RULES = {
+    field: tuple(SECONDARY_PREFIX + key.removeprefix(PRIMARY_PREFIX) for key in keys if key.startswith(PRIMARY_PREFIX))
+    for field, keys in MONO_VALUE_RULES.items()
+}
+SECONDARY_DATES_RULES = {
+    field: tuple(SECONDARY_PREFIX + key.removeprefix(PRIMARY_PREFIX) for key in keys if key.startswith(PRIMARY_PREFIX))
+    for field, keys in MONO_DATES_RULES.items()
+}
+
 
 def plus_days_from_now(settings: MonoDatesModel = None) -> DatesModel:
+    from dateutil.relativedelta import relativedelta  # Loaded on first use to speed up start
+
     today = dt.today()
 
     date_1 = (today + datetime.timedelta(days=settings.date_1)).date()
@@ -29,139 +80,611 @@ def plus_days_from_now(settings: MonoDatesModel = None) -> DatesModel:
     )
 
 
-def filler(to_fill: str, from_fill: str, settings: MonoSettingsFromUIModel | DoubleSettingsFromUIModel) -> str:
+def filler(to_fill: str,
+           from_fill: str | dict,
+           settings: MonoSettingsFromUIModel | DoubleSettingsFromUIModel,
+           indent: int | None = None,
+           compact: bool = False,
+           report: ConvertReportModel = None,
+           use_cache: bool = True) -> str:
     """
 
     :param to_fill: JSON in str format that will fill values from "from_fill" json
-    :param from_fill: JSOn in str format. From this json will take values
+    :param from_fill: JSOn in str format. From this json will take values. Can be already parsed dict
     :param settings: Settings from UI
+    :param indent: export indent, see export_dict
+    :param compact: export in one line, see export_dict
+    :param report: if passed, mismatches of result with root template schema are saved to it
+    :param use_cache: get result of the same inputs from result cache and save result to it.
+        Only used when "from_fill" is str
     :return: JSON in str format
     """
 
-    logger.debug(f"Start filler"
-                 f"|----| to_fill: {to_fill}"
-                 f"|----| from_fill: {from_fill}")
+    logger.debug("Start filler |----| to_fill: %s |----| from_fill: %s",
+                 PayloadSummary(to_fill), PayloadSummary(from_fill))
 
     # Choose work mode
     is_mono: bool = isinstance(settings, MonoSettingsFromUIModel)
-    logger.debug(f"Work mode 'is_mono': {is_mono}")
+    match_by: str = settings.fill_match_by
+    logger.debug("Work mode 'is_mono': %s, match by: '%s'", is_mono, match_by)
+
+    cache_key = None
+    if use_cache and isinstance(from_fill, str):
+        with timing_span(report, "cache"):
+            cache_key = make_cache_key("filler", to_fill, from_fill, settings.json(), indent, compact,
+                                       report is not None, get_root_json_stamp(is_for_mono=is_mono))
+            cached = get_cached_result(cache_key, report)
+        if cached is not None:
+            return cached
 
     # Prepare dict
-    to_fill, from_fill = prepare_strings_to_filler(to_fill=to_fill, from_fill=from_fill, is_mono=is_mono)
-    logger.debug(f"Dicts was prepare to fill")
+    with timing_span(report, "parse"):
+        to_fill, from_fill = prepare_strings_to_filler(to_fill=to_fill, from_fill=from_fill,
+                                                       is_mono=is_mono, match_by=match_by)
+    logger.debug("Dicts was prepare to fill")
 
     # Fill dict without use settings
-    result: dict = fill_dict_from_another_dict(to_fill=to_fill, from_fill=from_fill)
-    logger.debug(f"Fill dict without use settings, result: {result}")
+    with timing_span(report, "fill"):
+        result: dict = fill_dict_from_another_dict(to_fill=to_fill, from_fill=from_fill, match_by=match_by)
+    del to_fill, from_fill
+    logger.debug("Fill dict without use settings, result: %s", PayloadSummary(result))
 
     # Apply settings
-    result: dict = apply_settings(result, settings)
-    logger.debug(f"Apply settings and reform result dict: {result}")
+    with timing_span(report, "settings"):
+        result: dict = apply_settings(result, settings)
+    logger.debug("Apply settings and reform result dict: %s", PayloadSummary(result))
+
+    if report is not None:
+        with timing_span(report, "validate"):
+            report.mismatches = validate_by_root_schema(result, is_for_mono=is_mono)
+
+    with timing_span(report, "export"):
+        result: str = export_dict(result, indent=indent, compact=compact)
+    if cache_key is not None:
+        put_cached_result(cache_key, result, report)
+    return result
+
+
+def fill_many(to_fills: Mapping[str, str],
+              from_fill: str | dict,
+              settings: MonoSettingsFromUIModel | DoubleSettingsFromUIModel,
+              indent: int | None = None,
+              compact: bool = False,
+              report: ConvertReportModel = None) -> dict[str, str]:
+    """
+    Fan-out fill: fill several templates by one source. Source is parsed and indexed once,
+    every template is filled against the same index.
+
+    :param to_fills: name -> JSON template in str format
+    :param from_fill: see filler
+    :param settings: Settings from UI, same for all templates
+    :param indent: export indent, see export_dict
+    :param compact: export in one line, see export_dict
+    :param report: if passed, mismatches of all results (path starts with template name)
+        and stage timings summed over templates are saved to it
+    :return: name -> JSON in str format, in order of "to_fills"
+    """
+    logger.debug("Start fill many: %s templates, from_fill: %s", len(to_fills), PayloadSummary(from_fill))
+    is_mono: bool = isinstance(settings, MonoSettingsFromUIModel)
 
-    return correct_dict_to_export(result)
+    with timing_span(report, "parse source"):
+        index = prepare_fill_source(from_fill, is_mono=is_mono, match_by=settings.fill_match_by)
 
+    reports = {name: ConvertReportModel() for name in to_fills} if report is not None else {}
+
+    results = {}
+    for name, to_fill in to_fills.items():
+        try:
+            results[name] = fill_with_index(to_fill, index, settings, indent=indent, compact=compact,
+                                            report=reports.get(name))
+        except (ConvertStrToDictException, JsonRootTypeException) as err:
+            raise TemplateConvertException(f"Template '{name}': {str(err)}") from err
+
+    if report is not None:
+        _merge_reports(report, reports)
+    logger.debug(f"Finish fill many: {len(results)} results")
+    return results
 
-def fill_dict_from_another_dict(to_fill: dict, from_fill: dict) -> dict:
-    logger.debug("Start filling dict from another dict")
-    result = {}
 
-    for key, value in to_fill.items():
-        if key in from_fill:
-            result[key] = from_fill[key]
+def prepare_fill_source(from_fill: str | dict, is_mono: bool, match_by: str = MATCH_BY_PATH) -> dict:
+    """
+    Parse "from_fill" (empty - root template) and build full index of it for fill_with_index.
+    Index can be reused by any number of templates and threads, it is only read
+    """
+    if isinstance(from_fill, str):
+        if from_fill == "\n" or from_fill == "":
+            from_fill = get_root_json_as_dict(is_for_mono=is_mono)
         else:
-            result[key] = to_fill[key]
+            try:
+                from_fill = codec.loads(from_fill)
+            except codec.JSONDecodeError as err:
+                raise ConvertStrToDictException(f"{str(err)}-F")
+    return build_fill_index(from_fill, match_by=match_by)
+
+
+def fill_with_index(to_fill: str,
+                    index: dict,
+                    settings: MonoSettingsFromUIModel | DoubleSettingsFromUIModel,
+                    indent: int | None = None,
+                    compact: bool = False,
+                    report: ConvertReportModel = None) -> str:
+    """
+    Same as filler, but source is already parsed and indexed by prepare_fill_source with the same match mode.
+    Results are not cached
+    """
+    is_mono: bool = isinstance(settings, MonoSettingsFromUIModel)
+    match_by: str = settings.fill_match_by
+
+    with timing_span(report, "parse"):
+        try:
+            to_fill: dict = codec.loads(to_fill)
+        except codec.JSONDecodeError as err:
+            raise ConvertStrToDictException(f"{str(err)}-T")
+
+    with timing_span(report, "fill"):
+        result: dict = fill_dict_from_another_dict(to_fill=to_fill, from_fill=index, match_by=match_by, index=index)
+    with timing_span(report, "settings"):
+        result = apply_settings(result, settings)
+
+    if report is not None:
+        with timing_span(report, "validate"):
+            report.mismatches = validate_by_root_schema(result, is_for_mono=is_mono)
+
+    with timing_span(report, "export"):
+        return export_dict(result, indent=indent, compact=compact)
+
+
+def join_named_results(results: Mapping[str, str]) -> str:
+    """
+    Export named results of fill_many together as one JSON object: name -> result.
+    Results are already valid JSON, they are joined as strings without parsing again
+    """
+    if not results:
+        return "{}"
+    return "{\n" + ",\n".join(f"{codec.dumps(name, compact=True)}: {result}"
+                               for name, result in results.items()) + "\n}"
+
+
+def _merge_reports(report: ConvertReportModel, reports: Mapping[str, ConvertReportModel]) -> None:
+    """Mismatches of all reports with template name in path, spans of the same stage are summed"""
+    stages: dict[str, float] = {}
+    for name, template_report in reports.items():
+        for mismatch in template_report.mismatches:
+            report.mismatches.append(mismatch.copy(update={"path": f"{name}: {mismatch.path}"}))
+        for span in template_report.spans:
+            stages[span.stage] = stages.get(span.stage, 0.0) + span.seconds
+    report.spans.extend(TimingSpanModel(stage=stage, seconds=seconds) for stage, seconds in stages.items())
+
+
+class IncrementalFiller:
+    """
+    Filler for live mode. Results of every stage of the last run are kept, next run recomputes
+    only stages whose inputs were changed:
+    parse "to_fill" | parse and index "from_fill" -> fill -> apply settings -> export.
+    "from_fill" is always parsed whole (without streaming mode) to reuse it for any "to_fill".
+    Runs are serialized by lock, object can be called from worker threads
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._clear()
+
+    def _clear(self) -> None:
+        self._to_fill_source: str | None = None
+        self._to_fill: dict | None = None
+        self._index_key: tuple | None = None
+        self._index: dict | None = None
+        self._filled_key: tuple | None = None
+        self._filled: dict | None = None
+        self._result_key: tuple | None = None
+        self._result: dict | None = None
+        self._mismatches: list = []
+        self._export_key: tuple | None = None
+        self._export: str | None = None
+        self.last_recomputed: list[str] = []
+
+    def fill(self,
+             to_fill: str,
+             from_fill: str,
+             settings: MonoSettingsFromUIModel | DoubleSettingsFromUIModel,
+             indent: int | None = None,
+             compact: bool = False,
+             report: ConvertReportModel = None) -> str:
+        """Same as filler, see it for params"""
+        with self._lock:
+            self.last_recomputed = []
+            is_mono: bool = isinstance(settings, MonoSettingsFromUIModel)
+            match_by: str = settings.fill_match_by
+
+            with timing_span(report, "parse"):
+                to_fill_dict = self._get_to_fill(to_fill)
+                index = self._get_index(from_fill, is_mono=is_mono, match_by=match_by)
+
+            filled_key = (to_fill_dict, index, match_by)
+            if not _is_same_key(self._filled_key, filled_key):
+                with timing_span(report, "fill"):
+                    self._filled = self._fill(to_fill_dict, index, match_by=match_by)
+                self._filled_key = filled_key
+
+            result_key = (self._filled, settings)
+            if not _is_same_key(self._result_key, result_key):
+                with timing_span(report, "settings"):
+                    self._result = apply_settings(self._filled, settings)
+                self._result_key = result_key
+                with timing_span(report, "validate"):
+                    self._mismatches = validate_by_root_schema(self._result, is_for_mono=is_mono)
+                self.last_recomputed.append("settings")
+            if report is not None:
+                report.mismatches = self._mismatches
+
+            export_key = (self._result, indent, compact)
+            if not _is_same_key(self._export_key, export_key):
+                with timing_span(report, "export"):
+                    self._export = export_dict(self._result, indent=indent, compact=compact)
+                self._export_key = export_key
+                self.last_recomputed.append("export")
+
+            logger.debug(f"Live fill recomputed stages: {self.last_recomputed}")
+            return self._export
+
+    def reset(self) -> None:
+        """Drop all kept stages"""
+        with self._lock:
+            self._clear()
+
+    def _fill(self, to_fill: dict, index: dict, match_by: str) -> dict:
+        """
+        If only "to_fill" was changed in MATCH_BY_PATH mode, top-level members equal to previous ones
+        take previous filled values, only changed members are filled again
+        """
+        previous_key = self._filled_key
+        if (match_by != MATCH_BY_PATH or previous_key is None or previous_key[1] is not index
+                or previous_key[2] != match_by or not isinstance(to_fill, dict)
+                or not isinstance(previous_key[0], dict) or not isinstance(index, dict)):
+            self.last_recomputed.append("fill")
+            return fill_dict_from_another_dict(to_fill=to_fill, from_fill=index, match_by=match_by, index=index)
+
+        previous_to_fill, previous_filled = previous_key[0], self._filled
+        result = {}
+        changed = 0
+        for key, value in to_fill.items():
+            if key in previous_to_fill and previous_to_fill[key] == value:
+                result[key] = previous_filled[key]
+            else:
+                result[key] = _fill_by_path(value, index[key]) if key in index else value
+                changed += 1
+        self.last_recomputed.append(f"fill {changed} of {len(to_fill)} members")
+        return result
+
+    def _get_to_fill(self, to_fill: str) -> dict:
+        if to_fill != self._to_fill_source:
+            try:
+                self._to_fill = codec.loads(to_fill)
+            except codec.JSONDecodeError as err:
+                raise ConvertStrToDictException(f"{str(err)}-T")
+            self._to_fill_source = to_fill
+            self.last_recomputed.append("parse to_fill")
+        return self._to_fill
+
+    def _get_index(self, from_fill: str, is_mono: bool, match_by: str) -> dict:
+        if from_fill == "\n" or from_fill == "":
+            # Root template: index is built again only when template file is changed
+            stamp = get_root_json_stamp(is_for_mono=is_mono)
+            index_key = (None, is_mono, stamp, match_by)
+            if stamp is None or self._index_key != index_key:
+                self._index = build_fill_index(get_root_json_as_dict(is_for_mono=is_mono), match_by=match_by)
+                self._index_key = index_key
+                self.last_recomputed.append("index root template")
+            return self._index
+
+        index_key = (from_fill, match_by)
+        if self._index_key != index_key:
+            try:
+                from_fill_dict: dict = codec.loads(from_fill)
+            except codec.JSONDecodeError as err:
+                raise ConvertStrToDictException(f"{str(err)}-F")
+            self._index = build_fill_index(from_fill_dict, match_by=match_by)
+            self._index_key = index_key
+            self.last_recomputed.append("parse from_fill")
+        return self._index
+
+
+def _is_same_key(old_key: tuple | None, new_key: tuple) -> bool:
+    """Stage keys: objects of previous stages are compared by identity, other values by equality"""
+    if old_key is None:
+        return False
+    for old, new in zip(old_key, new_key):
+        if isinstance(new, (dict, list)):
+            if old is not new:
+                return False
+        elif old != new:
+            return False
+    return True
+
+
+def fill_dict_from_another_dict(to_fill: dict,
+                                from_fill: dict,
+                                match_by: str = MATCH_BY_PATH,
+                                index: dict = None) -> dict:
+    """
+    Fill values of "to_fill" on every nesting level by values from "from_fill" in one walk.
+    "to_fill" is a template: result has only its keys. Matched values:
+    - both objects - filled recursively;
+    - both arrays - filled item by item, length is taken from "from_fill" (extra items of "from_fill" are
+      taken as is, extra items of "to_fill" are dropped);
+    - object or array in "to_fill" and other type in "from_fill" - template value is kept;
+    - other template values (scalars, null) are replaced by value from "from_fill".
+    MATCH_BY_KEY matches keys on any nesting level: template objects are filled by key again on every
+    level, matched array is filled item by item from matched "from_fill" array by path rules above.
+
+    :param to_fill: dict to fill
+    :param from_fill: dict with values
+    :param match_by: MATCH_BY_PATH or MATCH_BY_KEY
+    :param index: index built by build_fill_index for "from_fill", to reuse it between calls
+    :return: new dict, not changed subtrees of "to_fill" and values of "from_fill" are not copied
+    :raise JsonRootTypeException: "to_fill" or "from_fill" is not an object
+    """
+    logger.debug("Start filling dict from another dict, match by: '%s'", match_by)
+    if not isinstance(to_fill, dict):
+        raise JsonRootTypeException(f"Root of template must be an object, got {type(to_fill).__name__}-T")
+    if index is None:
+        keys = collect_keys(to_fill) if match_by == MATCH_BY_KEY else None
+        index = build_fill_index(from_fill, match_by=match_by, keys=keys)
+
+    if match_by == MATCH_BY_PATH:
+        result = _fill_by_path(to_fill, index)
+    elif match_by == MATCH_BY_KEY:
+        result = _fill_by_key(to_fill, index)
+    else:
+        raise ValueError(f"Unknown match mode: '{match_by}'")
     logger.debug("Finish filling dict from another dict")
     return result
 
 
-def apply_settings(dict_to_valid: dict, settings: MonoSettingsFromUIModel | DoubleSettingsFromUIModel) -> dict:
-    logger.debug(f"Start apply settings")
-    # For mono
-    if isinstance(settings, MonoSettingsFromUIModel):
-        # logger.debug("Applying to mono")
-        value_from_settings = {
-            "PRODUCT_TYPE": settings.product_type.strip(),
-            "PRIMARY_PRODUCT_TYPE": settings.product_type.strip(),
-            "PRIMARY_ACCOUNT_PRODUCT_TYPE": settings.product_type.strip(),
-            "CONTACT_ID": settings.contact_id.strip(),
-            "ACCOUNT_NUMBER": settings.account_number.strip(),
-            "PRIMARY_ACCOUNT_NUMBER": settings.account_number.strip(),
-            "CONTRACT_NUMBER": settings.contract_number.strip(),
-            "PRIMARY_CONTRACT_NUMBER": settings.contract_number.strip(),
-            "COMMUNICATION_TYPE": settings.communication_type.strip()
-        }
-        dates_value_from_settings = {
-            "DATE1": settings.dates.date_1.strip(),
-            "DATE_1": settings.dates.date_1.strip(),
-            "PRIMARY_ACCOUNT_DATE1": settings.dates.date_1.strip(),
-            "PRIMARY_ACCOUNT_DATE_1": settings.dates.date_1.strip(),
-            "DATE2": settings.dates.date_2.strip(),
-            "DATE_2": settings.dates.date_2.strip(),
-            "PRIMARY_ACCOUNT_DATE2": settings.dates.date_2.strip(),
-            "PRIMARY_ACCOUNT_DATE_2": settings.dates.date_2.strip(),
-            "DATE3": settings.dates.date_3.strip(),
-            "DATE_3": settings.dates.date_3.strip(),
-            "PRIMARY_ACCOUNT_DATE3": settings.dates.date_3.strip(),
-            "PRIMARY_ACCOUNT_DATE_3": settings.dates.date_3.strip(),
-            "STD": settings.dates.std.strip(),
-            "PRIMARY_ACCOUNT_STD": settings.dates.std.strip(),
-            "NEXT_STD": settings.dates.next_std.strip(),
-            "PRIMARY_ACCOUNT_NEXT_STD": settings.dates.next_std.strip()
+def build_fill_index(from_fill: dict, match_by: str = MATCH_BY_PATH, keys: Container[str] = None) -> dict:
+    """
+    Build index of "from_fill" once for fill_dict_from_another_dict
+
+    MATCH_BY_PATH - "from_fill" itself is a key-path index, walk goes down it together with "to_fill".
+    MATCH_BY_KEY - flat dict: key -> the least nested value with this key (first one on the same level)
+
+    :param keys: if set, only these keys are indexed
+    :raise JsonRootTypeException: "from_fill" is not an object
+    """
+    if not isinstance(from_fill, Mapping):
+        raise JsonRootTypeException(f"Root of source must be an object, got {type(from_fill).__name__}-F")
+    if match_by == MATCH_BY_PATH:
+        return from_fill
+
+    index = {}
+    for key, _, value in iter_keys_breadth_first(from_fill):
+        if key not in index and (keys is None or key in keys):
+            index[key] = value
+    return index
+
+
+def iter_keys_breadth_first(node: dict | list, depth: int = 0) -> Iterator[tuple[str, int, object]]:
+    """Yield (key, depth, value) of all objects in node, less nested keys first"""
+    queue = deque([(node, depth)])
+    while queue:
+        node, depth = queue.popleft()
+        if isinstance(node, dict):
+            for key, value in node.items():
+                yield key, depth, value
+                if isinstance(value, (dict, list)):
+                    queue.append((value, depth + 1))
+        else:
+            queue.extend((value, depth + 1) for value in node if isinstance(value, (dict, list)))
+
+
+def collect_keys(node: dict | list) -> set:
+    """All keys of all objects in node"""
+    keys = set()
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            keys.update(node)
+            stack.extend(value for value in node.values() if isinstance(value, (dict, list)))
+        else:
+            stack.extend(value for value in node if isinstance(value, (dict, list)))
+    return keys
+
+
+def _fill_by_path(to_value, from_value):
+    if isinstance(to_value, dict):
+        if not isinstance(from_value, dict):
+            return to_value
+        return {
+            key: _fill_by_path(value, from_value[key]) if key in from_value else value
+            for key, value in to_value.items()
         }
-    # For Double
-    else:
-        value_from_settings = {}
-        dates_value_from_settings = {}
+    if isinstance(to_value, list):
+        if not isinstance(from_value, list):
+            return to_value
+        to_len = len(to_value)
+        return [
+            _fill_by_path(to_value[i], value) if i < to_len else value
+            for i, value in enumerate(from_value)
+        ]
+    return from_value
+
+
+def _fill_by_key(to_value, index: dict):
+    if isinstance(to_value, list):
+        return [_fill_by_key(value, index) if isinstance(value, (dict, list)) else value for value in to_value]
+
+    result = {}
+    for key, value in to_value.items():
+        if isinstance(value, list) and isinstance(index.get(key), list):
+            result[key] = _fill_by_path(value, index[key])
+        elif isinstance(value, (dict, list)):
+            result[key] = _fill_by_key(value, index)
+        elif key in index:
+            result[key] = index[key]
+        else:
+            result[key] = value
+    return result
+
+
+def apply_settings(dict_to_valid: dict, settings: MonoSettingsFromUIModel | DoubleSettingsFromUIModel) -> dict:
+    logger.debug("Start apply settings")
+    rules = compile_settings_rules(settings)
+    is_need_convert_dt = getattr(settings, "is_need_convert_dt", False)
 
     result_dict = {}
     for key, value in dict_to_valid.items():
 
-        if (key in value_from_settings) and (value_from_settings[key] != ""):
-            result_dict[key] = value_from_settings.get(key)
-            continue
-
-        elif (key in dates_value_from_settings) and is_date_value(dates_value_from_settings[key]):
-            result_dict[key] = dates_value_from_settings[key]
-            continue
+        if key in rules:
+            result_dict[key] = rules[key]
 
-        elif settings.is_need_convert_dt and is_date_time_value(value):
+        elif is_need_convert_dt and is_date_time_value(value):
             result_dict[key] = convert_dt_string_to_date(value)
-            continue
 
         else:
             result_dict[key] = value
-    logger.debug(f"Finish apply settings")
+    logger.debug("Finish apply settings")
 
     return result_dict
 
 
-def prepare_strings_to_filler(to_fill: str, from_fill: str, is_mono: bool) -> tuple[dict, dict]:
-    if from_fill == "\n" or from_fill == "":
+def compile_settings_rules(settings: MonoSettingsFromUIModel | DoubleSettingsFromUIModel) -> Mapping[str, str]:
+    """
+    Compile settings from UI to read-only rule table: key -> value to set.
+    Empty values and invalid dates are not included. Compiled tables are cached by settings values.
+    Rules of both double accounts are in one table, so apply_settings sets them in one walk
+    """
+    if isinstance(settings, MonoSettingsFromUIModel):
+        return _compile_mono_settings_rules(
+            values=tuple(getattr(settings, field) for field in MONO_VALUE_RULES),
+            dates=tuple(getattr(settings.dates, field) for field in MONO_DATES_RULES)
+        )
+    # For Double
+    return _compile_double_settings_rules(
+        primary_values=_get_double_account_values(settings, settings.primary),
+        primary_dates=tuple(getattr(settings.primary.dates, field) for field in MONO_DATES_RULES),
+        secondary_values=_get_double_account_values(settings, settings.secondary),
+        secondary_dates=tuple(getattr(settings.secondary.dates, field) for field in MONO_DATES_RULES)
+    )
+
+
+@lru_cache(maxsize=32)
+def _compile_mono_settings_rules(values: tuple[str, ...], dates: tuple[str, ...]) -> Mapping[str, str]:
+    return MappingProxyType(_make_settings_rules(values, dates, MONO_VALUE_RULES, MONO_DATES_RULES))
+
+
+@lru_cache(maxsize=32)
+def _compile_double_settings_rules(primary_values: tuple[str, ...],
+                                   primary_dates: tuple[str, ...],
+                                   secondary_values: tuple[str, ...],
+                                   secondary_dates: tuple[str, ...]) -> Mapping[str, str]:
+    rules = _make_settings_rules(primary_values, primary_dates, MONO_VALUE_RULES, MONO_DATES_RULES)
+    rules.update(_make_settings_rules(secondary_values, secondary_dates, SECONDARY_VALUE_RULES, SECONDARY_DATES_RULES))
+    return MappingProxyType(rules)
+
+
+def _make_settings_rules(values: tuple[str, ...],
+                         dates: tuple[str, ...],
+                         value_rules: dict[str, tuple[str, ...]],
+                         dates_rules: dict[str, tuple[str, ...]]) -> dict[str, str]:
+    """:param values, dates: values of settings fields in order of value_rules and dates_rules"""
+    rules = {}
+    for value, keys in zip(values, value_rules.values()):
+        value = value.strip()
+        if value != "":
+            rules.update(dict.fromkeys(keys, value))
+
+    for date, keys in zip(dates, dates_rules.values()):
+        date = date.strip()
+        if is_date_value(date):
+            rules.update(dict.fromkeys(keys, date))
+
+    return rules
+
+
+def _get_double_account_values(settings: DoubleSettingsFromUIModel,
+                               account: DoubleAccountSettingsFromUIModel) -> tuple[str, ...]:
+    """Values in order of MONO_VALUE_RULES: account fields from account, other ones are common for both"""
+    return tuple(getattr(account if field in DOUBLE_ACCOUNT_FIELDS else settings, field)
+                 for field in MONO_VALUE_RULES)
+
+
+def prepare_strings_to_filler(to_fill: str,
+                              from_fill: str | dict,
+                              is_mono: bool,
+                              match_by: str = MATCH_BY_PATH) -> tuple[dict, dict]:
+    """
+    Parse both JSON strings. Already parsed "from_fill" dict is used as is.
+    Big "from_fill" (see json_stream.STREAMING_THRESHOLD) is parsed in streaming mode:
+    values that can't match any key of "to_fill" are dropped right after parsing
+    """
+    if isinstance(from_fill, dict):
+        pass
+    elif from_fill == "\n" or from_fill == "":
         from_fill = get_root_json_as_dict(is_for_mono=is_mono)
+    elif is_streaming_needed(from_fill):
+        return prepare_strings_to_filler_streaming(to_fill=to_fill, from_fill=from_fill, match_by=match_by)
     else:
         try:
-            from_fill: dict = json.loads(from_fill)
-        except json.decoder.JSONDecodeError as err:
+            from_fill: dict = codec.loads(from_fill)
+        except codec.JSONDecodeError as err:
             raise ConvertStrToDictException(f"{str(err)}-F")
 
     try:
-        to_fill: dict = json.loads(to_fill)
-    except json.decoder.JSONDecodeError as err:
+        to_fill: dict = codec.loads(to_fill)
+    except codec.JSONDecodeError as err:
+        raise ConvertStrToDictException(f"{str(err)}-T")
+
+    logger.debug("Finish prepare json: to_fill: %s |----| from_fill: %s",
+                 PayloadSummary(to_fill), PayloadSummary(from_fill))
+    return to_fill, from_fill
+
+
+def prepare_strings_to_filler_streaming(to_fill: str,
+                                        from_fill: str,
+                                        match_by: str = MATCH_BY_PATH) -> tuple[dict, dict]:
+    """
+    MATCH_BY_PATH - keep only top-level members of "from_fill" with keys of "to_fill" top level.
+    MATCH_BY_KEY - "from_fill" becomes flat dict of the least nested values for keys of "to_fill"
+    """
+    try:
+        to_fill: dict = codec.loads(to_fill)
+    except codec.JSONDecodeError as err:
         raise ConvertStrToDictException(f"{str(err)}-T")
 
-    logger.debug(f"Finish prepare json:"
-                 f"to_fill: {to_fill} |----| type: {type(to_fill)}"
-                 f"from_fill: {from_fill} |----| type: {type(from_fill)}")
+    try:
+        if match_by == MATCH_BY_KEY:
+            from_fill: dict = _load_key_index_streaming(from_fill, keys=collect_keys(to_fill))
+        else:
+            from_fill: dict = load_selected_keys(from_fill, keys=to_fill)
+    except codec.JSONDecodeError as err:
+        raise ConvertStrToDictException(f"{str(err)}-F")
+
+    logger.debug(f"Finish prepare json in streaming mode, keys to fill: {len(from_fill)}")
     return to_fill, from_fill
 
 
+def _load_key_index_streaming(string: str, keys: Container[str]) -> dict:
+    found: dict[str, tuple[int, object]] = {}
+    for key, value in iter_object_items(string):
+        if key in keys and (key not in found or found[key][0] > 0):
+            found[key] = (0, value)
+        if isinstance(value, (dict, list)):
+            for nested_key, depth, nested_value in iter_keys_breadth_first(value, depth=1):
+                if nested_key in keys and (nested_key not in found or found[nested_key][0] > depth):
+                    found[nested_key] = (depth, nested_value)
+    return {key: value for key, (_, value) in found.items()}
+
+
 def is_date_time_value(value) -> bool:
     """
     Check patter: %Y-%m-%dT%H:%M:%S.%f -> True;
     2022-11-28T08:25:47.123 -> True
     """
+    if not isinstance(value, str) or DATE_TIME_PATTERN.fullmatch(value) is None:
+        return False
     try:
-        dt.strptime(value, '%Y-%m-%dT%H:%M:%S.%f')
+        _parse_date_time(value)
         return True
     except ValueError:
         return False
@@ -174,6 +697,8 @@ def is_date_value(value) -> bool:
     Check patter: %Y-%m-%d -> True;
     2022-11-28 -> True
     """
+    if not isinstance(value, str) or DATE_PATTERN.fullmatch(value) is None:
+        return False
     try:
         dt.strptime(value, '%Y-%m-%d')
         return True
@@ -184,4 +709,10 @@ def is_date_value(value) -> bool:
 
 
 def convert_dt_string_to_date(date_time: str) -> str:
-    return str(dt.strptime(date_time, '%Y-%m-%dT%H:%M:%S.%f').date())
+    return str(_parse_date_time(date_time).date())
+
+
+def _parse_date_time(date_time: str) -> dt:
+    if ISO_DATE_TIME_PATTERN.fullmatch(date_time) is not None:
+        return dt.fromisoformat(date_time)
+    return dt.strptime(date_time, '%Y-%m-%dT%H:%M:%S.%f')
@@ -1,48 +1,114 @@
-from src.utils.utils import correct_dict_to_export, fix_dict_values_type, get_root_json_as_dict, convert_string_to_dict
+import io
+from typing import Iterator
+
+from src.utils.utils import get_root_json_as_dict, convert_string_to_dict, get_root_json_stamp
+from src.utils.coercion import coerce_dict, compile_coercion_plan
+from src.utils.json_export import export_dict
 from src.utils.exceptions import ConvertStrToDictException
+from src.utils.models import ConvertReportModel
+from src.utils.schema import validate_by_root_schema, validate_by_example
+from src.utils.result_cache import make_cache_key, get_cached_result, put_cached_result
+from src.utils.profiling import timing_span
+
+# Output of several records, one record is always exported as one JSON object
+SAGE_OUTPUT_ARRAY = "array"
+SAGE_OUTPUT_JSON_LINES = "jsonl"
 
 
-def convert_sage_str_to_dict_with_correcting_types(sage_str: str, example_dict: dict | str) -> str:
+def convert_sage_str_to_dict_with_correcting_types(sage_str: str,
+                                                   example_dict: dict | str,
+                                                   indent: int | None = None,
+                                                   compact: bool = False,
+                                                   output_format: str = SAGE_OUTPUT_ARRAY,
+                                                   report: ConvertReportModel = None,
+                                                   use_cache: bool = True) -> str:
     """
 
-    :param sage_str:
+    :param sage_str: one or several records of "key = value" lines, see iter_sage_records
     :param example_dict:
+    :param indent: export indent, see export_dict
+    :param compact: export in one line, see export_dict
+    :param output_format: SAGE_OUTPUT_ARRAY - JSON array of records,
+        SAGE_OUTPUT_JSON_LINES - one compact JSON object per line
+    :param report: if passed, mismatches of records with schema of example
+        (root template if example is empty) are saved to it
+    :param use_cache: get result of the same inputs from result cache and save result to it.
+        Only used when "example_dict" is str
     :return:
     """
+    cache_key = None
+    if use_cache and isinstance(example_dict, str):
+        with timing_span(report, "cache"):
+            cache_key = make_cache_key("sage", sage_str, example_dict, indent, compact, output_format,
+                                       report is not None, get_root_json_stamp())
+            cached = get_cached_result(cache_key, report)
+        if cached is not None:
+            return cached
 
-    result = convert_sage_vars_string_to_dict(sage_str)
+    is_root_example = isinstance(example_dict, str) and example_dict.strip() == ""
+    # Coercion plan is taken by source of example, without walk of parsed example
+    if is_root_example:
+        example_key = ("root", get_root_json_stamp())
+    else:
+        example_key = example_dict if isinstance(example_dict, str) else None
+    with timing_span(report, "parse example"):
+        if is_root_example:
+            example_dict = get_root_json_as_dict()
+        elif isinstance(example_dict, str):
+            try:
+                example_dict = convert_string_to_dict(example_dict)
+            except ConvertStrToDictException as err:
+                raise err
+        plan = compile_coercion_plan(example_dict, cache_key=example_key)
 
-    if isinstance(example_dict, str) and example_dict.strip() == "":
-        example_dict = get_root_json_as_dict()
-    elif isinstance(example_dict, str):
+    with timing_span(report, "parse and coerce"):
         try:
-            example_dict = convert_string_to_dict(example_dict)
-        except ConvertStrToDictException as err:
-            raise err
+            records = [coerce_dict(record, plan) for record in iter_sage_records(sage_str)]
+        except ValueError as err:
+            raise err  # TODO: handle err
 
-    try:
-        result = fix_dict_values_type(dictionary=result, type_example=example_dict)
-    except ValueError as err:
-        raise err  # TODO: handle err
+    if report is not None:
+        with timing_span(report, "validate"):
+            data = records[0] if len(records) == 1 else records
+            report.mismatches = validate_by_root_schema(data) if is_root_example \
+                else validate_by_example(data, example_dict)
 
-    return correct_dict_to_export(result)
+    with timing_span(report, "export"):
+        if len(records) <= 1:
+            result = export_dict(records[0] if records else {}, indent=indent, compact=compact)
+        elif output_format == SAGE_OUTPUT_JSON_LINES:
+            result = "\n".join(export_dict(record, compact=True) for record in records)
+        else:
+            result = export_dict(records, indent=indent, compact=compact)
 
+    if cache_key is not None:
+        put_cached_result(cache_key, result, report)
+    return result
 
-def convert_sage_vars_string_to_dict(string: str):
-    strings = []
-    result = {}
-    string = string.split('\n')
 
-    for i in string:
-        strip_string = i.strip()
-        if len(strip_string):
-            strings.append(strip_string)
+def convert_sage_vars_string_to_dict(string: str) -> dict:
+    """All "key = value" lines of string in one dict, later keys replace earlier ones"""
+    result = {}
+    for record in iter_sage_records(string):
+        result.update(record)
+    return result
 
-    keys_and_values = []
-    for i in strings:
-        keys_and_values.append(i.split('='))
 
-    for i in keys_and_values:
-        result[i[0].strip()] = i[1].strip()
+def iter_sage_records(string: str) -> Iterator[dict]:
+    """
+    Parse Sage dump in one pass and yield dict for every record.
+    Line is split on the first "=" only, so values can contain "=".
+    Records are separated by empty lines or header lines (lines without "=")
+    """
+    record = {}
+    for line in io.StringIO(string):
+        key, delimiter, value = line.partition("=")
+        if not delimiter:
+            if record:
+                yield record
+                record = {}
+            continue
+        record[key.strip()] = value.strip()
 
-    return result
+    if record:
+        yield record
@@ -1,20 +1,156 @@
-import json
+import atexit
 import logging
+import os
+import tempfile
+import threading
+import time
 
 from pydantic import BaseModel
 
+from src.utils import codec
 from src.utils.models import WindowSettingsModel, FillerSettingsModel, MonoPresetModel, DoublePresetModel
 from src.utils.exceptions import PresetException
 
+STAT_CHECK_INTERVAL = 1.0  # Min seconds between checks of settings file for external changes
+WRITE_BEHIND_DELAY = 0.5  # Seconds to wait for next changes before write settings file
+
+
+class SettingsStore:
+    """
+    Single in-memory copy of one settings file, shared by all handlers of this file.
+    External changes of file are picked up by stat check (not often than STAT_CHECK_INTERVAL),
+    changes are written by background timer: all changes made in WRITE_BEHIND_DELAY are written once,
+    atomically (temp file + replace). Not written changes are flushed at exit
+    """
+    _stores: dict = {}
+    _stores_lock = threading.Lock()
+
+    def __init__(self, path: str, model: type[BaseModel]):
+        self.logger = logging.getLogger("app.settings_handler.settings_store")
+        self._path = path
+        self._model = model
+        self._lock = threading.RLock()
+        self._data: BaseModel | None = None
+        self._stat: tuple[int, int] | None = None
+        self._last_stat_check = 0.0
+        self._is_dirty = False
+        # Settings to write, taken by mark_dirty: UI changes models in place without lock
+        self._snapshot: dict | None = None
+        # Stat of file that failed to reload, warning is logged once per change. () - there was no fail
+        self._failed_stat: tuple[int, int] | tuple[()] | None = ()
+        self._timer: threading.Timer | None = None
+        self.reload()
+        atexit.register(self.flush)
+
+    @classmethod
+    def get_store(cls, path: str, model: type[BaseModel]) -> "SettingsStore":
+        """Return store for path, store is created on first call"""
+        key = os.path.abspath(path)
+        with cls._stores_lock:
+            store = cls._stores.get(key)
+            if store is None:
+                store = cls(path, model)
+                cls._stores[key] = store
+            elif store._model is not model:
+                raise TypeError(f"Settings file '{path}' is already opened as {store._model.__name__}")
+            return store
+
+    def get(self) -> BaseModel:
+        """
+        Current settings. File is re-read only if it was changed outside and there are no own changes.
+        If changed file can't be read (deleted, half-written), settings in memory are kept
+        """
+        with self._lock:
+            now = time.monotonic()
+            if not self._is_dirty and now - self._last_stat_check >= STAT_CHECK_INTERVAL:
+                self._last_stat_check = now
+                stat = self._file_stat()
+                if stat != self._stat:
+                    self.logger.debug(f"Settings file was changed outside: '{self._path}'")
+                    try:
+                        self.reload()
+                    except (OSError, ValueError) as err:  # ValidationError and JSONDecodeError are ValueError
+                        if stat != self._failed_stat:
+                            self._failed_stat = stat
+                            self.logger.warning(f"Settings file can't be read, settings in memory are kept: "
+                                                f"'{self._path}', {repr(err)}")
+            return self._data
+
+    def set(self, data: BaseModel) -> None:
+        """Replace settings object, call mark_dirty to write it"""
+        with self._lock:
+            self._data = data
+
+    def mark_dirty(self) -> None:
+        """Settings object was changed in place, schedule write"""
+        with self._lock:
+            self._snapshot = self._data.dict()
+            self._is_dirty = True
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(WRITE_BEHIND_DELAY, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def reload(self) -> None:
+        """Read file, own not written changes are lost"""
+        with self._lock:
+            self._data = self._model.parse_file(self._path)
+            self._stat = self._file_stat()
+            self._last_stat_check = time.monotonic()
+            self._is_dirty = False
+            self._snapshot = None
+            self._failed_stat = ()
+
+    def flush(self) -> None:
+        """Write changes to file now"""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._is_dirty:
+                return
+
+            text = codec.dumps(self._snapshot, indent=2)
+            directory = os.path.dirname(os.path.abspath(self._path))
+            fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".settings_", suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as file:
+                    file.write(text)
+                os.replace(tmp_path, self._path)
+            except OSError:
+                os.unlink(tmp_path)
+                raise
+            self._stat = self._file_stat()
+            self._is_dirty = False
+            self._snapshot = None
+            self.logger.debug(f"Succsess write settings file: '{self._path}'")
+
+    def _file_stat(self) -> tuple[int, int] | None:
+        try:
+            stat = os.stat(self._path)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
 
 class SettingsHandler:
-    _data: BaseModel
+    _model: type[BaseModel]
 
     def __init__(self, path: str):
         """
         :param path: path to JSON file
         """
         self._path = path
+        self._store: SettingsStore | None = None
+
+    @property
+    def _data(self) -> BaseModel:
+        return self._store.get()
+
+    @_data.setter
+    def _data(self, value: BaseModel) -> None:
+        self._store.set(value)
 
     def get_current_settings(self):
         answer = self._data.copy()
@@ -30,7 +166,7 @@ class SettingsHandler:
 
 
 class WindowSettingsHandler(SettingsHandler):
-    _data: WindowSettingsModel
+    _model = WindowSettingsModel
 
     def __init__(self, path: str):
         super(WindowSettingsHandler, self).__init__(path)
@@ -38,21 +174,18 @@ class WindowSettingsHandler(SettingsHandler):
         self._reed_json()
 
     def _reed_json(self):
+        """Open shared settings store, file is reed only by first handler of this file"""
         try:
-            self._data = WindowSettingsModel.parse_file(self._path)
+            self._store = SettingsStore.get_store(self._path, self._model)
             self.logger.debug(f"Succsess reed file from directory: '{self._path}' and save as {self._data}")
         except FileNotFoundError as err:
             self.logger.error(f"No such file or directory: {self._path}")
             raise err
 
     def _write_to_json(self):
-        try:
-            with open(self._path, "w", encoding="utf-8") as file:
-                json.dump(self._data.dict(), file, ensure_ascii=False, indent=2)
-            self.logger.debug(f"Succsess write file: {self._data} to directory: {self._path}")
-        except FileNotFoundError as err:
-            self.logger.error(f"No such file or directory: {self._path}")
-            raise err
+        """Schedule write of settings to file, see SettingsStore"""
+        self._store.mark_dirty()
+        self.logger.debug(f"Schedule write file: {self._data} to directory: {self._path}")
 
     def set_new_settings(self, **kwargs):
         new_settings = self._data.dict()
@@ -63,12 +196,11 @@ class WindowSettingsHandler(SettingsHandler):
         self._write_to_json()
 
     def get_current_settings(self) -> WindowSettingsModel:
-        self._reed_json()
         return self._data.copy()
 
 
 class FillerSettingsHandler(SettingsHandler):
-    _data: FillerSettingsModel
+    _model = FillerSettingsModel
 
     def __init__(self, path: str):
         super(FillerSettingsHandler, self).__init__(path)
@@ -76,21 +208,18 @@ class FillerSettingsHandler(SettingsHandler):
         self._reed_json()
 
     def _reed_json(self) -> None:
+        """Open shared settings store, file is reed only by first handler of this file"""
         try:
-            self._data = FillerSettingsModel.parse_file(self._path)
+            self._store = SettingsStore.get_store(self._path, self._model)
             self.logger.debug(f"Succsess reed file from directory '{self._path}' and save as {self._data} ")
         except FileNotFoundError as err:
             self.logger.error(f"No such file or directory: {self._path}")
             raise err
 
     def _write_to_json(self) -> None:
-        try:
-            with open(self._path, "w", encoding="utf-8") as file:
-                json.dump(self._data.dict(), file, ensure_ascii=False, indent=2)
-            self.logger.debug(f"Succsess write file: {self._data} to directory: {self._path}")
-        except FileNotFoundError as err:
-            self.logger.error(f"No such file or directory: {self._path}")
-            raise err
+        """Schedule write of settings to file, see SettingsStore"""
+        self._store.mark_dirty()
+        self.logger.debug(f"Schedule write file: {self._data} to directory: {self._path}")
 
     def set_new_data_settings(self,
                               is_mono_settings: bool = True,
@@ -184,7 +313,6 @@ class FillerSettingsHandler(SettingsHandler):
             return [prst.name for prst in self._data.double.presets]
 
     def get_current_settings(self) -> FillerSettingsModel:
-        self._reed_json()
         return self._data.copy()
 
     def get_preset_by_name(self, name, is_for_mono: bool = True) -> MonoPresetModel | DoublePresetModel:
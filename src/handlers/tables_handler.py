@@ -1,42 +1,162 @@
-from pandas import read_excel
+import os
+from zipfile import BadZipFile
 
-from src.utils.exceptions import ConvertStrToDictException, NoSupportFileExtension
-from src.utils.utils import correct_dict_to_export, fix_dict_values_type, convert_string_to_dict
+from src.utils.exceptions import ConvertStrToDictException, NoSupportFileExtension, TableReadException
+from src.utils.utils import fix_dict_values_type, convert_string_to_dict, get_root_json_as_dict, get_root_json_stamp
+from src.utils.json_export import export_dict
+from src.utils.models import ConvertReportModel
+from src.utils.schema import validate_by_root_schema, validate_by_example
+from src.utils.result_cache import make_cache_key, get_cached_result, put_cached_result
+from src.utils.profiling import timing_span
 
+AVAILABLE_EXTENSIONS = (".xlsx", ".xlsm", ".xlsb", ".odf", ".ods", ".odt")
+# Read by openpyxl in read-only mode, other extensions are read by pandas
+STREAMING_EXTENSIONS = (".xlsx", ".xlsm")
+NAME_COLUMN = "variable_name"
+VALUE_COLUMN = "variable_value"
+# Start of pandas error message when usecols are not in table
+USECOLS_NOT_FOUND_MESSAGE = "Usecols do not match columns"
 
-def make_json_from_table(table_path: str, example_dict: dict | str) -> str:
+
+def make_json_from_table(table_path: str,
+                         example_dict: dict | str,
+                         indent: int | None = None,
+                         compact: bool = False,
+                         report: ConvertReportModel = None,
+                         use_cache: bool = True) -> str:
     """
 
     :param table_path:
     :param example_dict:
+    :param indent: export indent, see export_dict
+    :param compact: export in one line, see export_dict
+    :param report: if passed, mismatches of result with schema of example
+        (root template if example is empty) are saved to it
+    :param use_cache: get result of the same inputs from result cache and save result to it, table file
+        is checked by modification time and size. Only used when "example_dict" is str
     :return: JSON in string datetype
     """
-    result_data = {}
-    available_extensions = (".xlsx", ".xlsm", ".xlsb", ".odf", ".ods", ".odt")
     table_path = table_path.strip()
 
-    if isinstance(example_dict, str):
+    cache_key = None
+    if use_cache and isinstance(example_dict, str):
         try:
-            example_dict = convert_string_to_dict(example_dict)
-        except ConvertStrToDictException as err:
-            raise err
+            stat = os.stat(table_path)
+        except OSError:
+            pass
+        else:
+            with timing_span(report, "cache"):
+                cache_key = make_cache_key("table", table_path, stat.st_mtime_ns, stat.st_size, example_dict,
+                                           indent, compact, report is not None, get_root_json_stamp())
+                cached = get_cached_result(cache_key, report)
+            if cached is not None:
+                return cached
+
+    is_root_example = isinstance(example_dict, str) and example_dict.strip() == ""
+    # Coercion plan is taken by source of example, without walk of parsed example
+    if is_root_example:
+        example_key = ("root", get_root_json_stamp())
+    else:
+        example_key = example_dict if isinstance(example_dict, str) else None
+    with timing_span(report, "parse example"):
+        if is_root_example:
+            example_dict = get_root_json_as_dict()
+        elif isinstance(example_dict, str):
+            try:
+                example_dict = convert_string_to_dict(example_dict)
+            except ConvertStrToDictException as err:
+                raise err
 
-    if 1 in [*map(lambda x: table_path.endswith(x), available_extensions)]:
+    if not table_path.endswith(AVAILABLE_EXTENSIONS):
+        raise NoSupportFileExtension(f"Available extensions: {AVAILABLE_EXTENSIONS}")
+
+    with timing_span(report, "read table"):
         try:
-            data = read_excel(open(table_path, "rb")).to_dict()
-        except FileNotFoundError as err:
+            result_data = read_table_variables(table_path)
+        except FileNotFoundError:
             raise FileNotFoundError(table_path)
-    else:
-        raise NoSupportFileExtension(f"Available extensions: {available_extensions}")
 
+    with timing_span(report, "coerce"):
+        result_data = fix_dict_values_type(result_data, example_dict, cache_key=example_key)
+    if report is not None:
+        with timing_span(report, "validate"):
+            report.mismatches = validate_by_root_schema(result_data) if is_root_example \
+                else validate_by_example(result_data, example_dict)
+
+    with timing_span(report, "export"):
+        result: str = export_dict(result_data, indent=indent, compact=compact)
+    if cache_key is not None:
+        put_cached_result(cache_key, result, report)
+    return result
+
+
+def read_table_variables(table_path: str) -> dict:
+    """
+    Read "variable_name" -> "variable_value" pairs from first sheet of table.
+    Only these two columns are read. Rows without name are skipped, empty values are None.
+    Raise KeyError if table has no one of columns, TableReadException if file is not a valid table
+    """
+    if table_path.endswith(STREAMING_EXTENSIONS):
+        return _read_table_variables_openpyxl(table_path)
+    return _read_table_variables_pandas(table_path)
+
+
+def _read_table_variables_openpyxl(table_path: str) -> dict:
+    """Stream rows of workbook in read-only mode, no DataFrame is built"""
+    from openpyxl import load_workbook  # Loaded on first table convert
+    from openpyxl.utils.exceptions import InvalidFileException
+
+    try:
+        workbook = load_workbook(table_path, read_only=True, data_only=True)
+    except (BadZipFile, InvalidFileException, KeyError, ValueError) as err:
+        # KeyError is raised for archive without workbook parts, it is not about columns
+        raise TableReadException(f"{type(err).__name__}: {err}")
     try:
-        variable_names: dict = data['variable_name']
-        variable_values: dict = data['variable_value']
-    except KeyError as err:
-        raise err
+        sheet = workbook.worksheets[0]
+        header = next(sheet.iter_rows(max_row=1, values_only=True), ())
+        name_index = _get_column_index(header, NAME_COLUMN)
+        value_index = _get_column_index(header, VALUE_COLUMN)
+
+        first_column = min(name_index, value_index)
+        name_index -= first_column
+        value_index -= first_column
+        rows = sheet.iter_rows(min_row=2,
+                               min_col=first_column + 1,
+                               max_col=max(name_index, value_index) + first_column + 1,
+                               values_only=True)
+
+        result = {}
+        for row in rows:
+            name = row[name_index]
+            if name is not None:
+                result[name] = row[value_index]
+        return result
+    finally:
+        workbook.close()
+
 
-    for k in variable_names:
-        result_data[variable_names[k]] = variable_values[k]
+def _read_table_variables_pandas(table_path: str) -> dict:
+    from pandas import read_excel, isna  # pandas is heavy, it is loaded on first table convert
 
-    result_data = fix_dict_values_type(result_data, example_dict)
-    return correct_dict_to_export(result_data)
+    with open(table_path, "rb") as file:
+        try:
+            data = read_excel(file, usecols=[NAME_COLUMN, VALUE_COLUMN])
+        except ValueError as err:
+            if str(err).startswith(USECOLS_NOT_FOUND_MESSAGE):
+                raise KeyError(str(err))
+            raise TableReadException(f"{type(err).__name__}: {err}")
+        except BadZipFile as err:
+            raise TableReadException(f"{type(err).__name__}: {err}")
+
+    return {
+        name: None if isna(value) else value
+        for name, value in zip(data[NAME_COLUMN].tolist(), data[VALUE_COLUMN].tolist())
+        if not isna(name)
+    }
+
+
+def _get_column_index(header: tuple, column: str) -> int:
+    try:
+        return header.index(column)
+    except ValueError:
+        raise KeyError(column)
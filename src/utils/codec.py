@@ -0,0 +1,98 @@
+"""
+JSON codec for all parse and dump calls of app. The fastest available backend is chosen at import:
+orjson if it is installed, else stdlib json (C scanner and encoder).
+
+Errors don't depend on backend: when orjson can't parse input, it is parsed again by stdlib json,
+so invalid input raises stdlib json.JSONDecodeError with its message and position (used by UI to show
+error location), and input that only stdlib accepts (NaN, integers over 64 bit) is parsed as before.
+Same for dump: values orjson can't serialize or writes differently (NaN, Infinity) are dumped by stdlib json.
+"""
+import json
+import math
+from typing import IO
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+JSONDecodeError = json.JSONDecodeError
+
+BACKEND = "orjson" if orjson is not None else "json"
+
+# Stdlib encoders are built once, encode() of C encoder writes whole document in one pass.
+# Input dicts come from json parsing, so circular check is not needed.
+_lines_encoder = json.JSONEncoder(ensure_ascii=False, check_circular=False, separators=(",\n ", ": "))
+_compact_encoder = json.JSONEncoder(ensure_ascii=False, check_circular=False, separators=(",", ":"))
+
+
+def loads(data: str | bytes | bytearray | memoryview) -> object:
+    """
+    Parse JSON document. Bytes must be UTF-8, they are parsed without decoding to str by orjson
+
+    :raise JSONDecodeError: input is not valid JSON
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    return json.loads(data)
+
+
+def load(file: IO) -> object:
+    """Parse JSON document from file opened in text or binary mode"""
+    return loads(file.read())
+
+
+def dumps(data: object, indent: int | None = None, compact: bool = False) -> str:
+    """
+    Make JSON string, non-ASCII chars are not escaped
+
+    :param indent: None - every item on new line, without indent (always stdlib);
+        int - pretty print with indent
+    :param compact: True - one line without spaces, "indent" is ignored
+    """
+    if orjson is not None and (compact or indent == 2):
+        dumped = _dumps_orjson(data, compact=compact)
+        if dumped is not None:
+            return dumped.decode("utf-8")
+    return _dumps_stdlib(data, indent=indent, compact=compact)
+
+
+def _dumps_orjson(data: object, compact: bool) -> bytes | None:
+    """:return: None if orjson can't serialize data the same way as stdlib json"""
+    try:
+        dumped = orjson.dumps(data) if compact else orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    except orjson.JSONEncodeError:
+        return None
+    # orjson writes NaN and Infinity as null, stdlib json keeps them. They are searched in data tree only
+    # if there is null in result, dump of orjson and search are still faster than stdlib encoder
+    if b"null" in dumped and _has_non_finite_float(data):
+        return None
+    return dumped
+
+
+def _has_non_finite_float(data: object) -> bool:
+    stack = [data]
+    while stack:
+        value = stack.pop()
+        value_type = type(value)
+        if value_type is float:
+            if value - value != 0:  # nan or inf
+                return True
+        elif value_type is dict or isinstance(value, dict):
+            stack.extend(value.values())
+        elif value_type is list or isinstance(value, (list, tuple)):
+            stack.extend(value)
+    return False
+
+
+def _dumps_stdlib(data: object, indent: int | None, compact: bool) -> str:
+    if compact:
+        return _compact_encoder.encode(data)
+    if indent is None:
+        return _lines_encoder.encode(data)
+    return json.dumps(data, ensure_ascii=False, check_circular=False, indent=indent)
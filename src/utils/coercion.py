@@ -0,0 +1,160 @@
+import re
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Callable, Hashable, Mapping
+
+from src.utils import codec
+
+# Compiled plan: key of example -> function that converts raw value (str from Sage, cell value from table)
+CoercionPlan = Mapping[str, Callable[[object], object]]
+
+TRUE_STRINGS = frozenset(("true", "1", "yes", "y", "да"))
+FALSE_STRINGS = frozenset(("false", "0", "no", "n", "нет", ""))
+INT_PATTERN = re.compile(r"[+-]?\d+")
+# Plans cached by cheap key of example, see compile_coercion_plan
+PLANS_BY_KEY_SIZE = 32
+
+_plans_by_key: OrderedDict[Hashable, CoercionPlan] = OrderedDict()
+_plans_by_key_lock = threading.Lock()
+
+
+def coerce_dict(dictionary: dict, plan: CoercionPlan) -> dict:
+    """
+    Convert values of dictionary by plan. Result has only keys that are in plan,
+    None and "null" values become None for any type
+    """
+    result = {}
+    for key, value in dictionary.items():
+        coerce = plan.get(key)
+        if coerce is None:
+            continue
+        result[key] = None if value is None or value == "null" else coerce(value)
+    return result
+
+
+def compile_coercion_plan(type_example: dict, cache_key: Hashable = None) -> CoercionPlan:
+    """
+    Compile example dict to coercion plan. Plans are cached by type signature of example,
+    so same example (or example with same keys and value types) is compiled once
+
+    :param cache_key: cheap key of example, like its source string or stamp of root template file.
+        Plan is taken by it without type signature, that walks whole example
+    """
+    if cache_key is None:
+        return _compile_plan(type_signature(type_example))
+
+    with _plans_by_key_lock:
+        plan = _plans_by_key.get(cache_key)
+        if plan is not None:
+            _plans_by_key.move_to_end(cache_key)
+            return plan
+    plan = _compile_plan(type_signature(type_example))
+    with _plans_by_key_lock:
+        _plans_by_key[cache_key] = plan
+        if len(_plans_by_key) > PLANS_BY_KEY_SIZE:
+            _plans_by_key.popitem(last=False)
+    return plan
+
+
+def type_signature(example: object) -> tuple:
+    """
+    Hashable description of example value types:
+    dict -> ("dict", ((key, signature), ...)), list -> ("list", signature of first item), other -> (type name,)
+    """
+    if isinstance(example, dict):
+        return "dict", tuple((key, type_signature(value)) for key, value in example.items())
+    if isinstance(example, list):
+        return "list", type_signature(example[0]) if example else ("str",)
+    return type(example).__name__,
+
+
+@lru_cache(maxsize=32)
+def _compile_plan(signature: tuple) -> CoercionPlan:
+    _, items = signature
+    return MappingProxyType({key: _compile_value(value_signature) for key, value_signature in items})
+
+
+def _compile_value(signature: tuple) -> Callable[[object], object]:
+    kind = signature[0]
+    if kind == "bool":
+        return to_bool
+    if kind in ("int", "float"):
+        return to_number
+    if kind == "str":
+        return str
+    if kind == "dict":
+        return _make_dict_coercer(signature)
+    if kind == "list":
+        return _make_list_coercer(_compile_value(signature[1]))
+    # Type of value can't be taken from example (null in example), value is kept as is
+    return _keep
+
+
+def to_bool(value: object) -> bool | str:
+    """Unknown string ("N/A", "-") is kept as is, like not parsed object and array values"""
+    if isinstance(value, str):
+        lowered = value.strip().lower()
+        if lowered in TRUE_STRINGS:
+            return True
+        if lowered in FALSE_STRINGS:
+            return False
+        return value
+    return bool(value)
+
+
+def to_number(value: object) -> int | float:
+    if isinstance(value, str):
+        if value.isdecimal():
+            return int(value)
+        value = value.strip()
+        return int(value) if INT_PATTERN.fullmatch(value) else float(value)
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, int | float):
+        return value
+    raise ValueError(f"Can't convert value to number: '{value}'")
+
+
+def _keep(value: object) -> object:
+    return value
+
+
+def _make_dict_coercer(signature: tuple) -> Callable[[object], object]:
+    # Empty example object has no types, nested value is kept whole
+    plan = _compile_plan(signature) if signature[1] else None
+
+    def coerce(value: object) -> object:
+        if isinstance(value, str):
+            try:
+                value = codec.loads(value)
+            except codec.JSONDecodeError:
+                return value
+        if plan is not None and isinstance(value, dict):
+            return coerce_dict(value, plan)
+        return value
+
+    return coerce
+
+
+def _make_list_coercer(coerce_item: Callable[[object], object]) -> Callable[[object], object]:
+
+    def coerce(value: object) -> object:
+        if isinstance(value, str):
+            stripped = value.strip()
+            if stripped.startswith("["):
+                try:
+                    value = codec.loads(stripped)
+                except codec.JSONDecodeError:
+                    value = stripped.split(",")
+            elif stripped == "":
+                return []
+            else:
+                value = stripped.split(",")
+        if not isinstance(value, list):
+            value = [value]
+        return [None if item is None else coerce_item(item.strip() if isinstance(item, str) else item)
+                for item in value]
+
+    return coerce
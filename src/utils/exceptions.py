@@ -11,4 +11,16 @@ class UnexpectedErrorMessage(ValueError):
 
 
 class NoSupportFileExtension(ValueError):
-    ...
\ No newline at end of file
+    ...
+
+
+class TableReadException(ValueError):
+    ...
+
+
+class JsonRootTypeException(ValueError):
+    """Root of filler input is not an object, message ends with "-T" (to_fill) or "-F" (from_fill)"""
+
+
+class TemplateConvertException(ConvertStrToDictException):
+    ...
@@ -0,0 +1,51 @@
+import mmap
+import os
+
+# Head of opened file shown in input textbox
+FILE_PREVIEW_BYTES = 64 * 1024
+
+
+class InputFile:
+    """
+    Input opened from file instead of typed text. File is read by handler job on worker thread,
+    UI keeps only path and preview
+    """
+
+    __slots__ = ("path", "size")
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.size = os.path.getsize(path)
+
+    def read(self) -> str:
+        return read_text_mmap(self.path)
+
+    def preview(self, max_bytes: int = FILE_PREVIEW_BYTES) -> str:
+        """Head of file, multibyte char cut by max_bytes is dropped"""
+        with open(self.path, "rb") as file:
+            return file.read(max_bytes).decode("utf-8-sig", errors="ignore")
+
+    def __repr__(self) -> str:
+        return f"InputFile({self.path!r}, {self.size} bytes)"
+
+
+def read_text_mmap(path: str) -> str:
+    """
+    Read UTF-8 text file through mmap. Text is decoded right from mapped pages: file is copied once,
+    to result str, without read buffer and intermediate bytes
+    """
+    with open(path, "rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return ""
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            return str(buffer, "utf-8-sig")
+
+
+def call_with_file_inputs(func: callable, *args, **kwargs) -> object:
+    """
+    Call func with InputFile arguments replaced by their text.
+    Submit it to JobRunner instead of func, so files are read on worker thread
+    """
+    args = [arg.read() if isinstance(arg, InputFile) else arg for arg in args]
+    kwargs = {key: value.read() if isinstance(value, InputFile) else value for key, value in kwargs.items()}
+    return func(*args, **kwargs)
@@ -0,0 +1,16 @@
+from src.utils import codec
+
+
+def export_dict(data: dict | list, indent: int | None = None, compact: bool = False) -> str:
+    """
+    Make valid JSON string from dict, values are escaped correctly unlike old str() and replace export.
+    Time and memory of default layout are about the same as of old export, it is not faster
+
+    :param data: dict (or list) to export
+    :param indent: None - every item on new line, without indent (default, layout of old export);
+        int - pretty print with indent, works on python level and slower on big dicts
+        (indent 2 is written by fast backend of codec if it is installed)
+    :param compact: True - one line without spaces, "indent" is ignored
+    :return: JSON in str format
+    """
+    return codec.dumps(data, indent=indent, compact=compact)
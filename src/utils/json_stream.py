@@ -0,0 +1,67 @@
+import json
+import re
+from json.decoder import JSONDecodeError, scanstring
+from typing import Iterator, Container
+
+# From this size (in chars) JSON strings are parsed member by member instead of one json.loads
+STREAMING_THRESHOLD = 16 * 1024 * 1024
+
+_decoder = json.JSONDecoder()
+_whitespace = re.compile(r"[ \t\n\r]*")
+
+
+def is_streaming_needed(string: str) -> bool:
+    """Check is string big enough to parse it in streaming mode and is it JSON object"""
+    if len(string) <= STREAMING_THRESHOLD:
+        return False
+    idx = _whitespace.match(string).end()
+    return string[idx:idx + 1] == "{"
+
+
+def iter_object_items(string: str) -> Iterator[tuple[str, object]]:
+    """
+    Yield (key, value) pairs of top-level JSON object one by one.
+    Only one member value is alive at a time, so dropped members don't hold memory.
+    Raise json.JSONDecodeError with position in the whole string like json.loads
+    """
+    idx = _whitespace.match(string).end()
+    if string[idx:idx + 1] != "{":
+        raise JSONDecodeError("Expecting '{'", string, idx)
+    idx = _whitespace.match(string, idx + 1).end()
+
+    if string[idx:idx + 1] == "}":
+        _check_end(string, idx + 1)
+        return
+
+    while True:
+        if string[idx:idx + 1] != '"':
+            raise JSONDecodeError("Expecting property name enclosed in double quotes", string, idx)
+        key, idx = scanstring(string, idx + 1)
+
+        idx = _whitespace.match(string, idx).end()
+        if string[idx:idx + 1] != ":":
+            raise JSONDecodeError("Expecting ':' delimiter", string, idx)
+        idx = _whitespace.match(string, idx + 1).end()
+
+        value, idx = _decoder.raw_decode(string, idx)
+        yield key, value
+
+        idx = _whitespace.match(string, idx).end()
+        delimiter = string[idx:idx + 1]
+        if delimiter == "}":
+            _check_end(string, idx + 1)
+            return
+        if delimiter != ",":
+            raise JSONDecodeError("Expecting ',' delimiter", string, idx)
+        idx = _whitespace.match(string, idx + 1).end()
+
+
+def load_selected_keys(string: str, keys: Container[str]) -> dict:
+    """Parse top-level JSON object and keep only members with key in keys"""
+    return {key: value for key, value in iter_object_items(string) if key in keys}
+
+
+def _check_end(string: str, idx: int) -> None:
+    idx = _whitespace.match(string, idx).end()
+    if idx != len(string):
+        raise JSONDecodeError("Extra data", string, idx)
@@ -1,11 +1,60 @@
+import atexit
 import logging
+import queue
+import zlib
+from itertools import islice
 from logging import handlers
 
 LOGGER_FORMAT = '%(asctime)s - %(name)s:%(levelname)s - %(message)s'
 LOG_FILE_PATH = "data/logs/logs.log"
+PAYLOAD_PREVIEW_CHARS = 80
+PAYLOAD_PREVIEW_KEYS = 5
+# Hash is taken from head and tail of string only, so its cost doesn't depend on document size
+PAYLOAD_HASH_CHARS = 64 * 1024
+
+_listener: handlers.QueueListener | None = None
+
+
+class PayloadSummary:
+    """
+    Short description of JSON document (str or parsed dict/list) for logs: size, key count, hash, preview.
+    Pass it as logger argument, not in f-string: it is formatted only if the record is emitted
+
+    logger.debug("Start filler, to_fill: %s", PayloadSummary(to_fill))
+    """
+
+    __slots__ = ("payload",)
+
+    def __init__(self, payload: str | dict | list) -> None:
+        self.payload = payload
+
+    def __str__(self) -> str:
+        payload = self.payload
+        if isinstance(payload, str):
+            preview = payload[:PAYLOAD_PREVIEW_CHARS].replace("\n", " ")
+            sample = payload if len(payload) <= 2 * PAYLOAD_HASH_CHARS \
+                else payload[:PAYLOAD_HASH_CHARS] + payload[-PAYLOAD_HASH_CHARS:]
+            crc = zlib.crc32(sample.encode("utf-8", errors="replace"))
+            more = "..." if len(payload) > PAYLOAD_PREVIEW_CHARS else ""
+            return f"<str {len(payload)} chars, crc32 {crc:08x}: '{preview}{more}'>"
+        if isinstance(payload, dict):
+            keys = list(islice(payload, PAYLOAD_PREVIEW_KEYS))
+            more = ", ..." if len(payload) > PAYLOAD_PREVIEW_KEYS else ""
+            return f"<dict {len(payload)} keys: {', '.join(map(str, keys))}{more}>"
+        if isinstance(payload, list):
+            return f"<list {len(payload)} items>"
+        # Not JSON payload, like file_input.InputFile
+        return f"<{repr(payload)[:PAYLOAD_PREVIEW_CHARS]}>"
+
+    __repr__ = __str__
 
 
 def init_logger(name: str, is_logger_level_debug: bool = True) -> logging.Logger:
+    """
+    Records are put to queue on calling thread, console and file handlers write them on listener thread,
+    so slow disk doesn't block UI main loop
+    """
+    global _listener
     logger = logging.getLogger(name)
     if is_logger_level_debug:
         logger.setLevel(logging.DEBUG)
@@ -21,8 +70,22 @@ def init_logger(name: str, is_logger_level_debug: bool = True) -> logging.Logger
     fh.setFormatter(logging.Formatter(LOGGER_FORMAT))
     fh.setLevel(logging.INFO)
 
-    logger.addHandler(sh)
-    logger.addHandler(fh)
+    if _listener is not None:
+        _listener.stop()
+    log_queue = queue.SimpleQueue()
+    _listener = handlers.QueueListener(log_queue, sh, fh, respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_logger)
+
+    logger.addHandler(handlers.QueueHandler(log_queue))
 
     logger.info("Logger was init")
     return logger
+
+
+def stop_logger() -> None:
+    """Write all queued records and stop listener thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
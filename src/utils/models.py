@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import date
 
 
@@ -24,8 +24,18 @@ class MonoSettingsModel(BaseModel):
     dates: MonoDatesModel
 
 
+class DoubleAccountPresetModel(BaseModel):
+    account_number: str = ""
+    contract_number: str = ""
+    product_type: str = ""
+
+
 class DoublePresetModel(BaseModel):
     name: str
+    contact_id: str = ""
+    communication_type: str = ""
+    primary: DoubleAccountPresetModel = DoubleAccountPresetModel()
+    secondary: DoubleAccountPresetModel = DoubleAccountPresetModel()
 
 
 class DoubleSettingsModel(BaseModel):
@@ -44,11 +54,16 @@ class Themes(BaseModel):
     color_theme: str
 
 
+# Default memory budget of result cache, MB
+RESULT_CACHE_MAX_MB = 64
+
+
 class WindowSettingsModel(BaseModel):
     title: str
     window_geometry: str
     minsize_geometry: list[int, int]
     themes: Themes
+    result_cache_max_mb: int = Field(RESULT_CACHE_MAX_MB, ge=0)  # 0 - results are not cached
 
 
 # ---------- Dates model ---------- #
@@ -69,10 +84,66 @@ class MonoSettingsFromUIModel(BaseModel):
     product_type: str
     communication_type: str
     is_need_convert_dt: bool
+    fill_match_by: str = "path"
 
 
-class DoubleSettingsFromUIModel(BaseModel):
+class DoubleAccountSettingsFromUIModel(BaseModel):
+    """Settings of one account of double product"""
     dates: DatesModel
+    account_number: str
+    contract_number: str
+    product_type: str
+
+
+class DoubleSettingsFromUIModel(BaseModel):
+    """Settings for filler from double UI"""
+    primary: DoubleAccountSettingsFromUIModel
+    secondary: DoubleAccountSettingsFromUIModel
+    contact_id: str
+    communication_type: str
+    is_need_convert_dt: bool
+    fill_match_by: str = "path"
+
+
+# ---------- Batch ---------- #
+class BatchFileErrorModel(BaseModel):
+    path: str
+    error: str
+
+
+class BatchSummaryModel(BaseModel):
+    files: int = 0
+    input_bytes: int = 0
+    output_bytes: int = 0
+    seconds: float = 0.0
+    errors: list[BatchFileErrorModel] = []
+
+
+# ---------- Convert report ---------- #
+class SchemaMismatchModel(BaseModel):
+    path: str
+    expected: str
+    actual: str
+
+
+class TimingSpanModel(BaseModel):
+    stage: str
+    seconds: float
+
+
+class ConvertReportModel(BaseModel):
+    """Filled by handlers during convert when passed to them"""
+    mismatches: list[SchemaMismatchModel] = []
+    from_cache: bool = False
+    spans: list[TimingSpanModel] = []
+
+
+class ResultCacheStatsModel(BaseModel):
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    entries: int = 0
+    size_bytes: int = 0
 
 
 # ---------- Error ---------- #
@@ -0,0 +1,94 @@
+import cProfile
+import logging
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime as dt
+from typing import Iterator
+
+from src.utils.models import ConvertReportModel, TimingSpanModel
+
+logger = logging.getLogger("app.profiling")
+
+PROFILES_DIR = "data/profiles"
+# Lines with the biggest allocations written to memory snapshot file
+TRACEMALLOC_TOP_LINES = 30
+
+_profile_next_run = threading.Event()
+
+
+@contextmanager
+def timing_span(report: ConvertReportModel | None, stage: str) -> Iterator[None]:
+    """
+    Measure stage of convert and add it to report spans. Without report does nothing
+
+    with timing_span(report, "export"):
+        result = export_dict(result)
+    """
+    if report is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        report.spans.append(TimingSpanModel(stage=stage, seconds=time.perf_counter() - started))
+
+
+def format_spans(spans: list[TimingSpanModel]) -> str:
+    """ "parse 0.120 с | fill 0.031 с | ..." """
+    return " | ".join(f"{span.stage} {span.seconds:.3f} с" for span in spans)
+
+
+def set_profile_next_run(is_enabled: bool) -> None:
+    """Next job of JobRunner is run by profile_call"""
+    if is_enabled:
+        _profile_next_run.set()
+    else:
+        _profile_next_run.clear()
+
+
+def is_profile_next_run() -> bool:
+    return _profile_next_run.is_set()
+
+
+def take_profile_request() -> bool:
+    """:return: True if next run has to be profiled, request is reset"""
+    if not _profile_next_run.is_set():
+        return False
+    _profile_next_run.clear()
+    return True
+
+
+def profile_call(name: str, func: callable, *args, **kwargs) -> object:
+    """
+    Run func(*args, **kwargs) under cProfile and tracemalloc. Profile is saved to
+    PROFILES_DIR/<name>_<time>.prof (open with pstats or snakeviz), top allocations - to <name>_<time>_memory.txt.
+    Only calling thread is profiled
+    """
+    os.makedirs(PROFILES_DIR, exist_ok=True)
+    base_path = os.path.join(PROFILES_DIR, f"{name}_{dt.now().strftime('%Y%m%d_%H%M%S')}")
+
+    is_tracing = tracemalloc.is_tracing()
+    if not is_tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        return func(*args, **kwargs)
+    finally:
+        profiler.disable()
+        snapshot = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+        if not is_tracing:
+            tracemalloc.stop()
+
+        profiler.dump_stats(f"{base_path}.prof")
+        with open(f"{base_path}_memory.txt", "w", encoding="utf-8") as file:
+            file.write(f"Peak traced memory: {peak / 1024 / 1024:.1f} MB\n\n")
+            for stat in snapshot.statistics("lineno")[:TRACEMALLOC_TOP_LINES]:
+                file.write(f"{stat}\n")
+        logger.info(f"Profile of '{name}' run saved: {base_path}.prof, {base_path}_memory.txt")
@@ -0,0 +1,120 @@
+import logging
+import sys
+import threading
+from collections import OrderedDict
+
+from src.utils.models import ResultCacheStatsModel, ConvertReportModel, RESULT_CACHE_MAX_MB
+
+logger = logging.getLogger("app.result_cache")
+
+# Memory budget of all cached results, can be changed by "result_cache_max_mb" of window settings
+RESULT_CACHE_MAX_BYTES = RESULT_CACHE_MAX_MB * 1024 * 1024
+# Approximate size of one cached schema mismatch
+MISMATCH_SIZE_BYTES = 512
+
+
+def make_cache_key(*parts) -> tuple:
+    """
+    Key of inputs for ResultCache. Input strings are kept in key: dict lookup uses built-in str hash
+    (computed in C without encoding) and hit is confirmed by full comparison of inputs, so different inputs
+    with equal hash never share result. Size of kept strings is counted in cache budget, see put_cached_result
+    """
+    return parts
+
+
+def get_key_size(key: tuple) -> int:
+    """Bytes of input strings kept in key"""
+    return sum(sys.getsizeof(part) for part in key if isinstance(part, str))
+
+
+class ResultCache:
+    """
+    Thread-safe LRU cache of convert results. Least recently used entries are evicted
+    when size of cached values is more than max_bytes
+    """
+
+    def __init__(self, max_bytes: int = RESULT_CACHE_MAX_BYTES) -> None:
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[tuple, tuple[object, int]] = OrderedDict()
+        self._size = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, key: tuple) -> object | None:
+        """:return: cached value or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+        logger.debug(f"Result cache hit: {self.stats()}")
+        return entry[0]
+
+    def put(self, key: tuple, value: object, size: int) -> None:
+        """:param size: size of value in bytes, value bigger than max_bytes is not cached"""
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._size -= old[1]
+            self._entries[key] = (value, size)
+            self._size += size
+            self._evict()
+
+    def set_max_bytes(self, max_bytes: int) -> None:
+        with self._lock:
+            self.max_bytes = max_bytes
+            self._evict()
+        logger.debug(f"Result cache max bytes: {max_bytes}")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self) -> ResultCacheStatsModel:
+        with self._lock:
+            return ResultCacheStatsModel(hits=self._hits, misses=self._misses, evictions=self._evictions,
+                                         entries=len(self._entries), size_bytes=self._size)
+
+    def _evict(self) -> None:
+        while self._size > self.max_bytes and self._entries:
+            _, (_, size) = self._entries.popitem(last=False)
+            self._size -= size
+            self._evictions += 1
+
+
+# Shared by all handlers
+result_cache = ResultCache()
+
+
+def set_result_cache_max_mb(max_mb: int) -> None:
+    """Apply "result_cache_max_mb" of window settings to result_cache"""
+    result_cache.set_max_bytes(max_mb * 1024 * 1024)
+
+
+def get_cached_result(key: tuple, report: ConvertReportModel = None) -> str | None:
+    """
+    Convert result from result_cache, report is filled by cached mismatches
+
+    :return: cached JSON string or None
+    """
+    cached = result_cache.get(key)
+    if cached is None:
+        return None
+    result, mismatches = cached
+    if report is not None:
+        report.mismatches = mismatches
+        report.from_cache = True
+    return result
+
+
+def put_cached_result(key: tuple, result: str, report: ConvertReportModel = None) -> None:
+    mismatches = report.mismatches if report is not None else []
+    size = sys.getsizeof(result) + len(mismatches) * MISMATCH_SIZE_BYTES + get_key_size(key)
+    result_cache.put(key, (result, mismatches), size=size)
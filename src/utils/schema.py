@@ -0,0 +1,184 @@
+import logging
+import os
+import re
+import threading
+from typing import Iterator, Mapping
+
+from src.utils import codec
+from src.utils.models import SchemaMismatchModel
+from src.utils.utils import get_root_json_view, ROOT_JSON_PATH, DOUBLE_ROOT_JSON_PATH
+
+logger = logging.getLogger("app.schema")
+
+# Formats of string values, used by filler for cheap checks before strptime too
+DATE_PATTERN = re.compile(r"\d{4}-\d{1,2}-\d{1,2}")
+DATE_TIME_PATTERN = re.compile(r"\d{4}-\d{1,2}-\d{1,2}T\d{1,2}:\d{1,2}:\d{1,2}\.\d{1,6}")
+
+# Expected kinds of values
+KIND_ANY = "any"  # null in template, any value is valid
+KIND_BOOL = "bool"
+KIND_NUMBER = "number"
+KIND_STR = "str"
+KIND_DATE = "date"
+KIND_DATE_TIME = "date-time"  # date is valid too, filler can convert DateTime to Date
+KIND_OBJECT = "object"
+KIND_ARRAY = "array"
+KIND_MISSING = "missing"
+
+# Compiled schema of value: (kind, schema of object members or of array item or None)
+ValueSchema = tuple[str, object]
+# Compiled schema of object: key -> ValueSchema. Keys are required only if validation checks missing keys
+ObjectSchema = Mapping[str, ValueSchema]
+
+# path -> (mtime_ns, size, schema), same invalidation as root templates cache
+_schemas_cache: dict[str, tuple[int, int, ObjectSchema]] = {}
+_schemas_cache_lock = threading.Lock()
+
+
+def infer_schema(template: Mapping) -> ObjectSchema:
+    """Derive schema from template object: types and formats of values, keys on every level"""
+    return {key: _infer_value_schema(value) for key, value in template.items()}
+
+
+def get_root_schema(is_for_mono: bool = True) -> ObjectSchema:
+    """Schema of root template, inferred once and cached while template file is not changed"""
+    path = ROOT_JSON_PATH if is_for_mono else DOUBLE_ROOT_JSON_PATH
+    stat = os.stat(path)
+    with _schemas_cache_lock:
+        cached = _schemas_cache.get(path)
+        if cached is not None and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            return cached[2]
+        schema = infer_schema(get_root_json_view(is_for_mono=is_for_mono))
+        _schemas_cache[path] = (stat.st_mtime_ns, stat.st_size, schema)
+        return schema
+
+
+def validate(data: Mapping | list,
+             schema: ObjectSchema,
+             path: str = "",
+             check_missing: bool = False) -> list[SchemaMismatchModel]:
+    """
+    Check data by schema in one walk and return all mismatches.
+    Keys that are not in schema are not checked, None is valid for any kind
+
+    :param check_missing: report keys of schema that are not in data. Results of Sage, tables and
+        arbitrary templates are subsets of template by design, for them only present keys are checked
+    """
+    return [SchemaMismatchModel(path=mismatch_path, expected=expected, actual=actual)
+            for mismatch_path, expected, actual in _iter_object_mismatches(data, schema, path, check_missing)]
+
+
+def validate_by_root_schema(data: Mapping | list,
+                            is_for_mono: bool = True,
+                            check_missing: bool = False) -> list[SchemaMismatchModel]:
+    """
+    Validate result by schema of root template. List of records is validated record by record.
+    If template can't be read result is not checked
+    """
+    try:
+        schema = get_root_schema(is_for_mono=is_for_mono)
+    except (OSError, codec.JSONDecodeError) as err:
+        logger.warning("Result is not validated, can't read root template: %r", err)
+        return []
+    return _validate_records(data, schema, check_missing)
+
+
+def validate_by_example(data: Mapping | list,
+                        example: Mapping,
+                        check_missing: bool = False) -> list[SchemaMismatchModel]:
+    """Validate result by schema of example supplied by user, like validate_by_root_schema"""
+    return _validate_records(data, infer_schema(example), check_missing)
+
+
+def _validate_records(data: Mapping | list, schema: ObjectSchema, check_missing: bool) -> list[SchemaMismatchModel]:
+    if isinstance(data, list):
+        mismatches = []
+        for i, record in enumerate(data):
+            mismatches.extend(validate(record, schema, path=f"[{i}]", check_missing=check_missing))
+        return mismatches
+    return validate(data, schema, check_missing=check_missing)
+
+
+def _infer_value_schema(value: object) -> ValueSchema:
+    if value is None:
+        return KIND_ANY, None
+    if isinstance(value, bool):
+        return KIND_BOOL, None
+    if isinstance(value, int | float):
+        return KIND_NUMBER, None
+    if isinstance(value, str):
+        if DATE_TIME_PATTERN.fullmatch(value):
+            return KIND_DATE_TIME, None
+        if DATE_PATTERN.fullmatch(value):
+            return KIND_DATE, None
+        return KIND_STR, None
+    if isinstance(value, dict):
+        return KIND_OBJECT, infer_schema(value)
+    if isinstance(value, list):
+        return KIND_ARRAY, _infer_value_schema(value[0]) if value else (KIND_ANY, None)
+    return KIND_ANY, None
+
+
+def _iter_object_mismatches(data: object,
+                            schema: ObjectSchema,
+                            path: str,
+                            check_missing: bool) -> Iterator[tuple[str, str, str]]:
+    if not isinstance(data, Mapping):
+        yield path, KIND_OBJECT, type(data).__name__
+        return
+
+    if not check_missing:
+        # Walk keys of data, it is usually much smaller than template
+        for key, value in data.items():
+            value_schema = schema.get(key)
+            if value_schema is not None:
+                yield from _iter_value_mismatches(value, value_schema, f"{path}.{key}" if path else key, False)
+        return
+
+    for key, value_schema in schema.items():
+        key_path = f"{path}.{key}" if path else key
+        if key not in data:
+            yield key_path, value_schema[0], KIND_MISSING
+        else:
+            yield from _iter_value_mismatches(data[key], value_schema, key_path, True)
+
+
+def _iter_value_mismatches(value: object,
+                           value_schema: ValueSchema,
+                           path: str,
+                           check_missing: bool) -> Iterator[tuple[str, str, str]]:
+    kind, nested = value_schema
+    if value is None or kind == KIND_ANY:
+        return
+
+    if kind == KIND_STR:
+        is_valid = isinstance(value, str)
+    elif kind == KIND_NUMBER:
+        is_valid = isinstance(value, int | float) and not isinstance(value, bool)
+    elif kind == KIND_BOOL:
+        is_valid = isinstance(value, bool)
+    elif kind == KIND_DATE:
+        # Empty string is not filled date, it is valid like null
+        is_valid = isinstance(value, str) and (value == "" or DATE_PATTERN.fullmatch(value) is not None)
+    elif kind == KIND_DATE_TIME:
+        is_valid = isinstance(value, str) and (value == "" or DATE_TIME_PATTERN.fullmatch(value) is not None
+                                               or DATE_PATTERN.fullmatch(value) is not None)
+    elif kind == KIND_OBJECT:
+        yield from _iter_object_mismatches(value, nested, path, check_missing)
+        return
+    else:
+        if not isinstance(value, list):
+            yield path, KIND_ARRAY, type(value).__name__
+            return
+        for i, item in enumerate(value):
+            yield from _iter_value_mismatches(item, nested, f"{path}[{i}]", check_missing)
+        return
+
+    if not is_valid:
+        yield path, kind, _describe(value)
+
+
+def _describe(value: object) -> str:
+    if isinstance(value, str):
+        return f"str '{value[:40]}'"
+    return type(value).__name__
@@ -1,11 +1,20 @@
-import json
+import os
+import threading
+from types import MappingProxyType
+from typing import Hashable, Mapping
 
+from src.utils import codec
+from src.utils.coercion import coerce_dict, compile_coercion_plan
 from src.utils.exceptions import UnexpectedErrorMessage, ConvertStrToDictException
 from src.utils.models import DecoderErrorLocation
 
 ROOT_JSON_PATH = "data/root_json.json"
 DOUBLE_ROOT_JSON_PATH = "data/double_root_json.json"
 
+# path -> (mtime_ns, size, parsed template). Parsed templates are shared and must not be changed
+_templates_cache: dict[str, tuple[int, int, dict]] = {}
+_templates_cache_lock = threading.Lock()
+
 
 def parse_error_message(msg: str):
     """Invalid control character at: line 13 column 44 (char 432)-T"""
@@ -56,64 +65,56 @@ def parse_error_message(msg: str):
         raise UnexpectedErrorMessage(f"This message text was not expected: {msg}, can't handel")
 
 
-def correct_dict_to_export(correcting_dict: dict) -> str:
-    correcting_value = str(correcting_dict)
-    correcting_value = correcting_value.replace("'", '"')
-    correcting_value = correcting_value.replace("True", 'true')
-    correcting_value = correcting_value.replace("False", 'false')
-    correcting_value = correcting_value.replace("None", 'null')
-    correcting_value = correcting_value.replace(',', ',\n')
-
-    return correcting_value
-
-
 def convert_string_to_dict(string: str, error_endwith: str = "F") -> dict:
     try:
-        return json.loads(string)
-    except json.decoder.JSONDecodeError as err:
+        return codec.loads(string)
+    except codec.JSONDecodeError as err:
         raise ConvertStrToDictException(f"{str(err)}-{error_endwith}")
 
 
 def get_root_json_as_dict(is_for_mono: bool = True) -> dict:
+    """
+    Root template as dict. Template is parsed once and cached while file mtime and size are the same.
+    Only top level is copied: nested objects are shared between callers and must not be changed
+    """
     path = ROOT_JSON_PATH if is_for_mono else DOUBLE_ROOT_JSON_PATH
-    with open(path, "r", encoding="utf-8") as file:
-        root_json = json.load(file)
-    return root_json
+    return dict(_get_cached_template(path))
 
 
-def fix_dict_values_type(dictionary: dict, type_example: dict) -> dict:
-    result = {}
-
-    for k, v in dictionary.items():
-        if k in type_example.keys():
+def get_root_json_stamp(is_for_mono: bool = True) -> tuple[int, int] | None:
+    """Modification time and size of root template file, None if there is no file"""
+    path = ROOT_JSON_PATH if is_for_mono else DOUBLE_ROOT_JSON_PATH
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
 
-            if v == "null":
-                result[k] = None
-                continue
 
-            # Matching types
-            if issubclass(type(type_example[k]), bool):
-                result[k] = bool(v)
+def get_root_json_view(is_for_mono: bool = True) -> Mapping:
+    """Read-only view of cached root template without any copy"""
+    path = ROOT_JSON_PATH if is_for_mono else DOUBLE_ROOT_JSON_PATH
+    return MappingProxyType(_get_cached_template(path))
 
-            elif issubclass(type(type_example[k]), int | float):
-                try:
-                    result[k] = int(v)
-                except ValueError:
-                    result[k] = float(v)
 
-            elif issubclass(type(type_example[k]), str):
-                result[k] = str(v)
+def _get_cached_template(path: str) -> dict:
+    stat = os.stat(path)
+    with _templates_cache_lock:
+        cached = _templates_cache.get(path)
+        if cached is not None and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            return cached[2]
 
-            elif issubclass(type(type_example[k]), dict):
-                # TODO: Need to convert string_to_convert to dict if it was nested json
-                result[k] = v
+        with open(path, "rb") as file:
+            template = codec.load(file)
+        _templates_cache[path] = (stat.st_mtime_ns, stat.st_size, template)
+        return template
 
-            elif issubclass(type(type_example[k]), list):
-                # TODO: Mapping empty list
-                value_list = v.split(',')
-                result[k] = [i.strip() for i in value_list]
 
-            else:
-                pass
+def fix_dict_values_type(dictionary: dict, type_example: dict, cache_key: Hashable = None) -> dict:
+    """
+    Convert values of dictionary to types of values with same keys in type_example,
+    keys that are not in type_example are dropped. See utils.coercion
 
-    return result
+    :param cache_key: cheap key of type_example, see compile_coercion_plan
+    """
+    return coerce_dict(dictionary, compile_coercion_plan(type_example, cache_key=cache_key))
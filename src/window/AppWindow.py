@@ -3,7 +3,9 @@ import customtkinter as customtkinter
 
 from src.window.States import FillerState, SageState, TableState, SettingsState
 from src.window.StatesSwitcher import StateSwitcher
+from src.window.JobRunner import JobRunner
 from src.handlers.settings_handlers import WindowSettingsHandler
+from src.utils.result_cache import set_result_cache_max_mb
 
 
 class AppWindow(customtkinter.CTk):
@@ -13,13 +15,16 @@ class AppWindow(customtkinter.CTk):
         self.window_settings_handler = WindowSettingsHandler("data/settings/window_settings.json")
         self.current_settings = self.window_settings_handler.get_current_settings()
         self.logger = logging.getLogger("app.main_window")
+        set_result_cache_max_mb(self.current_settings.result_cache_max_mb)
+        self.job_runner = JobRunner(master=self)
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
 
         self.state_switcher = StateSwitcher(
             states={
-                "Наполнитель JSON'a": FillerState(master=self),
-                "Перенос из Sage": SageState(master=self),
-                "Перенос из таблицы": TableState(master=self),
-                "Настройки": SettingsState(master=self)
+                "Наполнитель JSON'a": lambda: FillerState(master=self),
+                "Перенос из Sage": lambda: SageState(master=self),
+                "Перенос из таблицы": lambda: TableState(master=self),
+                "Настройки": lambda: SettingsState(master=self)
             },
             start_state="Наполнитель JSON'a"
         )
@@ -64,6 +69,11 @@ class AppWindow(customtkinter.CTk):
     def set_root_widgets(self):
         self.mod_button.grid(row=0, column=0, padx=20, pady=10, sticky="NEW", columnspan=1000)
 
+    def on_close(self) -> None:
+        """Drop background jobs and close window"""
+        self.job_runner.shutdown()
+        self.destroy()
+
     def set_appearance_mode(self) -> None:
         """Set appearance mod from settings"""
         customtkinter.set_appearance_mode(self.current_settings.themes.appearance_mode)
@@ -85,6 +95,5 @@ class AppWindow(customtkinter.CTk):
               "appearance_mode": "light",
               "color_theme": "blue"
             })
-        self.window_settings_handler.set_new_settings()
 
 
@@ -1,6 +1,21 @@
+import logging
+from typing import Callable
+
 import customtkinter
 from customtkinter import CTkFrame
 
+from src.utils.models import DatesModel, DoubleAccountPresetModel, DoubleAccountSettingsFromUIModel
+from src.utils.file_input import InputFile
+
+# Text is inserted to ResultTextbox by chunks, one chunk per main loop tick, so window keeps responding
+RESULT_CHUNK_CHARS = 64 * 1024
+RESULT_CHUNK_DELAY_MS = 1
+# Results longer than this are shown as preview, full text is available by copy or save
+RESULT_PREVIEW_CHARS = 1024 * 1024
+ERROR_TAG = "tag_red_text"
+RESULT_PREVIEW_FOOTER = "\n\n... Показано {} из {} символов. Полный результат доступен через 'Копировать' и 'Сохранить'"
+FILE_PREVIEW_FOOTER = "\n\n... Открыт файл {} ({:.1f} МБ), показано начало. Чтобы ввести текст, очистите поле"
+
 
 class CustomOutputWindow(CTkFrame):
 
@@ -14,6 +29,132 @@ class CustomOutputWindow(CTkFrame):
         self.output_box.grid(column=0, row=0)
 
 
+def highlight_error(textbox: customtkinter.CTkTextbox, line: int, column: int) -> None:
+    """
+    Color char at error position in place and scroll to it, text of textbox is not re-inserted.
+    Position is from json.JSONDecodeError: line and column start from 1
+
+    :param textbox: textbox with text that was parsed
+    """
+    clear_error_highlight(textbox)
+    if getattr(textbox, "input_file", None) is not None:
+        # InputTextbox with opened file shows only head of it, error can be out of shown text
+        return
+    textbox.tag_config(ERROR_TAG, foreground="red")
+    index = f"{line}.{max(column - 1, 0)}"
+    textbox.tag_add(ERROR_TAG, index)
+    textbox.see(index)
+
+
+def clear_error_highlight(textbox: customtkinter.CTkTextbox) -> None:
+    textbox.tag_remove(ERROR_TAG, "1.0", customtkinter.END)
+
+
+class ResultTextbox(customtkinter.CTkTextbox):
+    """
+    Textbox for results. Keeps full result string: big text is inserted by chunks scheduled with after(),
+    text longer than preview_chars is shown truncated. get_result() always returns full result
+    """
+
+    def __init__(self, *args, preview_chars: int | None = RESULT_PREVIEW_CHARS, **kwargs) -> None:
+        """:param preview_chars: max shown chars, None - always show whole result"""
+        super(ResultTextbox, self).__init__(*args, **kwargs)
+        self.preview_chars = preview_chars
+        self._result: str | None = None
+        self._is_preview = False
+        self._render_job: str | None = None
+
+    def set_result(self, text: str) -> None:
+        """Insert first chunk, rest of text is inserted by scheduled jobs after return"""
+        self.clear()
+        self._result = text
+
+        shown = text
+        if self.preview_chars is not None and len(text) > self.preview_chars:
+            shown = text[:self.preview_chars] + RESULT_PREVIEW_FOOTER.format(self.preview_chars, len(text))
+            self._is_preview = True
+        self._insert_chunk(shown, 0)
+
+    def get_result(self) -> str:
+        """Full result. If user edited completely rendered result, edited text is returned"""
+        if self._result is not None and (self._is_preview or self.is_rendering() or not self.edit_modified()):
+            return self._result
+        return self.get(0.0, customtkinter.END)
+
+    def save_result(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(self.get_result())
+
+    def ask_save_result(self, set_feedback: Callable[[str], None], logger: logging.Logger) -> None:
+        """Ask path by dialog and save full result to it, outcome is reported by set_feedback"""
+        import tkinter.filedialog  # Loaded on first use to speed up start
+
+        path = tkinter.filedialog.asksaveasfilename(title="Сохранить результат", defaultextension=".json",
+                                                    filetypes=[("JSON", "*.json"), ("All files", "*.*")])
+        if not path:
+            return
+        try:
+            self.save_result(path)
+        except OSError as err:
+            set_feedback(f"Не удалось сохранить файл: {err}")
+            logger.error(f"Save result error: {repr(err)}")
+            return
+        set_feedback(f"Результат сохранен: {path}")
+
+    def is_rendering(self) -> bool:
+        return self._render_job is not None
+
+    def clear(self) -> None:
+        if self._render_job is not None:
+            self.after_cancel(self._render_job)
+            self._render_job = None
+        self._result = None
+        self._is_preview = False
+        self.delete(0.0, customtkinter.END)
+        self.edit_modified(False)
+
+    def _insert_chunk(self, text: str, start: int) -> None:
+        end = start + RESULT_CHUNK_CHARS
+        self.insert(customtkinter.END, text[start:end])
+        if end < len(text):
+            self._render_job = self.after(RESULT_CHUNK_DELAY_MS, self._insert_chunk, text, end)
+        else:
+            self._render_job = None
+            self.edit_modified(False)
+
+
+class InputTextbox(customtkinter.CTkTextbox):
+    """
+    Textbox for handler inputs: text is typed or pasted, or file is opened.
+    Opened file is not inserted: textbox shows its head and is read-only until clear()
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super(InputTextbox, self).__init__(*args, **kwargs)
+        self.input_file: InputFile | None = None
+
+    def open_file(self, path: str) -> InputFile:
+        """:raise OSError: if file can't be read"""
+        input_file = InputFile(path)
+        preview = input_file.preview()
+        self.clear()
+        self.input_file = input_file
+        self.insert(customtkinter.END, preview + FILE_PREVIEW_FOOTER.format(path, input_file.size / 1024 / 1024))
+        self.configure(state="disabled")
+        return input_file
+
+    def get_input(self) -> str | InputFile:
+        """Opened file or typed text, pass it to handler through file_input.call_with_file_inputs"""
+        if self.input_file is not None:
+            return self.input_file
+        return self.get(0.0, customtkinter.END)
+
+    def clear(self) -> None:
+        self.input_file = None
+        self.configure(state="normal")
+        self.delete(0.0, customtkinter.END)
+
+
 class CustomInputBox(CTkFrame):
     w_label: customtkinter.CTkLabel
     text_box_var: customtkinter.StringVar
@@ -203,3 +344,88 @@ class CustomSettingsBox(CTkFrame):
     def callback_delete_preset(self):
         raise NotImplementedError
 
+
+
+class AccountSettingsFrame(CTkFrame):
+    """Fields of one account of double product: numbers, product type and dates"""
+
+    def __init__(self,
+                 *args,
+                 title: str,
+                 **kwargs) -> None:
+        super(AccountSettingsFrame, self).__init__(*args, **kwargs)
+        self.title = title
+
+        self.create_sub_widgets()
+        self.set_sub_widgets()
+
+    def create_sub_widgets(self) -> None:
+        self.w_label = customtkinter.CTkLabel(master=self,
+                                              text=self.title,
+                                              padx=5,
+                                              pady=5)
+
+        self.account_number_box = CustomLabelCombobox(master=self,
+                                                      label_text="     ACCOUNT_NUMBER:    ",
+                                                      combobox_default_value="",
+                                                      combobox_values=[""])
+        self.contract_number_box = CustomLabelCombobox(master=self,
+                                                       label_text="   CONTRACT_NUMBER:   ",
+                                                       combobox_default_value="",
+                                                       combobox_values=[""])
+        self.product_type_box = CustomLabelCombobox(master=self,
+                                                    label_text="         PRODUCT_TYPE:       ",
+                                                    combobox_default_value="Common",
+                                                    combobox_values=["", "Common", "Kvk", "Kbk"])
+
+        self.date1_input_box = CustomInputBox(master=self, label_text="    Date 1:  ")
+        self.date2_input_box = CustomInputBox(master=self, label_text="    Date 2:  ")
+        self.date3_input_box = CustomInputBox(master=self, label_text="    Date 3:  ")
+        self.std_input_box = CustomInputBox(master=self, label_text="     STD:     ")
+        self.next_std_input_box = CustomInputBox(master=self, label_text="Next STD:")
+
+    def set_sub_widgets(self) -> None:
+        self.w_label.grid(column=0, row=0, columnspan=2)
+
+        self.account_number_box.grid(column=0, row=1, sticky="WE")
+        self.contract_number_box.grid(column=0, row=2, sticky="WE")
+        self.product_type_box.grid(column=0, row=3, sticky="WE")
+
+        self.date1_input_box.grid(column=1, row=1, padx=1, pady=1, sticky="WE")
+        self.date2_input_box.grid(column=1, row=2, padx=1, pady=1, sticky="WE")
+        self.date3_input_box.grid(column=1, row=3, padx=1, pady=1, sticky="WE")
+        self.std_input_box.grid(column=1, row=4, padx=1, pady=1, sticky="WE")
+        self.next_std_input_box.grid(column=1, row=5, padx=1, pady=1, sticky="WE")
+
+    def get_settings(self) -> DoubleAccountSettingsFromUIModel:
+        return DoubleAccountSettingsFromUIModel(
+            dates=DatesModel(
+                date_1=self.date1_input_box.get_text().strip(),
+                date_2=self.date2_input_box.get_text().strip(),
+                date_3=self.date3_input_box.get_text().strip(),
+                std=self.std_input_box.get_text().strip(),
+                next_std=self.next_std_input_box.get_text().strip(),
+            ),
+            account_number=self.account_number_box.get_text().strip(),
+            contract_number=self.contract_number_box.get_text().strip(),
+            product_type=self.product_type_box.get_text().strip()
+        )
+
+    def get_preset(self) -> DoubleAccountPresetModel:
+        return DoubleAccountPresetModel(
+            account_number=self.account_number_box.get_text(),
+            contract_number=self.contract_number_box.get_text(),
+            product_type=self.product_type_box.get_text()
+        )
+
+    def set_preset(self, preset: DoubleAccountPresetModel) -> None:
+        self.account_number_box.set_new_text(preset.account_number)
+        self.contract_number_box.set_new_text(preset.contract_number)
+        self.product_type_box.set_new_text(preset.product_type)
+
+    def set_dates(self, dates: DatesModel) -> None:
+        self.date1_input_box.set_new_text(dates.date_1)
+        self.date2_input_box.set_new_text(dates.date_2)
+        self.date3_input_box.set_new_text(dates.date_3)
+        self.std_input_box.set_new_text(dates.std)
+        self.next_std_input_box.set_new_text(dates.next_std)
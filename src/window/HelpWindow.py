@@ -6,6 +6,10 @@ ______________________________
 перенесено в первый JSON
 tсли поле оставить пустым, то будет использован json из директории .../data/root_json.json
 
+"Открыть файл" - вместо вставки текста можно открыть файл (вкладки "Наполнитель" и "Sage"). В поле
+ показывается только начало файла, весь файл читается при запуске. Чтобы снова вводить текст,
+ очистите поле
+
 1.1 contact_id, account_number, contract_number, product_type, communication_type -
 Значения из этих полей перенесутся в значения одноименных ключей "JSON в который переносим 
 значени",если поля ввода заполнены
@@ -24,6 +28,27 @@ tсли поле оставить пустым, то будет использо
 
 "Форматиовать D&T в Data" - Если чекбокс прожат, то при переносе все значения типа DateTime 
  конвертируются в значения типа Date
+
+1.4 Вложенные JSON'ы
+ Значения переносятся на любом уровне вложенности: вложенные объекты заполняются по своим ключам,
+ массивы - поэлементно (длина массива берется из JSON'а из которого переносим значения)
+
+"Искать ключи на любой вложенности" - Если чекбокс прожат, то ключ ищется во всем JSON'е из которого
+ переносим значения, а не только по тому же пути. Берется значение с наименьшей вложенностью
+
+"Живой режим" - Если чекбокс прожат, то результат пересчитывается сам после паузы в редактировании
+ полей 1 и 2. Неизмененный JSON повторно не разбирается, заново заполняются только измененные ключи
+
+1.5 Дабл
+ Настройки основного счета переносятся в те же ключи, что и для моно продукта (ACCOUNT_NUMBER,
+ PRIMARY_ACCOUNT_*), настройки второго счета - в ключи SECONDARY_* (SECONDARY_ACCOUNT_NUMBER,
+ SECONDARY_ACCOUNT_DATE1 ...). CONTACT_ID и COMMUNICATION_TYPE общие для обоих счетов.
+ Если поле 2 оставить пустым, то будет использован json из директории .../data/double_root_json.json
+ "Рассчитать даты" заполняет даты обоих счетов по настройкам моно продукта
+
+1.6 "Заполнить шаблоны из файлов"
+ Заполняет несколько выбранных файлов-шаблонов JSON'ом из поля 2 за один запуск: JSON из поля 2
+ разбирается один раз. Результат - один JSON, где ключ - имя файла шаблона, значение - результат
 ______________________________
 
 2. Перенос из Sage
@@ -35,6 +60,11 @@ key1 = value1
 key2 = value2
 key3 = value3
 
+ Значение может содержать "=", ключом считается все до первого "=".
+ Можно вставить выгрузку из нескольких записей, записи разделяются пустой строкой или
+ строкой-заголовком без "=". Несколько записей выводятся массивом JSON, или по одному JSON
+ на строку, если прожат чекбокс "Несколько записей в JSON Lines"
+
 - Пример json'a - json значения которого необходимо заполнить значениями из sage строки по
  совпадающим ключам, если поле оставить пустым, то будет использован json из директории
  .../data/root_json.json
@@ -55,7 +85,17 @@ ______________________________
  ".ods", ".odt"
 - В таблице должно обязательно присутствовать две коллонки с заголовками
 -- "variable_name" - Ключи 
--- "variable_value" - Значения"""
+-- "variable_value" - Значения
+______________________________
+
+4. Время выполнения
+______________________________
+После каждого запуска в окне сообщений и в логе выводится время этапов: разбор JSON'а,
+ заполнение, применение настроек, проверка по root_json, форматирование и показ результата
+ ("show" - вставка первой части, остальной большой результат дописывается в фоне)
+
+"Профилировать следующий запуск" (Настройки) - следующий запуск в любой вкладке будет
+ записан cProfile и tracemalloc в директорию .../data/profiles"""
 
 
 class TopLevelHelpWindow(customtkinter.CTkToplevel):
@@ -0,0 +1,126 @@
+import functools
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, Future
+
+import customtkinter
+
+from src.utils.profiling import take_profile_request, profile_call
+
+POLL_INTERVAL_MS = 50
+BUSY_TICK_MS = 500
+# One worker for every state job (filler, sage, table) and spare ones: cancelled job keeps its worker
+# until handler returns, new job of the same state must not wait for it
+DEFAULT_MAX_WORKERS = 6
+
+
+class Job:
+    """One background run of a handler function"""
+
+    def __init__(self, name: str, future: Future, on_success: callable, on_error: callable,
+                 on_busy: callable = None) -> None:
+        self.name = name
+        self.future = future
+        self.on_success = on_success
+        self.on_error = on_error
+        self.on_busy = on_busy
+        self.started_at = time.perf_counter()
+        self.is_cancelled = False
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started_at
+
+
+class JobRunner:
+    """
+    Executor-backed runner shared by all states.
+    Handler functions run on a worker thread, result is posted back to Tk main loop with after().
+    Worker functions must not touch widgets - read everything from UI before submit.
+    Handlers are not interrupted: cancel only drops result of running job, it keeps running to the end.
+    """
+
+    def __init__(self, master: customtkinter.CTkBaseClass, max_workers: int = DEFAULT_MAX_WORKERS) -> None:
+        self.master = master
+        self.logger = logging.getLogger("app.main_window.job_runner")
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job_runner")
+        self._jobs: dict[str, Job] = {}
+
+    def submit(self,
+               name: str,
+               func: callable,
+               *args,
+               on_success: callable,
+               on_error: callable,
+               on_busy: callable = None,
+               **kwargs) -> Job:
+        """
+        Run func(*args, **kwargs) on worker thread. Only one job per name can be active,
+        previous job with same name is cancelled.
+
+        :param name: job name, usually state name
+        :param on_success: called in main loop with func result
+        :param on_error: called in main loop with raised exception
+        :param on_busy: called in main loop every BUSY_TICK_MS with seconds elapsed, for busy indicator
+        :return: Job
+        """
+        self.cancel(name)
+        if take_profile_request():
+            self.logger.info(f"Job '{name}' is run with profiling")
+            func = functools.partial(profile_call, name, func)
+
+        future = self._executor.submit(func, *args, **kwargs)
+        job = Job(name=name, future=future, on_success=on_success, on_error=on_error, on_busy=on_busy)
+        self._jobs[name] = job
+        self.logger.debug(f"Submit job: '{name}'")
+
+        if on_busy is not None:
+            on_busy(0.0)
+            self.master.after(BUSY_TICK_MS, self._busy_tick, job)
+        self.master.after(POLL_INTERVAL_MS, self._poll, job)
+        return job
+
+    def cancel(self, name: str) -> bool:
+        """
+        Cancel job by name. Not started job is removed from executor queue.
+        Already running job is not stopped: it keeps its worker until handler returns,
+        then its result or error is dropped.
+
+        :return: True if there was an active job to cancel
+        """
+        job = self._jobs.pop(name, None)
+        if job is None:
+            return False
+
+        job.is_cancelled = True
+        job.future.cancel()
+        self.logger.info(f"Cancel job: '{name}' after {job.elapsed():.2f} sec")
+        return True
+
+    def is_busy(self, name: str) -> bool:
+        return name in self._jobs
+
+    def shutdown(self) -> None:
+        for name in list(self._jobs):
+            self.cancel(name)
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _poll(self, job: Job) -> None:
+        if job.is_cancelled:
+            return
+        if not job.future.done():
+            self.master.after(POLL_INTERVAL_MS, self._poll, job)
+            return
+
+        self._jobs.pop(job.name, None)
+        err = job.future.exception()
+        self.logger.debug(f"Finish job: '{job.name}' in {job.elapsed():.2f} sec")
+        if err is None:
+            job.on_success(job.future.result())
+        else:
+            job.on_error(err)
+
+    def _busy_tick(self, job: Job) -> None:
+        if job.is_cancelled or job.future.done():
+            return
+        job.on_busy(job.elapsed())
+        self.master.after(BUSY_TICK_MS, self._busy_tick, job)
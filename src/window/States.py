@@ -1,24 +1,72 @@
 import logging
-import tkinter.filedialog
+import os
 import customtkinter
-import pyperclip
+from typing import Callable
 
 from src.window.HelpWindow import TopLevelHelpWindow
-from src.utils.exceptions import PresetException, ConvertStrToDictException, UnexpectedErrorMessage, \
-    NoSupportFileExtension
+from src.utils.exceptions import PresetException, ConvertStrToDictException, TemplateConvertException, \
+    UnexpectedErrorMessage, NoSupportFileExtension, TableReadException, JsonRootTypeException
 from src.utils.models import MonoSettingsModel, MonoDatesModel, DatesModel, MonoPresetModel, \
-    MonoSettingsFromUIModel, DecoderErrorLocation, WindowSettingsModel
-from src.utils.utils import parse_error_message, get_root_json_as_dict
+    MonoSettingsFromUIModel, DecoderErrorLocation, WindowSettingsModel, ConvertReportModel, DoublePresetModel, \
+    DoubleSettingsFromUIModel
+from src.utils.utils import parse_error_message
+from src.utils.loggs.logger import PayloadSummary
+from src.utils.result_cache import result_cache, set_result_cache_max_mb
+from src.utils.file_input import call_with_file_inputs
+from src.utils.profiling import timing_span, format_spans, set_profile_next_run, is_profile_next_run, \
+    PROFILES_DIR
 from src.window.StatesSwitcher import State, StateSwitcher
-from src.window.CustomWidgets import CustomInputBox, CustomSegmentBox, CustomLabelCombobox
+from src.window.CustomWidgets import CustomInputBox, CustomSegmentBox, CustomLabelCombobox, ResultTextbox, \
+    InputTextbox, AccountSettingsFrame, highlight_error, clear_error_highlight
 from src.handlers.settings_handlers import WindowSettingsHandler
 from src.handlers.settings_handlers import FillerSettingsHandler
-from src.handlers.filler_handlers import plus_days_from_now, filler
-from src.handlers.sage_handler import convert_sage_str_to_dict_with_correcting_types
-from src.handlers.tables_handler import make_json_from_table
+from src.handlers.filler_handlers import plus_days_from_now, filler, MATCH_BY_PATH, MATCH_BY_KEY, IncrementalFiller, \
+    fill_many, join_named_results
+from src.handlers.sage_handler import convert_sage_str_to_dict_with_correcting_types, SAGE_OUTPUT_ARRAY, \
+    SAGE_OUTPUT_JSON_LINES
 
 FILLER_SETTINGS_PATH = "data/settings/filler_settings.json"
 ROOT_JSON_PATH = "data/root_json.json"
+BUSY_FEEDBACK_TEXT = "Выполняется... {:.1f} сек. Нажмите 'Стоп', чтобы отменить"
+MISMATCHES_FEEDBACK_TEXT = "{}. Несоответствий шаблону: {}, например: {} - ожидалось {}, получено {}"
+MISMATCHES_TO_LOG = 20
+SPANS_FEEDBACK_TEXT = "{}\nЭтапы: {}"
+# Live fill starts after this pause in input edits
+LIVE_FILL_DEBOUNCE_MS = 400
+
+
+def make_success_feedback(text: str, report: ConvertReportModel, logger: logging.Logger) -> str:
+    """Add schema mismatches and stage timings from report to success feedback and log them"""
+    if report.from_cache:
+        text += " (из кэша)"
+        logger.debug("Result from cache, cache stats: %s", result_cache.stats())
+    spans = format_spans(report.spans)
+    logger.info("Convert stages: %s", spans)
+    if report.mismatches:
+        for mismatch in report.mismatches[:MISMATCHES_TO_LOG]:
+            logger.warning("Result mismatch with template: '%s' - expected %s, got %s",
+                           mismatch.path, mismatch.expected, mismatch.actual)
+        first = report.mismatches[0]
+        text = MISMATCHES_FEEDBACK_TEXT.format(text, len(report.mismatches), first.path, first.expected,
+                                               first.actual)
+    return SPANS_FEEDBACK_TEXT.format(text, spans)
+
+
+def open_input_file(textbox: InputTextbox, set_feedback: Callable[[str], None], logger: logging.Logger) -> None:
+    """Open file as input of textbox: it is read by mmap on start, textbox shows only head of it"""
+    import tkinter.filedialog  # Loaded on first use to speed up start
+
+    path = tkinter.filedialog.askopenfilename(title="Открыть файл")
+    if not path:
+        return
+    try:
+        input_file = textbox.open_file(path)
+    except OSError as err:
+        set_feedback(f"Не удалось открыть файл: {err}")
+        logger.error(f"Open input file error: {repr(err)}")
+        return
+    logger.info(f"Open input file: {input_file}")
+    set_feedback(f"Открыт файл: {path}")
 
 
 class FillerState(State):
@@ -37,6 +85,11 @@ class FillerState(State):
         # Get logger
         self.logger = logging.getLogger("app.states.filler")
 
+        # Live mode: keeps stages of last fill, runs after edits of inputs
+        self.live_filler = IncrementalFiller()
+        self.live_mode_chkbox_var = customtkinter.IntVar(value=0)
+        self._live_fill_job: str | None = None
+
         # Create and set state main frame
         self.create_frames()
         self.set_frames()
@@ -49,7 +102,7 @@ class FillerState(State):
         self.sub_filler_settings_state_switcher = StateSwitcher(
             states={
                 "Моно продукт": SubFillerMonoState(self.filler_settings_frame, self),
-                "Дабл": SubFillerDoubleState(self.filler_settings_frame)
+                "Дабл": lambda: SubFillerDoubleState(self.filler_settings_frame, self)
             },
             start_state="Моно продукт"
         )
@@ -119,21 +172,33 @@ class FillerState(State):
         self.label_textbox_r = customtkinter.CTkLabel(master=self.input_windows_frame, text='Результат')
 
         # TextBoxes
-        self.textbox_l = customtkinter.CTkTextbox(master=self.input_windows_frame,
-                                                  width=300,
-                                                  height=300,
-                                                  border_width=1
-                                                  )
-        self.textbox_m = customtkinter.CTkTextbox(master=self.input_windows_frame,
-                                                  width=300,
-                                                  height=300,
-                                                  border_width=1
-                                                  )
-        self.textbox_r = customtkinter.CTkTextbox(master=self.input_windows_frame,
-                                                  width=300,
-                                                  height=300,
-                                                  border_width=1
-                                                  )
+        self.textbox_l = InputTextbox(master=self.input_windows_frame,
+                                      width=300,
+                                      height=300,
+                                      border_width=1
+                                      )
+        self.textbox_m = InputTextbox(master=self.input_windows_frame,
+                                      width=300,
+                                      height=300,
+                                      border_width=1
+                                      )
+        self.textbox_r = ResultTextbox(master=self.input_windows_frame,
+                                       width=300,
+                                       height=300,
+                                       border_width=1
+                                       )
+
+        # Open file buttons
+        self.open_file_l_btn = customtkinter.CTkButton(master=self.input_windows_frame,
+                                                       text="Открыть файл",
+                                                       command=lambda: open_input_file(self.textbox_l, self.set_feedback,
+                                                                                       self.logger),
+                                                       border_width=1)
+        self.open_file_m_btn = customtkinter.CTkButton(master=self.input_windows_frame,
+                                                       text="Открыть файл",
+                                                       command=lambda: open_input_file(self.textbox_m, self.set_feedback,
+                                                                                       self.logger),
+                                                       border_width=1)
 
     def set_input_windows_frame_widgets(self) -> None:
         """Set widgets in window_frame"""
@@ -147,6 +212,14 @@ class FillerState(State):
         self.label_textbox_m.grid(row=0, column=1, sticky="NSEW")
         self.label_textbox_r.grid(row=0, column=2, sticky="NSEW")
 
+        # Set open file buttons
+        self.open_file_l_btn.grid(row=2, column=0, sticky="NSEW")
+        self.open_file_m_btn.grid(row=2, column=1, sticky="NSEW")
+
+        # Live mode
+        self.textbox_l.bind("<<Modified>>", self.on_input_modified)
+        self.textbox_m.bind("<<Modified>>", self.on_input_modified)
+
     def create_action_frame_widgets(self) -> None:
         """Create widgets which will be in action_frame"""
 
@@ -157,12 +230,24 @@ class FillerState(State):
             border_width=1,
             fg_color="green"
         )
+        self.stop_btn = customtkinter.CTkButton(
+            master=self.action_frame,
+            text="Стоп",
+            command=self.stop_btn_callback,
+            border_width=1
+        )
         self.copy_result_btn = customtkinter.CTkButton(
             master=self.action_frame,
             text="Копировать результат",
             command=self.copy_result_btn_callback,
             border_width=1
         )
+        self.save_result_btn = customtkinter.CTkButton(
+            master=self.action_frame,
+            text="Сохранить результат",
+            command=lambda: self.textbox_r.ask_save_result(self.set_feedback, self.logger),
+            border_width=1
+        )
         self.clear_l_text_box_btn = customtkinter.CTkButton(
             master=self.action_frame,
             text="Очистить 1",
@@ -184,14 +269,28 @@ class FillerState(State):
             border_width=1,
             fg_color="purple"
         )
+        self.live_mode_chkbox = customtkinter.CTkCheckBox(master=self.action_frame,
+                                                          text=" - Живой режим",
+                                                          variable=self.live_mode_chkbox_var,
+                                                          command=self.live_mode_chkbox_callback)
+        self.fill_many_btn = customtkinter.CTkButton(
+            master=self.action_frame,
+            text="Заполнить шаблоны из файлов",
+            command=self.fill_many_btn_callback,
+            border_width=1
+        )
 
     def set_action_frame_widgets(self) -> None:
         """Set widgets in action_frame"""
         self.start_btn.grid(row=0, column=0, sticky="NSWE")
         self.copy_result_btn.grid(row=0, column=1, sticky="NSWE")
+        self.stop_btn.grid(row=0, column=2, sticky="NSWE")
+        self.save_result_btn.grid(row=0, column=3, sticky="NSWE")
+        self.live_mode_chkbox.grid(row=0, column=4, padx=5, sticky="NSWE")
         self.clear_l_text_box_btn.grid(row=0, column=5, sticky="NSWE")
         self.clear_m_text_box_btn.grid(row=0, column=6, sticky="NSWE")
         self.clear_r_text_box_btn.grid(row=0, column=7, sticky="NSWE")
+        self.fill_many_btn.grid(row=0, column=8, sticky="NSWE")
 
     def create_settings_filler_frame_widgets(self) -> None:
         self.filler_settings_state_segment_btn_var = customtkinter.StringVar(value="Моно продукт")
@@ -207,81 +306,163 @@ class FillerState(State):
 
     # ----------- Buttons callbacks  ----------- #
     def start_btn_callback(self) -> None:
-        to_fill = self.textbox_l.get(0.0, customtkinter.END)
-        from_fill = self.textbox_m.get(0.0, customtkinter.END)
-        self.logger.info(f"Start fill with:"
-                         f"To fill: {to_fill}"
-                         f"From fill: {from_fill}")
+        self.run_fill(filler)
+
+    def run_fill(self, fill_func: callable) -> None:
+        """:param fill_func: filler or IncrementalFiller.fill"""
+        to_fill = self.textbox_l.get_input()
+        from_fill = self.textbox_m.get_input()
+        clear_error_highlight(self.textbox_l)
+        clear_error_highlight(self.textbox_m)
+        self.logger.info("Start fill with: To fill: %s From fill: %s",
+                         PayloadSummary(to_fill), PayloadSummary(from_fill))
+
+        self.logger.info(f"filler mod - {self.sub_filler_settings_state_switcher.get_current_state_name()}")
+        state = self.sub_filler_settings_state_switcher.get_current_state()
+        settings: MonoSettingsFromUIModel | DoubleSettingsFromUIModel = state.reed_date_settings()
+
+        report = ConvertReportModel()
+        self.master.job_runner.submit("filler",
+                                      call_with_file_inputs,
+                                      fill_func,
+                                      to_fill=to_fill,
+                                      from_fill=from_fill,
+                                      settings=settings,
+                                      report=report,
+                                      on_success=lambda result: self.on_fill_success(result, report),
+                                      on_error=self.on_fill_error,
+                                      on_busy=self.set_busy_feedback)
+
+    def fill_many_btn_callback(self) -> None:
+        """Fill templates from chosen files by JSON from field 2, results are shown as one JSON: file name -> result"""
+        import tkinter.filedialog  # Loaded on first use to speed up start
+
+        paths = tkinter.filedialog.askopenfilenames(title="Шаблоны для заполнения",
+                                                    filetypes=[("JSON", "*.json"), ("All files", "*.*")])
+        if not paths:
+            return
 
+        to_fills = {}
         try:
-            if self.sub_filler_settings_state_switcher.get_current_state_name() == "Моно продукт":
-                self.logger.info("filler mod - Mono")
-                state = self.sub_filler_settings_state_switcher.get_current_state()
-                settings: SubFillerMonoState = state.reed_date_settings()
-
-                result = filler(to_fill=to_fill, from_fill=from_fill, settings=settings)
-            else:
-                self.logger.info("filler mod - Double")
-                self.set_feedback("Для даблов расчет пока не реализован, вернись на настройки 'Моно продукта'")
-                return None
-
-            self.textbox_r.delete(0.0, customtkinter.END)
-            self.textbox_r.insert(0.0, result)
-            self.logger.info(f"Success fill, result: {result}")
-            self.set_feedback("JSON Успешно преобразован")
-        except ConvertStrToDictException as err:
+            for path in paths:
+                name = os.path.splitext(os.path.basename(path))[0]
+                with open(path, "r", encoding="utf-8") as file:
+                    to_fills[path if name in to_fills else name] = file.read()
+        except (OSError, UnicodeDecodeError) as err:
+            self.set_feedback(f"Не удалось прочитать файл: {err}")
+            self.logger.error(f"Read templates error: {repr(err)}")
+            return
+
+        from_fill = self.textbox_m.get_input()
+        clear_error_highlight(self.textbox_m)
+        state = self.sub_filler_settings_state_switcher.get_current_state()
+        settings: MonoSettingsFromUIModel | DoubleSettingsFromUIModel = state.reed_date_settings()
+        self.logger.info("Start fill many: %s templates, from fill: %s", len(to_fills), PayloadSummary(from_fill))
+
+        report = ConvertReportModel()
+        self.master.job_runner.submit("filler",
+                                      call_with_file_inputs,
+                                      fill_many,
+                                      to_fills=to_fills,
+                                      from_fill=from_fill,
+                                      settings=settings,
+                                      report=report,
+                                      on_success=lambda results: self.on_fill_many_success(results, report),
+                                      on_error=self.on_fill_error,
+                                      on_busy=self.set_busy_feedback)
+
+    def stop_btn_callback(self) -> None:
+        if self.master.job_runner.cancel("filler"):
+            self.set_feedback("Выполнение отменено")
+
+    def live_mode_chkbox_callback(self) -> None:
+        if self.live_mode_chkbox_var.get():
+            self.schedule_live_fill()
+        else:
+            self.live_filler.reset()
+
+    def on_input_modified(self, event=None) -> None:
+        # <<Modified>> is sent only when flag is changed, reset it to get next edit
+        self.textbox_l.edit_modified(False)
+        self.textbox_m.edit_modified(False)
+        if self.live_mode_chkbox_var.get():
+            self.schedule_live_fill()
+
+    def schedule_live_fill(self) -> None:
+        """Debounce: fill starts LIVE_FILL_DEBOUNCE_MS after the last edit"""
+        if self._live_fill_job is not None:
+            self.master.after_cancel(self._live_fill_job)
+        self._live_fill_job = self.master.after(LIVE_FILL_DEBOUNCE_MS, self.live_fill)
+
+    def live_fill(self) -> None:
+        self._live_fill_job = None
+        if self.live_mode_chkbox_var.get():
+            self.run_fill(self.live_filler.fill)
+
+    def on_fill_success(self, result: str, report: ConvertReportModel) -> None:
+        with timing_span(report, "show"):
+            self.textbox_r.set_result(result)
+        self.logger.info("Success fill, result: %s", PayloadSummary(result))
+        self.set_feedback(make_success_feedback("JSON Успешно преобразован", report, self.logger))
+
+    def on_fill_many_success(self, results: dict[str, str], report: ConvertReportModel) -> None:
+        with timing_span(report, "show"):
+            self.textbox_r.set_result(join_named_results(results))
+        self.logger.info(f"Success fill many: {len(results)} templates")
+        self.set_feedback(make_success_feedback(f"Заполнено шаблонов: {len(results)}", report, self.logger))
+
+    def on_fill_error(self, err: Exception) -> None:
+        if isinstance(err, TemplateConvertException):
+            # Template from file of fan-out fill, there is no field to highlight
+            self.set_feedback(f"Неверный синтаксис JSON'а шаблона: {err}")
+            self.logger.error(f"Fill many template error: {err}")
+        elif isinstance(err, ConvertStrToDictException):
             try:
                 err_location = parse_error_message(str(err))
                 self.set_error_feedback(err_location=err_location)
                 self.logger.error(f"Input syntax error: {err_location}")
             except UnexpectedErrorMessage as err:
                 self.logger.error(f"Filler error: {str(err)}")
+        elif isinstance(err, JsonRootTypeException):
+            field = "1. 'В который переносим ключи'" if str(err).endswith("-T") else "2. 'Из которого переносим ключи'"
+            self.set_feedback(f"JSON в поле {field} должен быть объектом {{...}}")
+            self.logger.error(f"Filler root type error: {err}")
+        else:
+            self.set_feedback(f"Непредвиденная ошибка: {err}")
+            self.logger.error(f"Filler unexpected error: {repr(err)}")
 
     def clear_l_text_box_callback(self) -> None:
-        self.textbox_l.delete(0.0, customtkinter.END)
+        self.textbox_l.clear()
 
     def copy_result_btn_callback(self) -> None:
-        text = self.textbox_r.get(0.0, customtkinter.END)
+        import pyperclip  # Loaded on first use to speed up start
+
+        text = self.textbox_r.get_result()
         pyperclip.copy(text)
 
     def clear_m_text_box_callback(self) -> None:
-        self.textbox_m.delete(0.0, customtkinter.END)
+        self.textbox_m.clear()
 
     def clear_r_text_box_callback(self) -> None:
-        self.textbox_r.delete(0.0, customtkinter.END)
+        self.textbox_r.clear()
 
     # ----------- Feedback ----------- #
     def set_feedback(self, text: str) -> None:
         self.feedback_window.delete(0.0, customtkinter.END)
         self.feedback_window.insert(customtkinter.INSERT, text)
 
+    def set_busy_feedback(self, elapsed: float) -> None:
+        self.set_feedback(BUSY_FEEDBACK_TEXT.format(elapsed))
+
     def set_error_feedback(self, err_location: DecoderErrorLocation) -> None:
+        textbox = self.textbox_l if err_location.location == "1. 'В который переносим ключи'" else self.textbox_m
         msg_feedback = f"Неверный синтаксис JSON'а {err_location.location}," \
                        f" Строка: {err_location.line}; Символ: {err_location.column}"
+        if textbox.input_file is not None:
+            msg_feedback += f" (в файле {textbox.input_file.path})"
         self.set_feedback(msg_feedback)
 
-        if err_location.location == "1. 'В который переносим ключи'":
-            str_with_error = self.textbox_l.get(0.0, customtkinter.END)
-            self.textbox_l.tag_config('tag_red_text', foreground='red')
-
-            self.textbox_l.delete(0.0, customtkinter.END)
-            self.textbox_l.insert(customtkinter.INSERT, str_with_error[:err_location.char])
-            try:
-                self.textbox_l.insert(customtkinter.INSERT, str_with_error[err_location.char], 'tag_red_text')
-                self.textbox_l.insert(customtkinter.INSERT, str_with_error[err_location.char + 1:])
-            except IndexError:
-                ...
-        else:
-            str_with_error = self.textbox_m.get(0.0, customtkinter.END)
-            self.textbox_m.tag_config('tag_red_text', foreground='red')
-
-            self.textbox_m.delete(0.0, customtkinter.END)
-            self.textbox_m.insert(customtkinter.INSERT, str_with_error[:err_location.char])
-            try:
-                self.textbox_m.insert(customtkinter.INSERT, str_with_error[err_location.char], 'tag_red_text')
-                self.textbox_m.insert(customtkinter.INSERT, str_with_error[err_location.char + 1:])
-            except IndexError:
-                ...
+        highlight_error(textbox, line=err_location.line, column=err_location.column)
 
 
 class SageState(State):
@@ -327,21 +508,33 @@ class SageState(State):
         self.label_textbox_r = customtkinter.CTkLabel(master=self.root_frame, text='Результат')
 
         # TextBoxes
-        self.textbox_l = customtkinter.CTkTextbox(master=self.root_frame,
-                                                  width=300,
-                                                  height=300,
-                                                  border_width=1
-                                                  )
-        self.textbox_m = customtkinter.CTkTextbox(master=self.root_frame,
-                                                  width=300,
-                                                  height=300,
-                                                  border_width=1
-                                                  )
-        self.textbox_r = customtkinter.CTkTextbox(master=self.root_frame,
-                                                  width=300,
-                                                  height=300,
-                                                  border_width=1
-                                                  )
+        self.textbox_l = InputTextbox(master=self.root_frame,
+                                      width=300,
+                                      height=300,
+                                      border_width=1
+                                      )
+        self.textbox_m = InputTextbox(master=self.root_frame,
+                                      width=300,
+                                      height=300,
+                                      border_width=1
+                                      )
+        self.textbox_r = ResultTextbox(master=self.root_frame,
+                                       width=300,
+                                       height=300,
+                                       border_width=1
+                                       )
+
+        # Open file buttons
+        self.open_file_l_btn = customtkinter.CTkButton(master=self.root_frame,
+                                                       text="Открыть файл",
+                                                       command=lambda: open_input_file(self.textbox_l, self.set_feedback,
+                                                                                       self.logger),
+                                                       border_width=1)
+        self.open_file_m_btn = customtkinter.CTkButton(master=self.root_frame,
+                                                       text="Открыть файл",
+                                                       command=lambda: open_input_file(self.textbox_m, self.set_feedback,
+                                                                                       self.logger),
+                                                       border_width=1)
         self.feedbackbox = customtkinter.CTkTextbox(master=self.root_frame,
                                                     width=1,
                                                     height=40,
@@ -355,12 +548,24 @@ class SageState(State):
             border_width=1,
             fg_color="green"
         )
+        self.stop_btn = customtkinter.CTkButton(
+            master=self.action_frame,
+            text="Стоп",
+            command=self.stop_btn_callback,
+            border_width=1
+        )
         self.copy_result_btn = customtkinter.CTkButton(
             master=self.action_frame,
             text="Копировать результат",
             command=self.copy_result_btn_callback,
             border_width=1
         )
+        self.save_result_btn = customtkinter.CTkButton(
+            master=self.action_frame,
+            text="Сохранить результат",
+            command=lambda: self.textbox_r.ask_save_result(self.set_feedback, self.logger),
+            border_width=1
+        )
         self.clear_l_text_box_btn = customtkinter.CTkButton(
             master=self.action_frame,
             text="Очистить строку Sage",
@@ -368,6 +573,10 @@ class SageState(State):
             border_width=1,
             fg_color="purple"
         )
+        self.json_lines_chkbox_var = customtkinter.IntVar(value=0)
+        self.json_lines_chkbox = customtkinter.CTkCheckBox(master=self.action_frame,
+                                                           text=" - Несколько записей в JSON Lines",
+                                                           variable=self.json_lines_chkbox_var)
         self.clear_m_text_box_btn = customtkinter.CTkButton(
             master=self.action_frame,
             text="Очистить пример JSON'а",
@@ -394,9 +603,16 @@ class SageState(State):
         self.label_textbox_m.grid(row=0, column=1, sticky="NSEW")
         self.label_textbox_r.grid(row=0, column=2, sticky="NSEW")
 
+        # Open file buttons
+        self.open_file_l_btn.grid(row=2, column=0, sticky="NSEW")
+        self.open_file_m_btn.grid(row=2, column=1, sticky="NSEW")
+
         # Buttons
         self.start_btn.grid(row=0, column=0, sticky="NSWE")
         self.copy_result_btn.grid(row=0, column=1, sticky="NSWE")
+        self.stop_btn.grid(row=0, column=2, sticky="NSWE")
+        self.save_result_btn.grid(row=0, column=3, sticky="NSWE")
+        self.json_lines_chkbox.grid(row=0, column=4, padx=5, sticky="NSWE")
         self.clear_l_text_box_btn.grid(row=0, column=5, sticky="NSWE")
         self.clear_m_text_box_btn.grid(row=0, column=6, sticky="NSWE")
         self.clear_r_text_box_btn.grid(row=0, column=7, sticky="NSWE")
@@ -412,60 +628,78 @@ class SageState(State):
 
     # ----------- Buttons callbacks  ----------- #
     def start_btn_callback(self) -> None:
-        try:
-            sage_string = self.textbox_l.get(0.0, customtkinter.END)
-            example_dict = self.textbox_m.get(0.0, customtkinter.END)
-            self.logger.info(f"Start sage covert with:"
-                             f"Sage string: {sage_string}"
-                             f"example json: {example_dict}")
-            result = convert_sage_str_to_dict_with_correcting_types(sage_str=sage_string,
-                                                                    example_dict=example_dict)
-            self.logger.info(f"Success sage covert, result: {result}")
-            self.set_feedback("JSON успешно сформирован")
-            self.textbox_r.delete(0.0, customtkinter.END)
-            self.textbox_r.insert(customtkinter.INSERT, result)
-        except ConvertStrToDictException as err:
+        sage_string = self.textbox_l.get_input()
+        example_dict = self.textbox_m.get_input()
+        clear_error_highlight(self.textbox_m)
+        output_format = SAGE_OUTPUT_JSON_LINES if self.json_lines_chkbox_var.get() else SAGE_OUTPUT_ARRAY
+        self.logger.info("Start sage covert with: Sage string: %s example json: %s",
+                         PayloadSummary(sage_string), PayloadSummary(example_dict))
+        report = ConvertReportModel()
+        self.master.job_runner.submit("sage",
+                                      call_with_file_inputs,
+                                      convert_sage_str_to_dict_with_correcting_types,
+                                      sage_str=sage_string,
+                                      example_dict=example_dict,
+                                      output_format=output_format,
+                                      report=report,
+                                      on_success=lambda result: self.on_convert_success(result, report),
+                                      on_error=self.on_convert_error,
+                                      on_busy=self.set_busy_feedback)
+
+    def stop_btn_callback(self) -> None:
+        if self.master.job_runner.cancel("sage"):
+            self.set_feedback("Выполнение отменено")
+
+    def on_convert_success(self, result: str, report: ConvertReportModel) -> None:
+        with timing_span(report, "show"):
+            self.textbox_r.set_result(result)
+        self.logger.info("Success sage covert, result: %s", PayloadSummary(result))
+        self.set_feedback(make_success_feedback("JSON успешно сформирован", report, self.logger))
+
+    def on_convert_error(self, err: Exception) -> None:
+        if isinstance(err, ConvertStrToDictException):
             try:
                 err_location = parse_error_message(str(err))
                 self.set_convert_err_feedback(err_location)
                 self.logger.error(f"Input syntax err: {err_location}")
             except UnexpectedErrorMessage as err:
                 self.logger.error(f"Sage convertor error: {str(err)}")
+        else:
+            self.set_feedback(f"Непредвиденная ошибка: {err}")
+            self.logger.error(f"Sage convertor unexpected error: {repr(err)}")
 
     def copy_result_btn_callback(self) -> None:
-        text = self.textbox_r.get(0.0, customtkinter.END)
+        import pyperclip  # Loaded on first use to speed up start
+
+        text = self.textbox_r.get_result()
         pyperclip.copy(text)
         self.set_feedback("Результат скопирован")
 
     def clear_l_text_box_callback(self) -> None:
-        self.textbox_l.delete(0.0, customtkinter.END)
+        self.textbox_l.clear()
 
     def clear_m_text_box_callback(self) -> None:
-        self.textbox_m.delete(0.0, customtkinter.END)
+        self.textbox_m.clear()
 
     def clear_r_text_box_callback(self) -> None:
-        self.textbox_r.delete(0.0, customtkinter.END)
+        self.textbox_r.clear()
 
     # ----------- Feedback  ----------- #
     def set_feedback(self, text: str) -> None:
         self.feedback_window.delete(0.0, customtkinter.END)
         self.feedback_window.insert(0.0, text)
 
+    def set_busy_feedback(self, elapsed: float) -> None:
+        self.set_feedback(BUSY_FEEDBACK_TEXT.format(elapsed))
+
     def set_convert_err_feedback(self, err_location: DecoderErrorLocation) -> None:
         msg_feedback = f"Неверный пример JSON" \
                        f" Строка: {err_location.line}; Символ: {err_location.column}"
+        if self.textbox_m.input_file is not None:
+            msg_feedback += f" (в файле {self.textbox_m.input_file.path})"
         self.set_feedback(msg_feedback)
 
-        str_with_err = self.textbox_m.get(0.0, customtkinter.END)
-        self.textbox_m.tag_config("tag_red_text", foreground='red')
-
-        self.textbox_m.delete(0.0, customtkinter.END)
-        self.textbox_m.insert(customtkinter.INSERT, str_with_err[:err_location.char])
-        try:
-            self.textbox_m.insert(customtkinter.INSERT, str_with_err[err_location.char], "tag_red_text")
-            self.textbox_m.insert(customtkinter.INSERT, str_with_err[err_location.char + 1:])
-        except IndexError:
-            ...
+        highlight_error(self.textbox_m, line=err_location.line, column=err_location.column)
 
 
 class TableState(State):
@@ -529,10 +763,10 @@ class TableState(State):
                                                              width=300,
                                                              height=300,
                                                              border_width=1)
-        self.textbox_result = customtkinter.CTkTextbox(master=self.root_frame,
-                                                       width=300,
-                                                       height=300,
-                                                       border_width=1)
+        self.textbox_result = ResultTextbox(master=self.root_frame,
+                                            width=300,
+                                            height=300,
+                                            border_width=1)
 
     def create_action_widgets(self) -> None:
         # Text boxes
@@ -551,6 +785,13 @@ class TableState(State):
             fg_color="green",
             width=60
         )
+        self.stop_btn = customtkinter.CTkButton(
+            master=self.action_frame,
+            text="Стоп",
+            command=self.callback_stop_btn,
+            border_width=1,
+            width=60
+        )
         self.browse_btn = customtkinter.CTkButton(
             master=self.action_frame,
             text="Выбрать файл",
@@ -581,6 +822,13 @@ class TableState(State):
             border_width=1,
             width=100
         )
+        self.save_result = customtkinter.CTkButton(
+            master=self.action_frame,
+            text="Сохранить результат",
+            command=lambda: self.textbox_result.ask_save_result(self.set_feedback, self.logger),
+            border_width=1,
+            width=100
+        )
 
     def set_root_frame_widgets(self) -> None:
         self.label_example_json_textbox.grid(row=0, column=0, sticky="NEWS")
@@ -596,49 +844,75 @@ class TableState(State):
         self.browse_btn.grid(row=0, column=3, sticky="NSEW")
         self.clear_example_textbox.grid(row=0, column=4, sticky="NSEW")
         self.clear_result_textbox.grid(row=0, column=5, sticky="NSEW")
+        self.stop_btn.grid(row=0, column=6, sticky="NSEW")
+        self.save_result.grid(row=0, column=7, sticky="NSEW")
 
-        for i in range(6):
+        for i in range(8):
             self.action_frame.columnconfigure(i, weight=1)
         self.action_frame.rowconfigure(0, weight=1)
 
     # ----------- Buttons callbacks  ----------- #
     def callback_start_btn(self) -> None:
+        from src.handlers.tables_handler import make_json_from_table  # Heavy table libs, loaded on first use
+
         table_path = self.textbox_table_path.get(0.0, customtkinter.END)
         if table_path.strip() == "":
             self.set_feedback("Выберите файл")
             return
 
         example_dict = self.textbox_example_json.get(0.0, customtkinter.END)
-        if isinstance(example_dict, str) and example_dict.strip() == "":
-            example_dict = get_root_json_as_dict()
-        self.logger.info(f"Start table convert with:"
-                         f"Path: {table_path}"
-                         f"Example json: {example_dict}")
-        try:
-            result = make_json_from_table(table_path=table_path, example_dict=example_dict)
-            self.logger.info(f"Success table covert, result: {result}")
-            self.set_feedback("JSON успешно сформирован")
-            self.callback_clear_result_textbox()
-            self.textbox_result.insert(customtkinter.INSERT, result)
-        except ConvertStrToDictException as err:
-            err_location = parse_error_message(str(err))
-            self.set_convert_err_feedback(err_location)
-            self.logger.error(f"Input syntax err: {err_location}")
-        except UnexpectedErrorMessage as err:
-            self.logger.error(f"Table convert error: {str(err)}")
-        except NoSupportFileExtension as err:
+        clear_error_highlight(self.textbox_example_json)
+        self.logger.info("Start table convert with: Path: %s Example json: %s",
+                         table_path.strip(), PayloadSummary(example_dict))
+        report = ConvertReportModel()
+        self.master.job_runner.submit("table",
+                                      make_json_from_table,
+                                      table_path=table_path,
+                                      example_dict=example_dict,
+                                      report=report,
+                                      on_success=lambda result: self.on_convert_success(result, report),
+                                      on_error=self.on_convert_error,
+                                      on_busy=self.set_busy_feedback)
+
+    def callback_stop_btn(self) -> None:
+        if self.master.job_runner.cancel("table"):
+            self.set_feedback("Выполнение отменено")
+
+    def on_convert_success(self, result: str, report: ConvertReportModel) -> None:
+        with timing_span(report, "show"):
+            self.textbox_result.set_result(result)
+        self.logger.info("Success table covert, result: %s", PayloadSummary(result))
+        self.set_feedback(make_success_feedback("JSON успешно сформирован", report, self.logger))
+
+    def on_convert_error(self, err: Exception) -> None:
+        if isinstance(err, ConvertStrToDictException):
+            try:
+                err_location = parse_error_message(str(err))
+                self.set_convert_err_feedback(err_location)
+                self.logger.error(f"Input syntax err: {err_location}")
+            except UnexpectedErrorMessage as err:
+                self.logger.error(f"Table convert error: {str(err)}")
+        elif isinstance(err, NoSupportFileExtension):
             available_extensions = str(err).split(":")[1]
             self.set_feedback(f"Неподдерживаемое расширение файла. Доступные расширения: {available_extensions}")
-            self.logger.error(f"Input extension error: path: {table_path}")
-        except KeyError:
+            self.logger.error(f"Input extension error: {str(err)}")
+        elif isinstance(err, KeyError):
             self.set_feedback("В таблице должны быть коллонки с заголовками: 'variable_names' и 'variable_value'")
             self.logger.error("Input file error: No columns with names 'variable_names' and 'variable_value'")
-        except FileNotFoundError as err:
+        elif isinstance(err, TableReadException):
+            self.set_feedback(f"Не удалось прочитать таблицу: {err}")
+            self.logger.error(f"Table read error: {str(err)}")
+        elif isinstance(err, FileNotFoundError):
             path = str(err)
             self.set_feedback(f"Файл не найден, некорректный путь: {path}")
             self.logger.error(f"FileNotFoundError: No such file or directory: {path}")
+        else:
+            self.set_feedback(f"Непредвиденная ошибка: {err}")
+            self.logger.error(f"Table convert unexpected error: {repr(err)}")
 
     def callback_browse_file(self) -> None:
+        import tkinter.filedialog
+
         file_path = tkinter.filedialog.askopenfilename(initialdir="/", title="Выберете файл")
         self.update_path_in_ui(file_path)
 
@@ -646,10 +920,12 @@ class TableState(State):
         self.textbox_example_json.delete(0.0, customtkinter.END)
 
     def callback_clear_result_textbox(self) -> None:
-        self.textbox_result.delete(0.0, customtkinter.END)
+        self.textbox_result.clear()
 
     def callback_copy_result(self) -> None:
-        result = self.textbox_result.get(0.0, customtkinter.END)
+        import pyperclip  # Loaded on first use to speed up start
+
+        result = self.textbox_result.get_result()
         pyperclip.copy(result)
         self.set_feedback("Результат скопирован")
 
@@ -662,21 +938,15 @@ class TableState(State):
         self.feedback_window.delete(0.0, customtkinter.END)
         self.feedback_window.insert(0.0, string)
 
+    def set_busy_feedback(self, elapsed: float) -> None:
+        self.set_feedback(BUSY_FEEDBACK_TEXT.format(elapsed))
+
     def set_convert_err_feedback(self, err_location: DecoderErrorLocation) -> None:
         msg_feedback = f"Неверный пример JSON" \
                        f" Строка: {err_location.line}; Символ: {err_location.column}"
         self.set_feedback(msg_feedback)
 
-        string_with_err = (self.textbox_example_json.get(0.0, customtkinter.END))
-        self.textbox_example_json.tag_config("tag_red_text", foreground='red')
-
-        self.textbox_example_json.delete(0.0, customtkinter.END)
-        self.textbox_example_json.insert(customtkinter.INSERT, string_with_err[:err_location.char])
-        try:
-            self.textbox_example_json.insert(customtkinter.INSERT, string_with_err[err_location.char], "tag_red_text")
-            self.textbox_example_json.insert(customtkinter.INSERT, string_with_err[err_location.char + 1:])
-        except IndexError:
-            ...
+        highlight_error(self.textbox_example_json, line=err_location.line, column=err_location.column)
 
 
 class SettingsState(State):
@@ -705,6 +975,8 @@ class SettingsState(State):
         self.help_window = None
 
     def set_state(self):
+        # Request is reset by the profiled run
+        self.profile_next_run_chkbox_var.set(int(is_profile_next_run()))
         self.set_all_widgets()
 
     def remove_state(self):
@@ -729,17 +1001,29 @@ class SettingsState(State):
         self.help_btn = customtkinter.CTkButton(master=self.root_frame,
                                                 text="Помощь",
                                                 command=self.open_help_top_lvl)
+        self.profile_next_run_chkbox_var = customtkinter.IntVar(value=0)
+        self.profile_next_run_chkbox = customtkinter.CTkCheckBox(master=self.root_frame,
+                                                                 text=" - Профилировать следующий запуск",
+                                                                 variable=self.profile_next_run_chkbox_var,
+                                                                 command=self.profile_next_run_chkbox_callback)
 
     def open_help_top_lvl(self) -> None:
         self.help_window = TopLevelHelpWindow()
         self.help_window.mainloop()
 
+    def profile_next_run_chkbox_callback(self) -> None:
+        is_enabled = bool(self.profile_next_run_chkbox_var.get())
+        set_profile_next_run(is_enabled)
+        if is_enabled:
+            self.set_feedback(f"cProfile и tracemalloc следующего запуска будут сохранены в {PROFILES_DIR}")
+
     def set_all_widgets(self):
         self.root_frame.grid(row=1, column=0, padx=20, pady=10, sticky="NEWS")
         self.mod_button.grid(row=0, column=0, padx=20, pady=10, sticky="NEWS", columnspan=1000)
         self.root_frame.columnconfigure(0, weight=1)
         self.feedback_window.grid(row=3, column=0, padx=5, pady=5, sticky="NEWS")
         self.help_btn.grid(row=2, column=0, padx=20, pady=10, sticky="NEWS")
+        self.profile_next_run_chkbox.grid(row=4, column=0, padx=20, pady=5, sticky="W")
 
     def set_feedback(self, string: str) -> None:
         self.feedback_window.delete(0.0, customtkinter.END)
@@ -787,6 +1071,13 @@ class SubSettingsGeneralState(State):
             text_box_width=100
         )
 
+        self.result_cache_input_box = CustomInputBox(
+            master=self.root_frame,
+            label_text="Память для кэша\nрезультатов, МБ:",
+            text_box_text=str(settings.result_cache_max_mb),
+            text_box_width=100
+        )
+
         default_value = 'Темная тема' if settings.themes.appearance_mode == 'dark' else 'Светлая тема'
         self.apperance_mod_switcher = CustomSegmentBox(
             master=self.root_frame,
@@ -805,22 +1096,28 @@ class SubSettingsGeneralState(State):
 
         self.window_resolution_input_box.grid(row=0, column=0, padx=5, pady=5, sticky="NEWS")
         self.window_min_resolution_input_box.grid(row=1, column=0, padx=5, pady=5, sticky="NEWS")
-        self.apperance_mod_switcher.grid(row=2, column=0, padx=5, pady=5, sticky="NEWS")
+        self.result_cache_input_box.grid(row=2, column=0, padx=5, pady=5, sticky="NEWS")
+        self.apperance_mod_switcher.grid(row=3, column=0, padx=5, pady=5, sticky="NEWS")
 
-        self.save_button.grid(row=3, column=0, padx=5, pady=5, sticky="NEWS")
+        self.save_button.grid(row=4, column=0, padx=5, pady=5, sticky="NEWS")
 
     def callback_save_settings(self) -> None:
         """"""
         window_resolution = self.window_resolution_input_box.get_text()
         min_window_resolution = self.window_min_resolution_input_box.get_text()
+        result_cache_max_mb = self.result_cache_input_box.get_text().strip()
         if "x" not in window_resolution or "x" not in min_window_resolution:
             self.master_state.set_feedback('Разрешение окна должно быть записанно в формате '
                                        '"Ширина окна и Высота окна,'
                                        'разделенные символом "x"')
+        elif not result_cache_max_mb.isdecimal():
+            self.master_state.set_feedback("Память для кэша должна быть целым числом МБ, 0 - не кэшировать")
         else:
             min_window_resolution = min_window_resolution.split("x")
             self.settings_handler.set_new_settings(window_geometry=window_resolution.strip(),
-                                                   minsize_geometry=min_window_resolution)
+                                                   minsize_geometry=min_window_resolution,
+                                                   result_cache_max_mb=int(result_cache_max_mb))
+            set_result_cache_max_mb(int(result_cache_max_mb))
             self.master_state.set_feedback("Настройки сохранены")
 
 
@@ -991,6 +1288,10 @@ class SubFillerMonoState(State):
         self.format_date_chkbox = customtkinter.CTkCheckBox(master=self.root_frame,
                                                             text=" - Форматировать D&T в Data  ",
                                                             variable=self.format_date_chkbox_var)
+        self.match_by_key_chkbox_var = customtkinter.IntVar(value=0)
+        self.match_by_key_chkbox = customtkinter.CTkCheckBox(master=self.root_frame,
+                                                             text=" - Искать ключи на любой вложенности",
+                                                             variable=self.match_by_key_chkbox_var)
 
     def set_all_widgets(self) -> None:
         # ComboBoxes
@@ -1018,6 +1319,7 @@ class SubFillerMonoState(State):
 
         # CheckBoxes
         self.format_date_chkbox.grid(column=3, row=0)
+        self.match_by_key_chkbox.grid(column=3, row=2)
 
     # ----------- Settings ----------- #
     def get_settings(self) -> MonoSettingsModel:
@@ -1039,7 +1341,8 @@ class SubFillerMonoState(State):
             contract_number=self.contract_number_box.get_text().strip(),
             product_type=self.product_type_box.get_text().strip(),
             communication_type=self.communication_type_box.get_text().strip(),
-            is_need_convert_dt=bool(self.format_date_chkbox_var.get())
+            is_need_convert_dt=bool(self.format_date_chkbox_var.get()),
+            fill_match_by=MATCH_BY_KEY if self.match_by_key_chkbox_var.get() else MATCH_BY_PATH
         )
 
     def write_date_settings(self,
@@ -1113,16 +1416,157 @@ class SubFillerMonoState(State):
 
 
 class SubFillerDoubleState(State):
+    """Settings of double product: common fields and primary/secondary accounts"""
 
-    def __init__(self, master: customtkinter.CTkFrame):
+    def __init__(self, master: customtkinter.CTkFrame, master_state: FillerState):
         super(SubFillerDoubleState, self).__init__(master)
+        self.root_frame = customtkinter.CTkFrame(master=master)
+        self.settings_handler = FillerSettingsHandler(FILLER_SETTINGS_PATH)
+        self.master_state = master_state
+        self.create_all_widgets()
+
+    def set_state(self) -> None:
+        self.root_frame.grid(row=1, column=0, sticky="NEWS")
+        self.set_all_widgets()
+
+    def remove_state(self) -> None:
+        self.root_frame.grid_remove()
+
+    def create_all_widgets(self) -> None:
+        # ComboBoxes
+        self.contact_id_box = CustomLabelCombobox(master=self.root_frame,
+                                                  label_text="           CONTACT_ID:           ",
+                                                  combobox_default_value="",
+                                                  combobox_values=[""]
+                                                  )
+        self.communication_type_box = CustomLabelCombobox(master=self.root_frame,
+                                                          label_text="COMMUNICATION_TYPE:",
+                                                          combobox_default_value="Call",
+                                                          combobox_values=["", "Call", "Chat"],
+                                                          )
 
-    def set_state(self) -> None: ...
+        presets_names = self.settings_handler.get_all_presets_names(is_for_mono=False)
+        default_value = presets_names[0] if len(presets_names) > 0 else ""
+        self.settings_preset_box = CustomLabelCombobox(master=self.root_frame,
+                                                       label_text="Пресеты настроек:",
+                                                       combobox_default_value=default_value,
+                                                       combobox_values=presets_names,
+                                                       )
 
-    def remove_state(self) -> None: ...
+        # Accounts
+        self.primary_account_frame = AccountSettingsFrame(master=self.root_frame,
+                                                          title="Основной счет (PRIMARY_ACCOUNT_*)")
+        self.secondary_account_frame = AccountSettingsFrame(master=self.root_frame,
+                                                            title="Второй счет (SECONDARY_ACCOUNT_*)")
 
-    def create_all_widgets(self) -> None: ...
+        # Buttons
+        self.save_settings_preset_btn = customtkinter.CTkButton(master=self.root_frame,
+                                                                text="Сохранить текущий пресет настроек",
+                                                                command=self.callback_save_settings_preset,
+                                                                border_width=1)
+        self.load_settings_preset_btn = customtkinter.CTkButton(master=self.root_frame,
+                                                                text="Загрузить выбранный пресет настроек",
+                                                                command=self.callback_load_settings_preset,
+                                                                border_width=1)
+        self.del_settings_preset_btn = customtkinter.CTkButton(master=self.root_frame,
+                                                               text="Удалить выбранный пресет настроек",
+                                                               command=self.callback_del_settings_preset,
+                                                               border_width=1,
+                                                               fg_color="purple")
+        self.calculate_dates = customtkinter.CTkButton(master=self.root_frame,
+                                                       text=" Рассчитать даты ",
+                                                       command=self.callback_calculate_datas,
+                                                       border_width=1)
 
-    def set_all_widgets(self) -> None: ...
+        # Checkbox
+        self.format_date_chkbox_var = customtkinter.IntVar(value=1)
+        self.format_date_chkbox = customtkinter.CTkCheckBox(master=self.root_frame,
+                                                            text=" - Форматировать D&T в Data  ",
+                                                            variable=self.format_date_chkbox_var)
+        self.match_by_key_chkbox_var = customtkinter.IntVar(value=0)
+        self.match_by_key_chkbox = customtkinter.CTkCheckBox(master=self.root_frame,
+                                                             text=" - Искать ключи на любой вложенности",
+                                                             variable=self.match_by_key_chkbox_var)
+
+    def set_all_widgets(self) -> None:
+        # ComboBoxes
+        self.contact_id_box.grid(row=0, column=0, sticky="WE")
+        self.communication_type_box.grid(row=1, column=0, sticky="WE")
+        self.settings_preset_box.grid(row=2, column=0, sticky="WE")
 
-    def get_settings(self): ...
+        # Buttons
+        self.save_settings_preset_btn.grid(column=0, row=3, sticky="EW")
+        self.load_settings_preset_btn.grid(column=0, row=4, sticky="EW")
+        self.del_settings_preset_btn.grid(column=0, row=5, sticky="EW")
+
+        # Accounts
+        self.primary_account_frame.grid(column=1, row=0, rowspan=6, padx=5, sticky="NEWS")
+        self.secondary_account_frame.grid(column=2, row=0, rowspan=6, padx=5, sticky="NEWS")
+
+        # CheckBoxes
+        self.format_date_chkbox.grid(column=3, row=0)
+        self.calculate_dates.grid(column=3, row=1)
+        self.match_by_key_chkbox.grid(column=3, row=2)
+
+    # ----------- Settings ----------- #
+    def get_settings(self) -> MonoSettingsModel:
+        """Date offsets are common for mono and double, get them from mono settings"""
+        return self.settings_handler.get_current_settings().mono
+
+    def reed_date_settings(self) -> DoubleSettingsFromUIModel:
+        """Reed settings from UI"""
+        return DoubleSettingsFromUIModel(
+            primary=self.primary_account_frame.get_settings(),
+            secondary=self.secondary_account_frame.get_settings(),
+            contact_id=self.contact_id_box.get_text().strip(),
+            communication_type=self.communication_type_box.get_text().strip(),
+            is_need_convert_dt=bool(self.format_date_chkbox_var.get()),
+            fill_match_by=MATCH_BY_KEY if self.match_by_key_chkbox_var.get() else MATCH_BY_PATH
+        )
+
+    # ----------- Callbacks ----------- #
+    def callback_save_settings_preset(self):
+        """Save preset into settings"""
+        new_preset_name = self.settings_preset_box.get_text()
+        new_preset = DoublePresetModel(
+            name=new_preset_name,
+            contact_id=self.contact_id_box.get_text(),
+            communication_type=self.communication_type_box.get_text(),
+            primary=self.primary_account_frame.get_preset(),
+            secondary=self.secondary_account_frame.get_preset()
+        )
+        try:
+            self.settings_handler.add_new_preset(new_preset)
+            self.settings_preset_box.add_new_value(new_preset_name)
+            self.master_state.set_feedback(f"Save preset with name: '{new_preset_name}'")
+        except PresetException as err:
+            self.master_state.set_feedback(str(err))
+
+    def callback_load_settings_preset(self):
+        """Set preset by name from inputBox"""
+        preset_name = self.settings_preset_box.get_text()
+        try:
+            preset = self.settings_handler.get_preset_by_name(preset_name, is_for_mono=False)
+            self.contact_id_box.set_new_text(preset.contact_id)
+            self.communication_type_box.set_new_text(preset.communication_type)
+            self.primary_account_frame.set_preset(preset.primary)
+            self.secondary_account_frame.set_preset(preset.secondary)
+            self.master_state.set_feedback(f"Load preset with name: '{preset_name}'")
+        except PresetException as err:
+            self.master_state.set_feedback(str(err))
+
+    def callback_del_settings_preset(self):
+        """Delete preset from settings"""
+        preset_name_to_del = self.settings_preset_box.get_text()
+        try:
+            self.settings_handler.delete_preset_by_name(preset_name_to_del, is_from_mono=False)
+            self.settings_preset_box.del_value(preset_name_to_del)
+            self.master_state.set_feedback(f"Пресет '{preset_name_to_del}' удален")
+        except PresetException as err:
+            self.master_state.set_feedback(str(err))
+
+    def callback_calculate_datas(self):
+        """Calculates dates of both accounts based on settings"""
+        result = plus_days_from_now(self.get_settings().dates)
+        self.primary_account_frame.set_dates(result)
+        self.secondary_account_frame.set_dates(result)
@@ -1,5 +1,6 @@
 import customtkinter
 import logging
+from typing import Callable
 
 
 class State:
@@ -16,9 +17,10 @@ class State:
 
 class StateSwitcher:
 
-    def __init__(self, states: dict[str: State], start_state: str):
+    def __init__(self, states: dict[str: State | Callable[[], State]], start_state: str):
         """
-        :param states: dict with states str name and states objects (Obj should be inited)
+        :param states: dict with states str name and states objects or factories without arguments.
+            State from factory is created the first time it is set
         :param start_state: state which will be started when switcher init
         """
 
@@ -32,9 +34,18 @@ class StateSwitcher:
 
     def _set_start_state(self, start_state: str) -> None:
         self.is_state_in_states(start_state)
-        state_to_set = self._states[start_state]
+        state_to_set = self._get_state(start_state)
         state_to_set.set_state()
 
+    def _get_state(self, state: str) -> State:
+        """Return state obj, create it if it was set by factory"""
+        state_obj = self._states[state]
+        if not isinstance(state_obj, State):
+            state_obj = state_obj()
+            self._states[state] = state_obj
+            self.logger.debug(f"State '{state}' was created")
+        return state_obj
+
     def set_new_state(self, new_state: str) -> None:
         """Set new state and remove state was current"""
         current_state: State
@@ -42,11 +53,11 @@ class StateSwitcher:
 
         self.is_state_in_states(new_state)
 
-        current_state = self._states[self._current_state]
+        current_state = self._get_state(self._current_state)
         current_state.remove_state()
 
         self._current_state = new_state
-        state_to_set: State = self._states[self._current_state]
+        state_to_set: State = self._get_state(self._current_state)
         state_to_set.set_state()
 
     def is_state_in_states(self, state: str) -> None:
@@ -61,4 +72,4 @@ class StateSwitcher:
 
     def get_current_state(self):
         """Return current state obj"""
-        return self._states[self._current_state]
+        return self._get_state(self._current_state)
@@ -0,0 +1,69 @@
+from datetime import datetime as dt
+
+import pytest
+
+from src.handlers.filler_handlers import fill_dict_from_another_dict, MATCH_BY_PATH, MATCH_BY_KEY, _parse_date_time
+from src.utils.exceptions import JsonRootTypeException
+
+
+def test_path_fills_nested_dicts():
+    to_fill = {"A": {"B": 1, "C": {"D": 2}}, "E": 3}
+    from_fill = {"A": {"C": {"D": 20, "X": 0}}, "E": 30, "Y": 0}
+    assert fill_dict_from_another_dict(to_fill, from_fill) == {"A": {"B": 1, "C": {"D": 20}}, "E": 30}
+
+
+def test_path_fills_lists_item_by_item_by_source_length():
+    to_fill = {"L": [{"A": 1, "B": 2}, {"A": 3}], "S": [{"A": 1}]}
+    from_fill = {"L": [{"A": 10}], "S": [{"A": 10}, {"A": 20, "Z": 0}]}
+    assert fill_dict_from_another_dict(to_fill, from_fill) == {
+        "L": [{"A": 10, "B": 2}],
+        "S": [{"A": 10}, {"A": 20, "Z": 0}],
+    }
+
+
+def test_path_keeps_template_container_on_type_mismatch():
+    to_fill = {"D": {"A": 1}, "L": [1, 2], "M": {"A": 1}, "S": 1, "N": None}
+    from_fill = {"D": [1], "L": {"A": 2}, "M": "text", "S": {"A": 2}, "N": [3]}
+    assert fill_dict_from_another_dict(to_fill, from_fill) == {
+        "D": {"A": 1}, "L": [1, 2], "M": {"A": 1}, "S": {"A": 2}, "N": [3],
+    }
+
+
+def test_key_fills_on_any_level():
+    to_fill = {"A": {"B": 1, "C": {"D": 2}}, "D": 3}
+    from_fill = {"X": {"D": 20}, "B": 10}
+    assert fill_dict_from_another_dict(to_fill, from_fill, match_by=MATCH_BY_KEY) == {
+        "A": {"B": 10, "C": {"D": 20}}, "D": 20,
+    }
+
+
+def test_key_fills_lists_item_by_item():
+    to_fill = {"L": [{"A": 1, "B": 2}, {"A": 3}], "M": [{"B": 1}]}
+    from_fill = {"X": {"L": [{"A": 10}, {"A": 30}, {"A": 50}]}, "B": 20}
+    assert fill_dict_from_another_dict(to_fill, from_fill, match_by=MATCH_BY_KEY) == {
+        "L": [{"A": 10, "B": 2}, {"A": 30}, {"A": 50}],
+        "M": [{"B": 20}],
+    }
+
+
+def test_key_replaces_only_scalars():
+    to_fill = {"D": {"A": 1}, "L": [{"A": 1}], "S": 1}
+    from_fill = {"D": "text", "L": {"A": 2}, "S": [3], "A": 10}
+    assert fill_dict_from_another_dict(to_fill, from_fill, match_by=MATCH_BY_KEY) == {
+        "D": {"A": 10}, "L": [{"A": 10}], "S": [3],
+    }
+
+
+@pytest.mark.parametrize("match_by", [MATCH_BY_PATH, MATCH_BY_KEY])
+def test_root_must_be_object(match_by):
+    with pytest.raises(JsonRootTypeException, match="-T$"):
+        fill_dict_from_another_dict([{"A": 1}], {"A": 2}, match_by=match_by)
+    with pytest.raises(JsonRootTypeException, match="-F$"):
+        fill_dict_from_another_dict({"A": 1}, [{"A": 2}], match_by=match_by)
+
+
+@pytest.mark.parametrize("value", ["2023-01-02T03:04:05.1", "2023-01-02T03:04:05.123",
+                                   "2023-01-02T03:04:05.12345", "2023-01-02T03:04:05.123456",
+                                   "2023-1-2T3:4:5.123"])
+def test_parse_date_time_same_as_strptime(value):
+    assert _parse_date_time(value) == dt.strptime(value, '%Y-%m-%dT%H:%M:%S.%f')